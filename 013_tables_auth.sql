@@ -166,9 +166,12 @@ create table auth.user_permission_cache
     tenant_uuid     uuid                        not null
         references auth.tenant (uuid),
     groups              text[] default '{}'::text[] not null,
-    permissions         text[] default '{}'::text[] not null,
-    short_code_permissions text[] default '{}'::text[] not null,
+    -- sorted, distinct auth.permission ids; full/short codes are resolved from auth.permission on read
+    permission_ids      integer[] default '{}'::integer[] not null,
     expiration_date     timestamp with time zone    not null,
+    -- last (re)calculation on the request path (cache miss); cache hits do not write it and warming keeps it,
+    -- so it marks recently active users
+    last_requested_at   timestamp with time zone default now() not null,
     constraint user_permission_cache_created_by_check
         check (length(created_by) <= 250),
     constraint user_permission_cache_updated_by_check
@@ -293,6 +296,32 @@ create table auth.perm_set_perm
         check (length(created_by) <= 250)
 );
 
+-- Closure of the permission tree: every assignable permission (itself included) that a direct
+-- assignment of assigned_permission_id grants. Maintained by triggers (033_triggers_cache_and_notify.sql)
+create table auth.permission_closure
+(
+    assigned_permission_id integer not null
+        references auth.permission
+            on delete cascade,
+    permission_id          integer not null
+        references auth.permission
+            on delete cascade,
+    primary key (assigned_permission_id, permission_id)
+);
+
+-- Closure of perm_set_perm: every assignable permission an assignable perm set grants
+-- (its permissions and their assignable descendants). Maintained by triggers (033_triggers_cache_and_notify.sql)
+create table auth.perm_set_closure
+(
+    perm_set_id   integer not null
+        references auth.perm_set
+            on delete cascade,
+    permission_id integer not null
+        references auth.permission
+            on delete cascade,
+    primary key (perm_set_id, permission_id)
+);
+
 create table auth.user_group
 (
     created_at                   timestamp with time zone default now()           not null,
@@ -557,6 +586,9 @@ create index ix_trgm_user_info_search
 create unique index uq_user_permission_cache
     on auth.user_permission_cache (user_id, tenant_id);
 
+create index ix_user_permission_cache_expiration
+    on auth.user_permission_cache (expiration_date);
+
 create index ix_trgm_user_data_search
     on auth.user_data using gin (nrm_search_data ext.gin_trgm_ops);
 
@@ -566,6 +598,10 @@ create unique index uq_user_identity
 create unique index uq_permission_full_code
     on auth.permission (full_code);
 
+-- Text lookup of requested codes (auth.has_permissions) without casting input to ltree
+create index ix_permission_full_code_text
+    on auth.permission ((full_code::text));
+
 create index ix_permission_node_path
     on auth.permission using gist (node_path);
 
@@ -593,8 +629,9 @@ create index ix_user_event_data
 create index ix_user_event_correlation_id
     on auth.user_event(correlation_id) where correlation_id is not null;
 
+-- Newest-first pages, keyset cursor (created_at, user_event_id)
 create index ix_user_event_created
-    on auth.user_event (created_at desc);
+    on auth.user_event (created_at desc, user_event_id desc);
 
 create index ix_user_event_target_user
     on auth.user_event (target_user_id, created_at desc);
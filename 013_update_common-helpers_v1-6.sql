@@ -77,6 +77,8 @@ $$;
  * - 'local'  : INSERT into PostgreSQL only (default)
  * - 'notify' : Fire pg_notify only, skip INSERT
  * - 'both'   : INSERT + fire pg_notify
+ * - 'buffered': append to a staging table, flushed in batches (journal only,
+ *               see unsecure.flush_journal_buffer)
  */
 create or replace function helpers.should_store_locally(_group_code text)
     returns boolean
@@ -104,5 +106,18 @@ select coalesce(
 ) in ('notify', 'both');
 $$;
 
+create or replace function helpers.should_buffer_storage(_group_code text)
+    returns boolean
+    stable
+    language sql
+as
+$$
+select coalesce(
+    (select text_value from const.sys_param
+     where group_code = _group_code and code = 'storage_mode'),
+    'local'
+) = 'buffered';
+$$;
+
 select *
 from stop_version_update('1.6', _component := 'common_helpers');
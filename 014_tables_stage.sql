@@ -58,12 +58,14 @@ create table public.journal
     keys           jsonb,
     data_payload   jsonb,
     request_context jsonb,
+    nrm_search_data text,
     constraint journal_created_by_check check (length(created_by) <= 250),
     primary key (journal_id, created_at)
 ) partition by range (created_at);
 
 comment on column public.journal.keys is 'Entity references: {"order": 3, "item": 5}';
 comment on column public.journal.data_payload is 'Template values and extra data: {"username": "john"}';
+comment on column public.journal.nrm_search_data is 'Normalized (lower, unaccented) data_payload text, set by trg_calculate_journal';
 
 create index ix_journal_keys
     on public.journal using gin (keys);
@@ -71,11 +73,16 @@ create index ix_journal_keys
 create index ix_journal_payload
     on public.journal using gin (data_payload);
 
+-- Substring search over payloads; created on every monthly partition
+create index ix_trgm_journal_search
+    on public.journal using gin (nrm_search_data ext.gin_trgm_ops);
+
 create index ix_journal_tenant_event
     on public.journal (tenant_id, event_id);
 
+-- Newest-first pages, keyset cursor (created_at, journal_id)
 create index ix_journal_created
-    on public.journal (created_at desc);
+    on public.journal (created_at desc, journal_id desc);
 
 create index ix_journal_correlation_id
     on public.journal(correlation_id) where correlation_id is not null;
@@ -112,3 +119,56 @@ begin
     end loop;
 end $$;
 
+
+/*
+ * Journal Buffer
+ * ==============
+ *
+ * Write buffer for journal.storage_mode = 'buffered'. public.create_journal_message
+ * appends here instead of inserting into public.journal: no partition routing, no GIN
+ * or trigram index maintenance and no user/tenant FK checks on the request path.
+ * unsecure.flush_journal_buffer moves the rows into the monthly partitions in batches.
+ *
+ * created_by and event_id keep their checks, so a bad row still fails the caller, not the flush.
+ */
+create table stage.journal_buffer
+(
+    created_at        timestamp with time zone default now()           not null,
+    created_by        text                     default 'unknown'::text not null,
+    correlation_id    text,
+    journal_buffer_id bigint generated always as identity primary key,
+    tenant_id         integer,
+    event_id          integer not null references const.event_code,
+    user_id           bigint,
+    keys              jsonb,
+    data_payload      jsonb,
+    request_context   jsonb,
+    constraint journal_buffer_created_by_check check (length(created_by) <= 250)
+);
+
+/*
+ * Permission Change Queue
+ * =======================
+ *
+ * Per-transaction buffer for 'permission_changes' notifications when the
+ * auth.perm_change_notify_coalesce sys_param is on. unsecure.notify_permission_change
+ * queues one row per transaction and (event, tenant, target); at commit the deferred
+ * trg_flush_permission_change_queue sends them via unsecure.flush_permission_change_queue.
+ *
+ * Unlogged: a row never outlives its transaction.
+ */
+create unlogged table stage.permission_change_queue
+(
+    permission_change_queue_id bigint generated always as identity primary key,
+    transaction_id             bigint  default txid_current() not null,
+    is_flush_marker            boolean default false          not null,
+    event                      text                           not null,
+    tenant_id                  integer,
+    target_type                text                           not null,
+    target_id                  bigint,
+    detail                     jsonb,
+    dedup_key                  text                           not null
+);
+
+create unique index uq_permission_change_queue
+    on stage.permission_change_queue (transaction_id, dedup_key);
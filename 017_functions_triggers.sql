@@ -183,6 +183,19 @@ begin
 end ;
 $$;
 
+-- Journal search trigger function
+create or replace function triggers.calculate_journal() returns trigger
+    language plpgsql
+as
+$$
+begin
+	if tg_op = 'INSERT' or tg_op = 'UPDATE' then
+		new.nrm_search_data = helpers.normalize_text(new.data_payload::text);
+		return new;
+	end if;
+end ;
+$$;
+
 -- Trigger creation statements
 create trigger trg_auth_calculate_user_data
 	before insert or update
@@ -234,3 +247,8 @@ create trigger trg_auth_calculate_api_key
 	for each row
 execute function triggers.calculate_api_key();
 
+create trigger trg_calculate_journal
+	before insert or update of data_payload
+	on public.journal
+	for each row
+execute function triggers.calculate_journal();
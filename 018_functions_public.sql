@@ -199,6 +199,8 @@ $$;
 --   'local'  - INSERT only (default)
 --   'notify' - pg_notify only, skip INSERT
 --   'both'   - INSERT + pg_notify
+--   'buffered' - append to stage.journal_buffer, moved into journal by unsecure.flush_journal_buffer
+--                (the returned __journal_id is null until then)
 create or replace function public.create_journal_message(
     _created_by text,
     _user_id bigint,
@@ -237,6 +239,15 @@ begin
             _keys, _payload, _tenant_id, _request_context);
     end if;
 
+    -- Buffered: cheap append, partitions and indexes are written by the flush
+    if helpers.should_buffer_storage('journal') then
+        return query
+            insert into stage.journal_buffer (created_by, user_id, correlation_id, event_id, keys, data_payload, tenant_id, request_context)
+            values (_created_by, _user_id, _correlation_id, _event_id, _keys, _payload, _tenant_id, _request_context)
+            returning created_at, created_by, correlation_id, null::bigint, tenant_id, event_id, user_id, keys, data_payload, request_context;
+        return;
+    end if;
+
     -- Only INSERT if storage mode is 'local' or 'both'
     if not helpers.should_store_locally('journal') then
         return;
@@ -543,12 +554,21 @@ $$;
  * Search journal messages
  *
  * Supports filtering by:
- * - _search_text: Full-text search in data_payload JSONB
+ * - _search_text: Accent-insensitive substring search in data_payload (nrm_search_data, trigram index)
  * - _event_category: Filter by category (e.g., 'user_event', 'group_event')
  * - _event_id: Filter by specific event ID
  * - _keys_criteria: Filter by keys using JSONB containment (e.g., '{"order": 3}')
  * - _payload_criteria: Filter by payload using JSONB containment
+ *
+ * Without _from, only the last journal.search_window_days days (sys_param, default 31)
+ * before _to (or now) are searched, so only the matching monthly partitions are scanned.
+ *
+ * Pagination: _page / _page_size (offset), or keyset with _after_created_at /
+ * _after_journal_id set to the last row of the previous page (newest first).
+ * __total_items is only computed with _include_total = true, null otherwise.
  */
+drop function if exists public.search_journal(bigint, text, text, timestamptz, timestamptz, bigint, integer, text, jsonb, jsonb, jsonb, integer, integer, integer);
+
 create or replace function public.search_journal(
     _user_id bigint,
     _correlation_id text default null,
@@ -563,7 +583,10 @@ create or replace function public.search_journal(
     _request_context_criteria jsonb default null,
     _page integer default 1,
     _page_size integer default 10,
-    _tenant_id integer default 1
+    _tenant_id integer default 1,
+    _include_total boolean default false,
+    _after_created_at timestamptz default null,
+    _after_journal_id bigint default null
 )
     returns table(
         __journal_id bigint,
@@ -586,6 +609,10 @@ $$
 declare
     __can_read_global_journal bool;
     __normalized_search text;
+    __search_window_days integer;
+    __from timestamptz;
+    __to timestamptz;
+    __total_items bigint;
 begin
     __can_read_global_journal = auth.has_permission(_user_id, _correlation_id, 'journal.read_global_journal', _throw_err := false);
 
@@ -599,15 +626,53 @@ begin
 
     __normalized_search := helpers.normalize_text(_search_text);
 
+    _page := coalesce(_page, 1);
+    _page_size := coalesce(_page_size, 10);
+
+    select number_value
+    from const.sys_param sp
+    where sp.group_code = 'journal'
+      and sp.code = 'search_window_days'
+    into __search_window_days;
+
+    if __search_window_days is null then
+        __search_window_days := 31;
+    end if;
+
+    __to := coalesce(_to, 'infinity'::timestamptz);
+    __from := coalesce(_from, coalesce(_to, now()) - make_interval(days => __search_window_days));
+
+    if _include_total then
+        select count(*)
+        from journal j
+        left join const.event_code ec on ec.event_id = j.event_id
+        where (helpers.is_empty_string(__normalized_search) or
+               j.nrm_search_data like '%' || __normalized_search || '%')
+          and ((_tenant_id = 1 and __can_read_global_journal) or j.tenant_id = _tenant_id)
+          and (_target_user_id is null or j.user_id = _target_user_id)
+          and (_event_id is null or j.event_id = _event_id)
+          and (_event_category is null or ec.category_code = _event_category)
+          and (_keys_criteria is null or j.keys @> _keys_criteria)
+          and (_payload_criteria is null or j.data_payload @> _payload_criteria)
+          and (_request_context_criteria is null or j.request_context @> _request_context_criteria)
+          and (_correlation_id is null or j.correlation_id = _correlation_id)
+          and j.created_at between __from and __to
+        into __total_items;
+    end if;
+
+    -- Keyset: nothing newer than the cursor is needed, which also prunes newer partitions
+    if _after_created_at is not null then
+        __to := least(__to, _after_created_at);
+    end if;
+
     return query
         with filtered_rows as (
             select j.journal_id
                  , j.created_at as journal_created_at
-                 , count(1) over () as total_items
             from journal j
             left join const.event_code ec on ec.event_id = j.event_id
             where (helpers.is_empty_string(__normalized_search) or
-                   j.data_payload::text ilike '%' || __normalized_search || '%')
+                   j.nrm_search_data like '%' || __normalized_search || '%')
               and ((_tenant_id = 1 and __can_read_global_journal) or j.tenant_id = _tenant_id)
               and (_target_user_id is null or j.user_id = _target_user_id)
               and (_event_id is null or j.event_id = _event_id)
@@ -616,10 +681,12 @@ begin
               and (_payload_criteria is null or j.data_payload @> _payload_criteria)
               and (_request_context_criteria is null or j.request_context @> _request_context_criteria)
               and (_correlation_id is null or j.correlation_id = _correlation_id)
-              and j.created_at between coalesce(_from, now() - interval '100 years')
-                                   and coalesce(_to, now() + interval '100 years')
-            order by j.created_at desc
-            offset ((_page - 1) * _page_size) limit _page_size
+              and j.created_at between __from and __to
+              and (_after_created_at is null
+                   or (j.created_at, j.journal_id) < (_after_created_at, coalesce(_after_journal_id, 0)))
+            order by j.created_at desc, j.journal_id desc
+            offset case when _after_created_at is null then (_page - 1) * _page_size else 0 end
+            limit _page_size
         )
         select j.journal_id
              , j.event_id
@@ -636,11 +703,11 @@ begin
              , j.created_at
              , j.created_by
              , j.correlation_id
-             , fr.total_items
+             , __total_items
         from filtered_rows fr
         inner join journal j on fr.journal_id = j.journal_id and j.created_at = fr.journal_created_at
         left join const.event_code ec on ec.event_id = j.event_id
-        order by j.created_at desc;
+        order by j.created_at desc, j.journal_id desc;
 end;
 $$;
 
@@ -969,9 +1036,10 @@ begin
                 else null
             end,
             _payload_criteria,
-            _page,
-            _page_size,
-            _tenant_id
+            _page := _page,
+            _page_size := _page_size,
+            _tenant_id := _tenant_id,
+            _include_total := true
         ) sj;
 end;
 $$;
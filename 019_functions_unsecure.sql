@@ -23,23 +23,62 @@ where user_id = _target_user_id
   and (_tenant_id is null or tenant_id = _tenant_id);
 $$;
 
+-- Clear permission cache for a list of user IDs (all tenants when _tenant_id is NULL)
+-- Used by the statement-level user_group_member trigger: one delete for all members touched by a statement
+create or replace function unsecure.clear_users_permission_cache(_deleted_by text, _user_ids bigint[], _tenant_id integer DEFAULT NULL) returns void
+    language sql
+as
+$$
+delete
+from auth.user_permission_cache
+where user_id = any (_user_ids)
+  and (_tenant_id is null or tenant_id = _tenant_id);
+$$;
+
+-- True when the auth.perm_cache_eager_recalc sys_param is set: cache invalidation helpers then recalculate
+-- the invalidated rows right away (unsecure.recalculate_permissions_for_users) instead of leaving them
+-- to the next permission check
+create or replace function internal.is_perm_cache_eager_recalc() returns boolean
+    stable
+    language sql
+as
+$$
+select coalesce((select sp.bool_value
+                 from const.sys_param sp
+                 where sp.group_code = 'auth'
+                   and sp.code = 'perm_cache_eager_recalc'), false);
+$$;
+
 -- Helper function to invalidate cache for all members of a group
 -- Uses soft invalidation (UPDATE expiration_date) instead of DELETE for better performance
+-- With the auth.perm_cache_eager_recalc sys_param set to true, the invalidated rows are recalculated
+-- right away in one unsecure.recalculate_permissions_for_users call instead of one by one on next check
 create or replace function unsecure.invalidate_group_members_permission_cache(_updated_by text, _user_group_id integer, _tenant_id integer DEFAULT 1) returns void
     language plpgsql
 as
 $$
+declare
+    __user_ids bigint[];
 begin
-    update auth.user_permission_cache
-    set expiration_date = now(),
-        updated_by = _updated_by,
-        updated_at = now()
-    where tenant_id = _tenant_id
-      and user_id in (
-          select user_id
-          from auth.user_group_member
-          where user_group_id = _user_group_id
-      );
+    with invalidated as (
+        update auth.user_permission_cache
+        set expiration_date = now(),
+            updated_by = _updated_by,
+            updated_at = now()
+        where tenant_id = _tenant_id
+          and user_id in (
+              select user_id
+              from auth.user_group_member
+              where user_group_id = _user_group_id
+          )
+        returning user_id)
+    select array_agg(user_id)
+    from invalidated
+    into __user_ids;
+
+    if internal.is_perm_cache_eager_recalc() then
+        perform unsecure.recalculate_permissions_for_users(_updated_by, __user_ids, _tenant_id);
+    end if;
 end;
 $$;
 
@@ -230,32 +269,99 @@ create or replace function unsecure.invalidate_perm_set_users_permission_cache(_
     language plpgsql
 as
 $$
+declare
+    __user_ids bigint[];
 begin
     -- Soft invalidate cache for users who have this perm_set directly assigned
-    update auth.user_permission_cache
-    set expiration_date = now(),
-        updated_by = _updated_by,
-        updated_at = now()
-    where tenant_id = _tenant_id
-      and user_id in (
-          select user_id
-          from auth.permission_assignment
-          where perm_set_id = _perm_set_id
-            and user_id is not null
-      );
+    -- or are members of groups that have this perm_set assigned
+    with invalidated as (
+        update auth.user_permission_cache
+        set expiration_date = now(),
+            updated_by = _updated_by,
+            updated_at = now()
+        where tenant_id = _tenant_id
+          and user_id in (
+              select user_id
+              from auth.permission_assignment
+              where perm_set_id = _perm_set_id
+                and user_id is not null
+              union
+              select ugm.user_id
+              from auth.permission_assignment pa
+              inner join auth.user_group_member ugm on ugm.user_group_id = pa.user_group_id
+              where pa.perm_set_id = _perm_set_id
+          )
+        returning user_id)
+    select array_agg(user_id)
+    from invalidated
+    into __user_ids;
+
+    -- Eager mode (auth.perm_cache_eager_recalc): recalculate them now, in one statement
+    if internal.is_perm_cache_eager_recalc() then
+        perform unsecure.recalculate_permissions_for_users(_updated_by, __user_ids, _tenant_id);
+    end if;
+end;
+$$;
 
-    -- Soft invalidate cache for users who are members of groups that have this perm_set assigned
-    update auth.user_permission_cache
-    set expiration_date = now(),
-        updated_by = _updated_by,
-        updated_at = now()
-    where tenant_id = _tenant_id
-      and user_id in (
-          select ugm.user_id
+-- Incremental alternative to invalidate_perm_set_users_permission_cache for permissions added to a perm_set.
+-- Instead of expiring the cache of every holder (and making each of them pay a full recalculation on the
+-- next check), the added permissions and their assignable descendants (auth.permission_closure)
+-- are merged into the permission_ids of the holders' live cache rows in one set-based update.
+-- Expired rows are left alone, the next check recalculates them anyway.
+-- Opt-in: only patches when the auth.perm_cache_incremental_patch sys_param is set to true, otherwise
+-- (the default) it falls back to invalidation.
+-- Removals cannot be patched (the user may hold the permission through another assignment), so they
+-- keep using invalidate_perm_set_users_permission_cache.
+create or replace function unsecure.patch_perm_set_users_permission_cache(_updated_by text, _perm_set_id integer, _added_permission_ids integer[], _tenant_id integer DEFAULT 1) returns void
+    language plpgsql
+as
+$$
+declare
+    __incremental_patch boolean;
+    __added_ids         integer[];
+begin
+    select bool_value
+    from const.sys_param sp
+    where sp.group_code = 'auth'
+      and sp.code = 'perm_cache_incremental_patch'
+    into __incremental_patch;
+
+    if not coalesce(__incremental_patch, false) then
+        perform unsecure.invalidate_perm_set_users_permission_cache(_updated_by, _perm_set_id, _tenant_id);
+        return;
+    end if;
+
+    -- Same expansion as recalculate_user_permissions: nothing is granted from a non-assignable perm_set
+    select array_agg(distinct pc.permission_id)
+    from auth.perm_set ps
+             inner join auth.permission_closure pc on pc.assigned_permission_id = any (_added_permission_ids)
+    where ps.perm_set_id = _perm_set_id
+      and ps.is_assignable = true
+    into __added_ids;
+
+    if __added_ids is null then
+        return;
+    end if;
+
+    update auth.user_permission_cache upc
+    set permission_ids = array(select distinct u.permission_id
+                               from unnest(upc.permission_ids || __added_ids) as u(permission_id)
+                               order by u.permission_id),
+        updated_by     = _updated_by,
+        updated_at     = now()
+    from (select pa.tenant_id, pa.user_id
           from auth.permission_assignment pa
-          inner join auth.user_group_member ugm on ugm.user_group_id = pa.user_group_id
           where pa.perm_set_id = _perm_set_id
-      );
+            and pa.user_id is not null
+          union
+          select pa.tenant_id, ugm.user_id
+          from auth.permission_assignment pa
+                   inner join auth.user_group_member ugm on ugm.user_group_id = pa.user_group_id
+          where pa.perm_set_id = _perm_set_id) holders
+    where upc.user_id = holders.user_id
+      and upc.tenant_id = holders.tenant_id
+      and upc.expiration_date > now()
+      and not upc.permission_ids @> __added_ids;
 end;
 $$;
 
@@ -322,8 +428,25 @@ begin
 end;
 $$;
 
+-- True when the auth.perm_change_notify_coalesce sys_param is set: permission_changes notifications are
+-- then queued per transaction and sent once at commit (see unsecure.flush_permission_change_queue)
+create or replace function internal.is_perm_change_notify_coalesced() returns boolean
+    stable
+    language sql
+as
+$$
+select coalesce((select sp.bool_value
+                 from const.sys_param sp
+                 where sp.group_code = 'auth'
+                   and sp.code = 'perm_change_notify_coalesce'), false);
+$$;
+
 -- Send a notification via pg_notify on the 'permission_changes' channel
 -- Called from trigger functions and unsecure.* functions to notify backends of permission-relevant changes
+-- With auth.perm_change_notify_coalesce on, the change is queued in stage.permission_change_queue instead:
+-- repeats of the same (event, tenant_id, target_type, target_id) in one transaction are dropped (the first
+-- detail is kept) and the queue is sent at commit. The first queued row of a transaction is the flush marker
+-- that fires the deferred trg_flush_permission_change_queue.
 create or replace function unsecure.notify_permission_change(
     _event       text,
     _tenant_id   integer,
@@ -337,6 +460,21 @@ $$
 declare
     __payload jsonb;
 begin
+    if internal.is_perm_change_notify_coalesced() then
+        insert into stage.permission_change_queue (is_flush_marker, event, tenant_id, target_type, target_id, detail, dedup_key)
+        values (coalesce(current_setting('permission_change.queue_armed', true), '') <> 'on',
+                _event, _tenant_id, _target_type, _target_id, _detail,
+                -- targets without an id (providers) are told apart by their detail
+                concat_ws('|', _event, _tenant_id, _target_type, coalesce(_target_id::text, _detail::text)))
+        on conflict (transaction_id, dedup_key) do nothing;
+
+        if found then
+            perform set_config('permission_change.queue_armed', 'on', true);
+        end if;
+
+        return;
+    end if;
+
     __payload := jsonb_build_object(
         'event', _event,
         'tenant_id', _tenant_id,
@@ -353,6 +491,70 @@ begin
 end;
 $$;
 
+-- Sends and removes the current transaction's queued permission_changes notifications
+-- (called at commit by trg_flush_permission_change_queue). A target queued alone for its
+-- (event, tenant_id, target_type) keeps the single-target payload; otherwise the targets are sent
+-- as {event, tenant_id, target_type, target_ids: [...], at} in chunks of 300 ids, which keeps
+-- each payload under the 8000 byte pg_notify limit. Returns the number of notifications sent.
+create or replace function unsecure.flush_permission_change_queue() returns integer
+    language plpgsql
+as
+$$
+declare
+    __payloads jsonb[];
+    __payload  jsonb;
+begin
+    -- Rows queued after this flush (e.g. under set constraints ... immediate) arm a new marker
+    perform set_config('permission_change.queue_armed', '', true);
+
+    with queued as (
+        delete from stage.permission_change_queue q
+        where q.transaction_id = txid_current()
+        returning q.*
+    ), chunked as (
+        select q.*
+             , (row_number() over (partition by q.event, q.tenant_id, q.target_type, q.target_id is null
+                                   order by q.permission_change_queue_id) - 1) / 300 as chunk
+        from queued q
+    ), batches as (
+        select c.event
+             , c.tenant_id
+             , c.target_type
+             , array_agg(c.target_id order by c.permission_change_queue_id) as target_ids
+             , (array_agg(c.detail order by c.permission_change_queue_id))[1] as detail
+             , min(c.permission_change_queue_id)                              as first_queue_id
+        from chunked c
+        -- targets without an id are never batched
+        group by c.event, c.tenant_id, c.target_type, c.chunk,
+                 case when c.target_id is null then c.permission_change_queue_id end
+    )
+    select array_agg(
+               case
+                   when cardinality(b.target_ids) = 1 then
+                       jsonb_build_object('event', b.event, 'tenant_id', b.tenant_id, 'target_type', b.target_type,
+                                          'target_id', b.target_ids[1], 'at', now())
+                           || case when b.detail is not null then jsonb_build_object('detail', b.detail) else '{}'::jsonb end
+                   else
+                       jsonb_build_object('event', b.event, 'tenant_id', b.tenant_id, 'target_type', b.target_type,
+                                          'target_ids', to_jsonb(b.target_ids), 'at', now())
+               end
+               order by b.first_queue_id)
+    from batches b
+    into __payloads;
+
+    if __payloads is null then
+        return 0;
+    end if;
+
+    foreach __payload in array __payloads
+    loop
+        perform pg_notify('permission_changes', __payload::text);
+    end loop;
+
+    return cardinality(__payloads);
+end;
+$$;
+
 -- Send a notification via pg_notify on the 'journal_events' channel
 -- Called from public.create_journal_message() when storage_mode is 'notify' or 'both'
 -- Payload is truncated if it exceeds ~7900 bytes (pg_notify 8000 byte limit)
@@ -1403,6 +1605,8 @@ create or replace function unsecure.create_perm_set_permissions(_created_by text
     language plpgsql
 as
 $$
+declare
+	__added_permission_ids integer[];
 begin
 
 	if
@@ -1410,15 +1614,20 @@ begin
 		perform error.raise_52177(_perm_set_id, _tenant_id);
 	end if;
 
-	insert into auth.perm_set_perm(created_by, perm_set_id, permission_id)
-	select _created_by, _perm_set_id, p.permission_id
-	from unnest(_permissions) as perm_code
-				 left join auth.permission p
-									 on p.full_code = perm_code::ext.ltree
-				 left join auth.perm_set_perm psp on p.permission_id = psp.permission_id and psp.perm_set_id = _perm_set_id
-				 left join auth.perm_set ps on psp.perm_set_id = ps.perm_set_id
-	where p.code is not null
-		and psp.perm_set_id is null;
+	with inserted as (
+		insert into auth.perm_set_perm(created_by, perm_set_id, permission_id)
+		select _created_by, _perm_set_id, p.permission_id
+		from unnest(_permissions) as perm_code
+					 left join auth.permission p
+										 on p.full_code = perm_code::ext.ltree
+					 left join auth.perm_set_perm psp on p.permission_id = psp.permission_id and psp.perm_set_id = _perm_set_id
+					 left join auth.perm_set ps on psp.perm_set_id = ps.perm_set_id
+		where p.code is not null
+			and psp.perm_set_id is null
+		returning permission_id)
+	select array_agg(permission_id)
+	from inserted
+	into __added_permission_ids;
 
 	perform public.create_journal_message_for_entity(_created_by, _user_id, _correlation_id
 			, 12021  -- perm_set_updated
@@ -1427,8 +1636,8 @@ begin
 				, 'permissions_added', array_to_string(_permissions, ', '))
 			, _tenant_id);
 
-	-- Invalidate permission cache for all users who have this perm_set assigned
-	perform unsecure.invalidate_perm_set_users_permission_cache(_created_by, _perm_set_id, _tenant_id);
+	-- Merge the added permissions into the cache of all users who have this perm_set assigned
+	perform unsecure.patch_perm_set_users_permission_cache(_created_by, _perm_set_id, __added_permission_ids, _tenant_id);
 
 	return query
 		select ps.perm_set_id, ps.code, p.permission_id, p.full_code::text
@@ -2139,6 +2348,221 @@ begin
 end;
 $$;
 
+-- Recomputes auth.perm_set_closure of the given perm sets from perm_set_perm and auth.permission_closure.
+-- The perm set rows are locked first (in id order), which serializes two transactions refreshing the
+-- same set: the second one waits, then deletes the rows the first has committed instead of colliding
+-- with them on insert. NO KEY UPDATE does not conflict with the KEY SHARE lock that perm_set_perm
+-- foreign keys already hold on the set. Row locks, unlike advisory locks, do not fill the shared lock
+-- table when rebuild_permission_closures refreshes every set at once.
+create or replace function unsecure.refresh_perm_set_closure(_perm_set_ids integer[]) returns void
+    language sql
+as
+$$
+select ps.perm_set_id
+from auth.perm_set ps
+where ps.perm_set_id = any (_perm_set_ids)
+order by ps.perm_set_id
+for no key update;
+
+delete
+from auth.perm_set_closure psc
+where psc.perm_set_id = any (_perm_set_ids);
+
+insert into auth.perm_set_closure (perm_set_id, permission_id)
+select distinct psp.perm_set_id
+              , pc.permission_id
+from auth.perm_set ps
+         inner join auth.perm_set_perm psp on psp.perm_set_id = ps.perm_set_id
+         inner join auth.permission_closure pc on pc.assigned_permission_id = psp.permission_id
+where ps.perm_set_id = any (_perm_set_ids)
+  and ps.is_assignable = true
+on conflict do nothing;
+$$;
+
+-- Recomputes auth.permission_closure of the given permissions (their assignable subtree)
+-- and auth.perm_set_closure of every perm set that contains one of them.
+-- Serialized per permission with a row lock on auth.permission, like refresh_perm_set_closure.
+create or replace function unsecure.refresh_permission_closure(_assigned_permission_ids integer[]) returns void
+    language sql
+as
+$$
+select p.permission_id
+from auth.permission p
+where p.permission_id = any (_assigned_permission_ids)
+order by p.permission_id
+for no key update;
+
+delete
+from auth.permission_closure pc
+where pc.assigned_permission_id = any (_assigned_permission_ids);
+
+insert into auth.permission_closure (assigned_permission_id, permission_id)
+select p.permission_id
+     , sp.permission_id
+from auth.permission p
+         inner join auth.permission sp
+                    on sp.node_path <@ p.node_path and sp.is_assignable = true
+where p.permission_id = any (_assigned_permission_ids)
+on conflict do nothing;
+
+select unsecure.refresh_perm_set_closure(array(select distinct psp.perm_set_id
+                                               from auth.perm_set_perm psp
+                                               where psp.permission_id = any (_assigned_permission_ids)));
+$$;
+
+-- Incremental closure maintenance for permissions that were created, moved (node_path) or changed
+-- is_assignable, used by the statement-level auth.permission triggers. A closure pair (a, x) depends
+-- only on a.node_path, x.node_path and x.is_assignable, so only pairs with a changed permission on
+-- either side are replaced: the changed permissions' own subtrees and their ancestor chains, found
+-- with GiST lookups, O(changed rows x (depth + own subtree)) instead of every ancestor's whole subtree.
+-- No ancestor rows are locked: the changed permissions are already locked by the triggering statement,
+-- so two transactions never replace the same pairs, and concurrent creations under a shared parent
+-- do not serialize. Perm sets directly containing a changed permission are recomputed in full.
+-- Deleted permissions need nothing here: their closure rows go with the on delete cascade keys.
+create or replace function unsecure.sync_permission_closure(_changed_permission_ids integer[]) returns void
+    language sql
+as
+$$
+delete
+from auth.permission_closure pc
+where pc.assigned_permission_id = any (_changed_permission_ids)
+   or pc.permission_id = any (_changed_permission_ids);
+
+insert into auth.permission_closure (assigned_permission_id, permission_id)
+-- changed permission as the assigned one: its assignable subtree
+select c.permission_id
+     , sp.permission_id
+from auth.permission c
+         inner join auth.permission sp
+                    on sp.node_path <@ c.node_path and sp.is_assignable = true
+where c.permission_id = any (_changed_permission_ids)
+union
+-- changed permission as the granted one: every ancestor (itself included) grants it
+select a.permission_id
+     , c.permission_id
+from auth.permission c
+         inner join auth.permission a on a.node_path @> c.node_path
+where c.permission_id = any (_changed_permission_ids)
+  and c.is_assignable = true
+on conflict do nothing;
+
+delete
+from auth.perm_set_closure psc
+where psc.permission_id = any (_changed_permission_ids);
+
+insert into auth.perm_set_closure (perm_set_id, permission_id)
+select distinct psp.perm_set_id
+              , pc.permission_id
+from auth.permission_closure pc
+         inner join auth.perm_set_perm psp on psp.permission_id = pc.assigned_permission_id
+         inner join auth.perm_set ps on ps.perm_set_id = psp.perm_set_id
+where pc.permission_id = any (_changed_permission_ids)
+  and ps.is_assignable = true
+on conflict do nothing;
+
+select unsecure.refresh_perm_set_closure(array(select distinct psp.perm_set_id
+                                               from auth.perm_set_perm psp
+                                               where psp.permission_id = any (_changed_permission_ids)));
+$$;
+
+-- Rebuilds both closure tables from scratch (initial fill after deployment, repair)
+create or replace function unsecure.rebuild_permission_closures() returns void
+    language sql
+as
+$$
+delete
+from auth.perm_set_closure;
+
+delete
+from auth.permission_closure;
+
+select unsecure.refresh_permission_closure(array(select permission_id from auth.permission));
+$$;
+
+-- Groups and effective permissions per user and tenant, i.e. the content of auth.user_permission_cache.
+-- Shared by recalculate_user_permissions (one user) and recalculate_permissions_for_users (many users)
+-- so both always compute the same result. Perm sets and directly assigned permissions are expanded
+-- through auth.perm_set_closure / auth.permission_closure instead of ltree joins.
+create or replace function internal.calculate_users_permissions(_user_ids bigint[], _tenant_id integer DEFAULT NULL::integer)
+    returns TABLE(__user_id bigint, __tenant_id integer, __tenant_uuid uuid, __group_codes text[], __permission_codes text[], __short_code_permission_codes text[], __permission_ids integer[])
+    stable
+    language sql
+as
+$$
+with ugs as (
+    select ugm.user_id
+         , ugm.tenant_id
+         , t.uuid as tenant_uuid
+         , ugm.user_group_id
+         , ugm.group_code
+    from auth.user_group_members ugm
+             inner join auth.tenant t on t.tenant_id = ugm.tenant_id
+    where ugm.user_id = any (_user_ids))
+   , granted as (
+    select ug.user_id
+         , pa.tenant_id
+         , ug.tenant_uuid
+         , psc.permission_id
+    from ugs ug
+             inner join auth.permission_assignment pa on pa.user_group_id = ug.user_group_id
+             inner join auth.perm_set_closure psc on psc.perm_set_id = pa.perm_set_id
+    union
+    select ug.user_id
+         , pa.tenant_id
+         , ug.tenant_uuid
+         , pc.permission_id
+    from ugs ug
+             inner join auth.permission_assignment pa on pa.user_group_id = ug.user_group_id
+             inner join auth.permission_closure pc on pc.assigned_permission_id = pa.permission_id
+    union
+    select pa.user_id
+         , pa.tenant_id
+         , t.uuid
+         , psc.permission_id
+    from auth.permission_assignment pa
+             inner join auth.tenant t on t.tenant_id = pa.tenant_id
+             inner join auth.perm_set_closure psc on psc.perm_set_id = pa.perm_set_id
+    where pa.user_id = any (_user_ids)
+    union
+    select pa.user_id
+         , pa.tenant_id
+         , t.uuid
+         , pc.permission_id
+    from auth.permission_assignment pa
+             inner join auth.tenant t on t.tenant_id = pa.tenant_id
+             inner join auth.permission_closure pc on pc.assigned_permission_id = pa.permission_id
+    where pa.user_id = any (_user_ids))
+select data.user_id
+     , data.tenant_id
+     , data.tenant_uuid
+     , coalesce(array_agg(distinct data.groups) filter ( where data.groups is not null ), array []::text[])
+     , coalesce(array_agg(distinct data.perms) filter ( where data.perms is not null ), array []::text[])
+     , coalesce(array_agg(distinct data.short_code_perms) filter ( where data.short_code_perms is not null ), array []::text[])
+     -- distinct sorts, so the ids are stored in ascending order
+     , coalesce(array_agg(distinct data.perm_id) filter ( where data.perm_id is not null ), array []::integer[])
+from (select ug.user_id
+           , ug.tenant_id
+           , ug.tenant_uuid
+           , ug.group_code as groups
+           , null::text    as perms
+           , null::text    as short_code_perms
+           , null::integer as perm_id
+      from ugs ug
+      union
+      select g.user_id
+           , g.tenant_id
+           , g.tenant_uuid
+           , null
+           , p.full_code::text
+           , p.short_code
+           , g.permission_id
+      from granted g
+               inner join auth.permission p on p.permission_id = g.permission_id) data
+where _tenant_id is null
+   or data.tenant_id = _tenant_id
+group by data.user_id, data.tenant_id, data.tenant_uuid;
+$$;
+
 create or replace function unsecure.recalculate_user_permissions(_created_by text, _target_user_id bigint, _tenant_id integer DEFAULT NULL::integer)
     returns TABLE(__tenant_id integer, __tenant_uuid uuid, __groups text[], __permissions text[], __short_code_permissions text[])
     language plpgsql
@@ -2177,15 +2601,18 @@ begin
               and expiration_date > now())
     then
 
+        -- The cache stores permission ids only; codes are resolved through the permission table
         return query
             select _tenant_id
                  , upc.tenant_uuid
                  , upc.groups
-                 , upc.permissions
-                 , upc.short_code_permissions
+                 , coalesce(array_agg(distinct p.full_code::text) filter ( where p.full_code is not null ), array []::text[])
+                 , coalesce(array_agg(distinct p.short_code) filter ( where p.short_code is not null ), array []::text[])
             from auth.user_permission_cache upc
+                     left join auth.permission p on p.permission_id = any (upc.permission_ids)
             where upc.tenant_id = _tenant_id
-              and upc.user_id = _target_user_id;
+              and upc.user_id = _target_user_id
+            group by upc.tenant_uuid, upc.groups;
     else
         select number_value
         from const.sys_param sp
@@ -2199,142 +2626,262 @@ begin
             __perm_cache_timeout_in_s := 300;
         end if;
 
-        drop table if exists __temp_users_groups_permissions;
-        create temporary table __temp_users_groups_permissions
-        (
-            tenant_id                integer,
-            tenant_uuid              uuid,
-            group_codes              text[],
-            permission_codes         text[],
-            short_code_permission_codes text[]
-        ) on commit drop;
-
-        with ugs as (
-            select ugm.tenant_id
-                 , t.uuid as tenant_uuid
-                 , user_group_id
-                 , group_code
-            from auth.user_group_members ugm
-                     inner join auth.tenant t on t.tenant_id = ugm.tenant_id
-            where ugm.user_id = _target_user_id)
-           , group_assignments as (
-            select distinct pa.tenant_id
-                          , ug.tenant_uuid
-                          , ep.permission_code as full_code
-                          , ep.permission_short_code as short_code
-            from ugs ug
-                     inner join auth.permission_assignment pa
-                                on ug.user_group_id = pa.user_group_id
-                     inner join auth.effective_permissions ep on pa.perm_set_id = ep.perm_set_id
-            where ep.perm_set_is_assignable = true
-              and ep.permission_is_assignable = true
-            union
-            select distinct pa.tenant_id
-                          , ug.tenant_uuid
-                          , sp.full_code
-                          , sp.short_code
-            from ugs ug
-                     inner join auth.permission_assignment pa
-                                on ug.user_group_id = pa.user_group_id
-                     inner join auth.permission p on pa.permission_id = p.permission_id
-                     inner join auth.permission sp
-                                on sp.node_path <@ p.node_path and sp.is_assignable = true)
-           , user_assignments as (
-            select distinct pa.tenant_id
-                          , t.uuid             as tenant_uuid
-                          , ep.permission_code as full_code
-                          , ep.permission_short_code as short_code
-            from auth.permission_assignment pa
-                     inner join auth.tenant t on pa.tenant_id = t.tenant_id
-                     inner join auth.effective_permissions ep
-                                on pa.perm_set_id = ep.perm_set_id
-            where pa.user_id = _target_user_id
-              and ep.perm_set_is_assignable = true
-              and ep.permission_is_assignable = true
-            union
-            select distinct pa.tenant_id
-                          , t.uuid as tenant_uuid
-                          , sp.full_code
-                          , sp.short_code
-            from auth.permission_assignment pa
-                     inner join auth.tenant t on pa.tenant_id = t.tenant_id
-                     inner join auth.permission p
-                                on pa.permission_id = p.permission_id
-                     inner join auth.permission sp
-                                on sp.node_path <@ p.node_path and sp.is_assignable = true
-            where pa.user_id = _target_user_id)
-           , user_permissions as (
-            select distinct ga.tenant_id
-                          , ga.tenant_uuid
-                          , ga.full_code
-                          , ga.short_code
-            from group_assignments ga
-            union
-            select ua.tenant_id
-                 , ua.tenant_uuid
-                 , ua.full_code
-                 , ua.short_code
-            from user_assignments ua
-            order by full_code)
-        insert
-        into __temp_users_groups_permissions(tenant_id, tenant_uuid, group_codes, permission_codes, short_code_permission_codes)
-        select data.tenant_id
-             , data.tenant_uuid
-             , coalesce(array_agg(distinct data.groups) filter ( where data.groups is not null ), array []::text[])
-             , coalesce(array_agg(distinct data.perms) filter ( where data.perms is not null ), array []::text[])
-             , coalesce(array_agg(distinct data.short_code_perms) filter ( where data.short_code_perms is not null ), array []::text[])
-        from (
-                 select ug.tenant_id
-                      , ug.tenant_uuid
-                      , ug.group_code as groups
-                      , null          as perms
-                      , null          as short_code_perms
-                 from ugs ug
-                 union
-                 select up.tenant_id
-                      , up.tenant_uuid
-                      , null
-                      , up.full_code::text
-                      , up.short_code
-                 from user_permissions up) data
-        group by data.tenant_id, data.tenant_uuid;
-
         __expiration_date := now() + interval '1 second' * __perm_cache_timeout_in_s;
 
-        insert into auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions,
-                                                short_code_permissions, expiration_date)
-        select _created_by
-             , _target_user_id
-             , tugp.tenant_id
-             , tugp.tenant_uuid
-             , tugp.group_codes
-             , tugp.permission_codes
-             , tugp.short_code_permission_codes
-             , __expiration_date
-        from __temp_users_groups_permissions tugp
-        on conflict (user_id, tenant_id )
-            do update
-            set updated_at              = now()
-              , updated_by              = _created_by
-              , groups                  = excluded.groups
-              , permissions             = excluded.permissions
-              , short_code_permissions  = excluded.short_code_permissions
-              , expiration_date         = __expiration_date;
-
+        -- One statement, no temporary table: the cache upsert is a data-modifying CTE over the
+        -- computed set, which is also what the function returns
         return query
-            select ugp.tenant_id
-                 , ugp.tenant_uuid
-                 , ugp.group_codes
-                 , ugp.permission_codes
-                 , ugp.short_code_permission_codes
-            from __temp_users_groups_permissions ugp
+            with computed as (
+                select cu.__tenant_id                   as tenant_id
+                     , cu.__tenant_uuid                 as tenant_uuid
+                     , cu.__group_codes                 as group_codes
+                     , cu.__permission_codes            as permission_codes
+                     , cu.__short_code_permission_codes as short_code_permission_codes
+                     , cu.__permission_ids              as permission_ids
+                from internal.calculate_users_permissions(array [_target_user_id]) cu)
+               , upserted as (
+                insert into auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids,
+                                                        expiration_date)
+                select _created_by
+                     , _target_user_id
+                     , c.tenant_id
+                     , c.tenant_uuid
+                     , c.group_codes
+                     , c.permission_ids
+                     , __expiration_date
+                from computed c
+                on conflict (user_id, tenant_id)
+                    do update
+                    set updated_at        = now()
+                      , updated_by        = _created_by
+                      , groups            = excluded.groups
+                      , permission_ids    = excluded.permission_ids
+                      , expiration_date   = __expiration_date
+                      , last_requested_at = now()
+                returning tenant_id)
+            select c.tenant_id
+                 , c.tenant_uuid
+                 , c.group_codes
+                 , c.permission_codes
+                 , c.short_code_permission_codes
+            from computed c
             where _tenant_id is null
-               or ugp.tenant_id = _tenant_id
-            order by ugp.tenant_id;
+               or c.tenant_id = _tenant_id
+            order by c.tenant_id;
     end if;
 end;
 $$;
 
+-- Set-based counterpart of recalculate_user_permissions for many users at once (mass invalidation
+-- events, background refreshers): computes the cache content of all users in one grouped query and
+-- upserts it in one statement, removing rows of tenants the users no longer belong to.
+-- Unknown, inactive and locked users are skipped (their checks fail before the cache is read).
+-- Unlike the request path it does not touch last_requested_at of existing rows.
+-- With _tenant_id only that tenant's rows are recalculated. Returns the number of cache rows written.
+create or replace function unsecure.recalculate_permissions_for_users(_created_by text, _user_ids bigint[], _tenant_id integer DEFAULT NULL::integer) returns integer
+    language plpgsql
+as
+$$
+declare
+    __perm_cache_timeout_in_s bigint;
+    __expiration_date         timestamptz;
+    __user_ids                bigint[];
+    __upserted                integer;
+begin
+    select array_agg(ui.user_id)
+    from auth.user_info ui
+    where ui.user_id = any (_user_ids)
+      and ui.is_active
+      and not ui.is_locked
+    into __user_ids;
+
+    if __user_ids is null then
+        return 0;
+    end if;
+
+    select number_value
+    from const.sys_param sp
+    where sp.group_code = 'auth'
+      and sp.code = 'perm_cache_timeout_in_s'
+    into __perm_cache_timeout_in_s;
+
+    if
+        (__perm_cache_timeout_in_s is null)
+    then
+        __perm_cache_timeout_in_s := 300;
+    end if;
+
+    __expiration_date := now() + interval '1 second' * __perm_cache_timeout_in_s;
+
+    with computed as (
+        select cu.__user_id        as user_id
+             , cu.__tenant_id      as tenant_id
+             , cu.__tenant_uuid    as tenant_uuid
+             , cu.__group_codes    as group_codes
+             , cu.__permission_ids as permission_ids
+        from internal.calculate_users_permissions(__user_ids, _tenant_id) cu)
+       , obsolete as (
+        delete
+        from auth.user_permission_cache upc
+        where upc.user_id = any (__user_ids)
+          and (_tenant_id is null or upc.tenant_id = _tenant_id)
+          and not exists(select
+                         from computed c
+                         where c.user_id = upc.user_id
+                           and c.tenant_id = upc.tenant_id))
+    insert
+    into auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    select _created_by
+         , c.user_id
+         , c.tenant_id
+         , c.tenant_uuid
+         , c.group_codes
+         , c.permission_ids
+         , __expiration_date
+    from computed c
+    -- stable lock order against concurrent recalculations
+    order by c.user_id, c.tenant_id
+    on conflict (user_id, tenant_id)
+        do update
+        set updated_at      = now()
+          , updated_by      = _created_by
+          , groups          = excluded.groups
+          , permission_ids  = excluded.permission_ids
+          , expiration_date = __expiration_date;
+
+    get diagnostics __upserted = row_count;
+
+    return __upserted;
+end;
+$$;
+
+-- Refreshes one batch of permission cache rows that are about to expire (auth.perm_cache_warm_ahead_in_s,
+-- default 60 s) for users whose cache was requested within auth.perm_cache_warm_active_window_in_s
+-- (default 3600 s), so the request path does not pay the recalculation. A user is claimed as a whole:
+-- all of their cache rows are locked with FOR UPDATE SKIP LOCKED, and only users whose every row was
+-- locked are recalculated (all tenants). The recalculation therefore writes only rows this batch holds,
+-- and several workers can run side by side without deadlocking on each other's rows. A user partly
+-- locked elsewhere is left to that holder. Returns the number of claimed users.
+-- Cache hits do not write last_requested_at (has_permissions stays a read-only, stable check), so a
+-- user drops out of warming once the active window has passed since their last recalculation on the
+-- request path: at most one miss per active window instead of one per perm_cache_timeout_in_s.
+create or replace function unsecure.refresh_expiring_permission_cache(_refreshed_by text DEFAULT 'cache_warm', _batch_size integer DEFAULT NULL::integer) returns integer
+    language plpgsql
+as
+$$
+declare
+    __warm_ahead_in_s    bigint;
+    __active_window_in_s bigint;
+    __claimed            integer;
+    __user_ids           bigint[];
+    __user               record;
+begin
+    select number_value
+    from const.sys_param sp
+    where sp.group_code = 'auth'
+      and sp.code = 'perm_cache_warm_ahead_in_s'
+    into __warm_ahead_in_s;
+
+    if __warm_ahead_in_s is null then
+        __warm_ahead_in_s := 60;
+    end if;
+
+    select number_value
+    from const.sys_param sp
+    where sp.group_code = 'auth'
+      and sp.code = 'perm_cache_warm_active_window_in_s'
+    into __active_window_in_s;
+
+    if __active_window_in_s is null then
+        __active_window_in_s := 3600;
+    end if;
+
+    if _batch_size is null then
+        select number_value
+        from const.sys_param sp
+        where sp.group_code = 'auth'
+          and sp.code = 'perm_cache_warm_batch_size'
+        into _batch_size;
+
+        _batch_size := coalesce(_batch_size, 200);
+    end if;
+
+    with candidates as (
+        select upc.user_id
+        from auth.user_permission_cache upc
+                 inner join auth.user_info ui on ui.user_id = upc.user_id
+        where upc.expiration_date <= now() + make_interval(secs => __warm_ahead_in_s)
+          and upc.last_requested_at > now() - make_interval(secs => __active_window_in_s)
+          and ui.is_active
+          and not ui.is_locked
+        group by upc.user_id
+        order by min(upc.expiration_date)
+        limit _batch_size)
+       , locked as materialized (
+        select upc.user_id
+        from auth.user_permission_cache upc
+        where upc.user_id in (select c.user_id from candidates c)
+        order by upc.user_id, upc.tenant_id
+        for update skip locked)
+    select array_agg(l.user_id order by l.user_id)
+    from (select lk.user_id, count(*) as row_count
+          from locked lk
+          group by lk.user_id) l
+    where l.row_count = (select count(*)
+                         from auth.user_permission_cache upc
+                         where upc.user_id = l.user_id)
+    into __user_ids;
+
+    __claimed := coalesce(cardinality(__user_ids), 0);
+
+    if __claimed = 0 then
+        return 0;
+    end if;
+
+    for __user in
+        select ui.user_id, ui.last_used_provider_code
+        from auth.user_info ui
+        where ui.user_id = any (__user_ids)
+    loop
+        begin
+            perform unsecure.recalculate_user_groups(_refreshed_by, __user.user_id, __user.last_used_provider_code);
+        exception
+            when invalid_parameter_value then
+                -- last used provider no longer exists: keep the current memberships,
+                -- the permissions are still refreshed from them
+                null;
+        end;
+    end loop;
+
+    -- Warming is not a request: the bulk recalculation keeps last_requested_at of every row.
+    -- Errors (deadlocks, lock timeouts) are not swallowed; the batch rolls back and the rows
+    -- are left to the next run or to the request path.
+    perform unsecure.recalculate_permissions_for_users(_refreshed_by, __user_ids);
+
+    return __claimed;
+end;
+$$;
+
+-- Worker loop around unsecure.refresh_expiring_permission_cache: refreshes batches and commits after
+-- each one (locks are held only per batch) until nothing is left to warm or _max_batches is reached.
+-- Meant for a scheduler (pg_cron, external cron) running it more often than perm_cache_warm_ahead_in_s:
+--   call unsecure.warm_permission_cache();
+create or replace procedure unsecure.warm_permission_cache(_refreshed_by text DEFAULT 'cache_warm', _batch_size integer DEFAULT NULL::integer, _max_batches integer DEFAULT 100)
+    language plpgsql
+as
+$$
+declare
+    __batch integer := 0;
+begin
+    loop
+        __batch := __batch + 1;
+        exit when unsecure.refresh_expiring_permission_cache(_refreshed_by, _batch_size) = 0
+            or __batch >= _max_batches;
+        commit;
+    end loop;
+end;
+$$;
+
 create or replace function unsecure.update_user_identity_uid_oid(_updated_by text, _user_id bigint, _correlation_id text, _target_user_id bigint, _provider_code text, _provider_uid text, _provider_oid text) returns void
     language plpgsql
 as
@@ -2587,6 +3134,85 @@ begin
 end;
 $$;
 
+-- Moves up to _batch_size buffered journal rows (oldest first) from stage.journal_buffer into public.journal
+-- as one insert ... select. Rows are claimed with skip locked, so flushers can run side by side. created_at is
+-- kept, so every row lands in the partition of the month it was written in. A user or tenant deleted since
+-- the row was buffered cannot be referenced any more: the column is written as null and the raw id is kept
+-- in data_payload as unresolved_user_id / unresolved_tenant_id.
+create or replace function unsecure.flush_journal_buffer_batch(
+    _batch_size integer default null
+) returns integer
+    language plpgsql
+as
+$$
+declare
+    __count integer;
+begin
+    if _batch_size is null then
+        select number_value
+        from const.sys_param sp
+        where sp.group_code = 'journal'
+          and sp.code = 'buffer_flush_batch_size'
+        into _batch_size;
+
+        _batch_size := coalesce(_batch_size, 5000);
+    end if;
+
+    with claimed as (
+        select jb.journal_buffer_id
+        from stage.journal_buffer jb
+        order by jb.journal_buffer_id
+        limit _batch_size
+        for update skip locked
+    ), moved as (
+        delete from stage.journal_buffer jb
+        using claimed c
+        where jb.journal_buffer_id = c.journal_buffer_id
+        returning jb.*
+    )
+    insert into public.journal (created_at, created_by, correlation_id, tenant_id, event_id, user_id, keys, data_payload, request_context)
+    select m.created_at, m.created_by, m.correlation_id, t.tenant_id, m.event_id, ui.user_id, m.keys
+         , case
+               when (m.user_id is not null and ui.user_id is null)
+                   or (m.tenant_id is not null and t.tenant_id is null)
+                   then coalesce(m.data_payload, '{}'::jsonb)
+                   || jsonb_strip_nulls(jsonb_build_object(
+                       'unresolved_user_id', case when ui.user_id is null then m.user_id end,
+                       'unresolved_tenant_id', case when t.tenant_id is null then m.tenant_id end))
+               else m.data_payload
+           end
+         , m.request_context
+    from moved m
+             left join auth.tenant t on t.tenant_id = m.tenant_id
+             left join auth.user_info ui on ui.user_id = m.user_id
+    order by m.journal_buffer_id;
+
+    get diagnostics __count = row_count;
+
+    return __count;
+end;
+$$;
+
+-- Worker loop around unsecure.flush_journal_buffer_batch: flushes batches and commits after each one until
+-- the buffer is empty or _max_batches is reached. Schedule it (pg_cron, external cron) while
+-- journal.storage_mode is 'buffered', and once more after switching away from it:
+--   call unsecure.flush_journal_buffer();
+create or replace procedure unsecure.flush_journal_buffer(_batch_size integer DEFAULT NULL::integer, _max_batches integer DEFAULT 100)
+    language plpgsql
+as
+$$
+declare
+    __batch integer := 0;
+begin
+    loop
+        __batch := __batch + 1;
+        exit when unsecure.flush_journal_buffer_batch(_batch_size) = 0
+            or __batch >= _max_batches;
+        commit;
+    end loop;
+end;
+$$;
+
 create or replace function unsecure.purge_journal(
     _deleted_by text, _user_id bigint, _correlation_id text,
     _older_than_days integer default null
@@ -2802,6 +3428,28 @@ begin
 end;
 $$;
 
+/*
+ * unsecure.invalidate_users_group_id_cache — Soft invalidation for a list of users
+ *
+ * If _tenant_id is NULL, invalidates all tenants for the users.
+ */
+create or replace function unsecure.invalidate_users_group_id_cache(
+    _user_ids  bigint[],
+    _tenant_id integer default null
+) returns void
+    language plpgsql
+as
+$$
+begin
+    update auth.user_group_id_cache
+    set expiration_date = now(),
+        updated_by = 'invalidate',
+        updated_at = now()
+    where user_id = any (_user_ids)
+      and (_tenant_id is null or tenant_id = _tenant_id);
+end;
+$$;
+
 /*
  * unsecure.clear_user_group_id_cache — Hard invalidation (delete rows)
  *
@@ -2848,6 +3496,69 @@ begin
 end;
 $$;
 
+/*
+ * internal.is_resource_access_cache_enabled — True when the auth.resource_access_cache_enabled
+ * sys_param is set: auth.has_resource_access then serves checks from auth.user_resource_access_cache.
+ */
+create or replace function internal.is_resource_access_cache_enabled() returns boolean
+    stable
+    language sql
+as
+$$
+select coalesce((select sp.bool_value
+                 from const.sys_param sp
+                 where sp.group_code = 'auth'
+                   and sp.code = 'resource_access_cache_enabled'), false);
+$$;
+
+/*
+ * unsecure.clear_user_resource_access_cache — Hard invalidation (delete rows)
+ *
+ * If _user_ids is NULL, clears all users; if _tenant_id is NULL, all tenants;
+ * if _root_type is NULL, all resource types.
+ */
+create or replace function unsecure.clear_user_resource_access_cache(
+    _user_ids  bigint[],
+    _tenant_id integer default null,
+    _root_type text    default null
+) returns void
+    language plpgsql
+as
+$$
+begin
+    delete from auth.user_resource_access_cache
+    where (_user_ids is null or user_id = any(_user_ids))
+      and (_tenant_id is null or tenant_id = _tenant_id)
+      and (_root_type is null or root_type = _root_type);
+end;
+$$;
+
+/*
+ * unsecure.clear_group_members_resource_access_cache — Hard invalidation of the resource
+ * access cache for all members of a specific group.
+ *
+ * Used for group grants/role assignments and when a group's is_active status changes.
+ */
+create or replace function unsecure.clear_group_members_resource_access_cache(
+    _user_group_id integer,
+    _tenant_id     integer,
+    _root_type     text default null
+) returns void
+    language plpgsql
+as
+$$
+begin
+    delete from auth.user_resource_access_cache
+    where tenant_id = _tenant_id
+      and (_root_type is null or root_type = _root_type)
+      and user_id in (
+          select user_id
+          from auth.user_group_member
+          where user_group_id = _user_group_id
+      );
+end;
+$$;
+
 create or replace function unsecure.check_user_blacklist(
     _username text default null,
     _provider_code text default null,
@@ -60,13 +60,25 @@ begin
 end;
 $$;
 
+-- Resolves permission full codes to their sorted, distinct permission ids (unknown codes are skipped).
+-- Matches on full_code::text (ix_permission_full_code_text), so malformed codes never raise an ltree syntax error.
+create or replace function internal.get_permission_ids(_permission_full_codes text[]) returns integer[]
+    stable
+    language sql
+as
+$$
+select coalesce(array_agg(distinct p.permission_id), array []::integer[])
+from auth.permission p
+where p.full_code::text = any (_permission_full_codes);
+$$;
+
 create or replace function auth.has_permissions(_target_user_id bigint, _correlation_id text, _permission_full_codes text[], _tenant_id integer DEFAULT 1, _throw_err boolean DEFAULT true) returns boolean
     stable
     language plpgsql
 as
 $$
 declare
-    __perms                   text[];
+    __perm_ids                integer[];
     __expiration_date         timestamptz;
     __last_used_provider_code text;
 begin
@@ -82,12 +94,12 @@ begin
         return true;
     end if;
 
-    select permissions
+    select permission_ids
          , expiration_date
     from auth.user_permission_cache upc
     where upc.tenant_id = _tenant_id -- this was originally, either _tenant_id or 1, but from now on it's just _tenant_id
       and user_id = _target_user_id
-    into __perms, __expiration_date;
+    into __perm_ids, __expiration_date;
 
 
     if __expiration_date is null or __expiration_date <= now()
@@ -110,16 +122,16 @@ begin
             , __last_used_provider_code
             );
 
-        select __permissions
-        from unsecure.recalculate_user_permissions('permission_check', _target_user_id, _tenant_id)
-        into __perms;
+        -- Use what the recalculation returns: this function is stable, so a re-read of the cache
+        -- would still see the snapshot taken before the recalculation wrote the row
+        select internal.get_permission_ids(rup.__permissions)
+        from unsecure.recalculate_user_permissions('permission_check', _target_user_id, _tenant_id) rup
+        into __perm_ids;
 
     end if;
 
-    if exists(
-            select
-            from unnest(__perms) p
-                     inner join unnest(_permission_full_codes) rp on p = rp)
+    -- Integer array overlap against the sorted ids in the cache row, no per-call string comparison
+    if __perm_ids && internal.get_permission_ids(_permission_full_codes)
     then
         return true;
     end if;
@@ -151,6 +163,183 @@ begin
 end ;
 $$;
 
+-- Bulk variant of has_permission: every (user, code) pair of the inputs in one call, in input order.
+-- System user and tenant owners are granted everything. Users with a missing or expired cache entry
+-- are found with one query and refreshed with one unsecure.recalculate_permissions_for_users call
+-- before a single set-based evaluation. Never throws: unknown, inactive or locked users and unknown
+-- codes come back as __granted = false.
+-- Must stay volatile: the evaluation reads the cache rows the refresh has just written.
+create or replace function auth.has_permissions_bulk(_target_user_ids bigint[], _correlation_id text, _permission_full_codes text[], _tenant_id integer DEFAULT 1)
+    returns TABLE(__user_id bigint, __code text, __granted boolean)
+    language plpgsql
+as
+$$
+declare
+    __stale_user_ids bigint[];
+begin
+    select array_agg(ui.user_id)
+    from auth.user_info ui
+    where ui.user_id = any (_target_user_ids)
+      and ui.user_id <> 1
+      and ui.is_active
+      and not ui.is_locked
+      and not exists(select
+                     from auth.owner o
+                     where o.user_id = ui.user_id
+                       and o.tenant_id = _tenant_id)
+      and not exists(select
+                     from auth.user_permission_cache upc
+                     where upc.user_id = ui.user_id
+                       and upc.tenant_id = _tenant_id
+                       and upc.expiration_date > now())
+    into __stale_user_ids;
+
+    if __stale_user_ids is not null then
+        -- Provider group sync is per user by nature, but runs as one statement. Users whose last
+        -- provider no longer exists keep their current memberships (recalculate_user_groups would
+        -- raise 22023 and abort the whole check); their permissions are still refreshed below
+        perform count(*)
+        from auth.user_info ui
+                 cross join lateral unsecure.recalculate_user_groups('permission_check', ui.user_id, ui.last_used_provider_code) g
+        where ui.user_id = any (__stale_user_ids)
+          and (ui.last_used_provider_code is null
+            or exists(select
+                      from auth.provider p
+                      where p.code = ui.last_used_provider_code));
+
+        perform unsecure.recalculate_permissions_for_users('permission_check', __stale_user_ids, _tenant_id);
+
+        -- A miss is a request, like in has_permissions (recalculate_permissions_for_users keeps
+        -- last_requested_at for the warmer); cache hits write nothing
+        update auth.user_permission_cache upc
+        set last_requested_at = now()
+        where upc.user_id = any (__stale_user_ids)
+          and upc.tenant_id = _tenant_id;
+    end if;
+
+    return query
+        with users as (select u.user_id
+                            , u.user_ord
+                            , u.user_id = 1
+                                  or exists(select
+                                            from auth.owner o
+                                            where o.user_id = u.user_id
+                                              and o.tenant_id = _tenant_id) as is_superuser
+                            , upc.permission_ids
+                       from unnest(_target_user_ids) with ordinality as u(user_id, user_ord)
+                                left join auth.user_info ui
+                                          on ui.user_id = u.user_id
+                                              and ui.is_active
+                                              and not ui.is_locked
+                                left join auth.user_permission_cache upc
+                                          on upc.user_id = ui.user_id
+                                              and upc.tenant_id = _tenant_id
+                                              and upc.expiration_date > now())
+           , codes as (select c.code
+                            , c.code_ord
+                            , p.permission_id
+                       from unnest(_permission_full_codes) with ordinality as c(code, code_ord)
+                                left join auth.permission p on p.full_code::text = c.code)
+        select us.user_id
+             , cs.code
+             , coalesce(us.is_superuser, false)
+                   or coalesce(cs.permission_id = any (us.permission_ids), false)
+        from users us
+                 cross join codes cs
+        order by us.user_ord, cs.code_ord;
+end;
+$$;
+
+-- For the tenant switcher: which of the target user's tenants grant the given permissions.
+-- Reads all of the user's cache rows at once; if any tenant is missing or expired, the whole
+-- cache is rebuilt with a single recalculate_user_permissions(_tenant_id := null) call.
+-- __has_permissions follows has_permissions (any of the codes), __granted_codes lists which ones.
+create or replace function auth.get_permission_matrix_by_tenant(_user_id bigint, _correlation_id text, _target_user_id bigint, _permission_full_codes text[], _tenant_id integer DEFAULT 1)
+    returns TABLE(__tenant_id integer, __tenant_uuid text, __tenant_code text, __tenant_title text, __has_permissions boolean, __granted_codes text[])
+    language plpgsql
+as
+$$
+declare
+    __necessary_permission_code text := 'users.get_available_tenants';
+    __tenant_ids                integer[];
+    __owner_tenant_ids          integer[];
+begin
+    if _user_id <> _target_user_id and not auth.has_permission(_user_id, _correlation_id, __necessary_permission_code, _tenant_id)
+    then
+        perform internal.throw_no_permission(_user_id, __necessary_permission_code);
+    end if;
+
+    -- Tenants the user belongs to: group memberships, direct assignments and ownerships
+    select coalesce(array_agg(distinct ut.tenant_id), array []::integer[])
+    from (select ug.tenant_id
+          from auth.user_group_member ugm
+                   inner join auth.user_group ug on ug.user_group_id = ugm.user_group_id
+          where ugm.user_id = _target_user_id
+          union
+          select pa.tenant_id
+          from auth.permission_assignment pa
+          where pa.user_id = _target_user_id
+          union
+          select o.tenant_id
+          from auth.owner o
+          where o.user_id = _target_user_id) ut
+             inner join auth.tenant t on t.tenant_id = ut.tenant_id
+    where t.deleted_at is null
+    into __tenant_ids;
+
+    select coalesce(array_agg(distinct o.tenant_id), array []::integer[])
+    from auth.owner o
+    where o.user_id = _target_user_id
+      and o.tenant_id = any (__tenant_ids)
+    into __owner_tenant_ids;
+
+    if _target_user_id <> 1 and exists(
+            select
+            from unnest(__tenant_ids) as ut(tenant_id)
+            where ut.tenant_id <> all (__owner_tenant_ids)
+              and not exists(select
+                             from auth.user_permission_cache upc
+                             where upc.user_id = _target_user_id
+                               and upc.tenant_id = ut.tenant_id
+                               and upc.expiration_date > now()))
+    then
+        perform unsecure.recalculate_user_groups('permission_check'
+            , _target_user_id
+            , (select last_used_provider_code from auth.user_info where user_id = _target_user_id)
+            );
+
+        perform unsecure.recalculate_user_permissions('permission_check', _target_user_id, null);
+    end if;
+
+    return query
+        with requested as (select c.code
+                                , c.code_ord
+                                , p.permission_id
+                           from unnest(_permission_full_codes) with ordinality as c(code, code_ord)
+                                    left join auth.permission p on p.full_code::text = c.code)
+        select t.tenant_id
+             , t.uuid::text
+             , t.code
+             , t.title
+             , coalesce(g.granted_codes <> array []::text[], false)
+             , coalesce(g.granted_codes, array []::text[])
+        from auth.tenant t
+                 left join lateral (
+            select array_agg(r.code order by r.code_ord)
+                       filter ( where _target_user_id = 1
+                                   or t.tenant_id = any (__owner_tenant_ids)
+                                   or r.permission_id = any (upc.permission_ids)) as granted_codes
+            from requested r
+                     left join auth.user_permission_cache upc
+                               on upc.user_id = _target_user_id
+                                   and upc.tenant_id = t.tenant_id
+                                   and upc.expiration_date > now()
+            ) g on true
+        where t.tenant_id = any (__tenant_ids)
+        order by t.title;
+end;
+$$;
+
 create or replace function auth.get_effective_group_permissions(_requested_by text, _user_id bigint, _correlation_id text, _group_id integer, _tenant_id integer DEFAULT 1)
     returns TABLE(__full_code text, __permission_title text, __perm_set_title text, __perm_set_code text, __perm_set_id integer, __assignment_id bigint)
     language plpgsql
@@ -30,7 +30,17 @@ $$;
  *
  * Paginated search of user events with optional filters.
  * Requires 'authentication.read_user_events' permission.
+ *
+ * Without a 'from' criterion, only the last user_event.search_window_days days
+ * (sys_param, default 31) before 'to' (or now) are searched, so only the matching
+ * monthly partitions are scanned.
+ *
+ * Pagination: _page / _page_size (offset), or keyset with _after_created_at /
+ * _after_user_event_id set to the last row of the previous page (newest first).
+ * __total_items is only computed with _include_total = true, null otherwise.
  */
+drop function if exists auth.search_user_events(bigint, text, jsonb, integer, integer, integer, integer);
+
 create or replace function auth.search_user_events(
     _user_id bigint,
     _correlation_id text default null,
@@ -38,7 +48,10 @@ create or replace function auth.search_user_events(
     _page integer default 1,
     _page_size integer default 10,
     _tenant_id integer default 1,
-    _target_tenant_id integer default null
+    _target_tenant_id integer default null,
+    _include_total boolean default false,
+    _after_created_at timestamptz default null,
+    _after_user_event_id bigint default null
 )
     returns table(
         __user_event_id bigint,
@@ -65,35 +78,66 @@ declare
     __target_user_id bigint;
     __request_context_criteria jsonb;
     __filter_correlation_id text;
+    __search_window_days integer;
     __from timestamptz;
     __to timestamptz;
+    __total_items bigint;
 begin
     __effective_tenant_id := internal.resolve_cross_tenant_access(
         _user_id, _correlation_id, 'authentication.read_all_user_events', 'authentication.read_user_events', _tenant_id, _target_tenant_id);
 
+    select number_value
+    from const.sys_param sp
+    where sp.group_code = 'user_event'
+      and sp.code = 'search_window_days'
+    into __search_window_days;
+
+    if __search_window_days is null then
+        __search_window_days := 31;
+    end if;
+
     __event_type_code := _search_criteria ->> 'event_type_code';
     __target_user_id := (_search_criteria ->> 'target_user_id')::bigint;
     __request_context_criteria := (_search_criteria -> 'request_context')::jsonb;
     __filter_correlation_id := _search_criteria ->> 'correlation_id';
-    __from := coalesce((_search_criteria ->> 'from')::timestamptz, now() - interval '100 years');
-    __to := coalesce((_search_criteria ->> 'to')::timestamptz, now() + interval '100 years');
+    __to := coalesce((_search_criteria ->> 'to')::timestamptz, 'infinity'::timestamptz);
+    __from := coalesce((_search_criteria ->> 'from')::timestamptz,
+                       coalesce((_search_criteria ->> 'to')::timestamptz, now()) - make_interval(days => __search_window_days));
 
     _page := coalesce(_page, 1);
     _page_size := least(coalesce(_page_size, 10), 100);
 
+    if _include_total then
+        select count(*)
+        from auth.user_event ue
+        where (__event_type_code is null or ue.event_type_code = __event_type_code)
+          and (__target_user_id is null or ue.target_user_id = __target_user_id)
+          and (__request_context_criteria is null or ue.request_context @> __request_context_criteria)
+          and (__filter_correlation_id is null or ue.correlation_id = __filter_correlation_id)
+          and ue.created_at between __from and __to
+        into __total_items;
+    end if;
+
+    -- Keyset: nothing newer than the cursor is needed, which also prunes newer partitions
+    if _after_created_at is not null then
+        __to := least(__to, _after_created_at);
+    end if;
+
     return query
         with filtered_rows as (
             select ue.user_event_id
                  , ue.created_at as event_created_at
-                 , count(1) over () as total_items
             from auth.user_event ue
             where (__event_type_code is null or ue.event_type_code = __event_type_code)
               and (__target_user_id is null or ue.target_user_id = __target_user_id)
               and (__request_context_criteria is null or ue.request_context @> __request_context_criteria)
               and (__filter_correlation_id is null or ue.correlation_id = __filter_correlation_id)
               and ue.created_at between __from and __to
-            order by ue.created_at desc
-            offset ((_page - 1) * _page_size) limit _page_size
+              and (_after_created_at is null
+                   or (ue.created_at, ue.user_event_id) < (_after_created_at, coalesce(_after_user_event_id, 0)))
+            order by ue.created_at desc, ue.user_event_id desc
+            offset case when _after_created_at is null then (_page - 1) * _page_size else 0 end
+            limit _page_size
         )
         select ue.user_event_id
              , ue.event_type_code
@@ -107,10 +151,10 @@ begin
              , ue.correlation_id
              , ue.created_at
              , ue.created_by
-             , fr.total_items
+             , __total_items
         from filtered_rows fr
         join auth.user_event ue on ue.user_event_id = fr.user_event_id and ue.created_at = fr.event_created_at
-        order by ue.created_at desc;
+        order by ue.created_at desc, ue.user_event_id desc;
 end;
 $$;
 
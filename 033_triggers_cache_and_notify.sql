@@ -16,8 +16,12 @@
  *
  * Companion changes in 019_functions_unsecure.sql:
  * - unsecure.notify_permission_change() — the notification function
+ * - unsecure.flush_permission_change_queue() — sends notifications coalesced per transaction
  * - unsecure.invalidate_permission_users_cache() — permission-level cache helper
  * - unsecure.invalidate_users_permission_cache() — bulk user cache helper
+ * - unsecure.patch_perm_set_users_permission_cache() — incremental cache patch for permissions added to a perm set
+ * - unsecure.sync_permission_closure() / refresh_perm_set_closure() — closure table maintenance
+ * - unsecure.clear_user_resource_access_cache() / clear_group_members_resource_access_cache() — resource access cache helpers
  * - unsecure.create_user_group_member() — cache invalidation added
  * - unsecure.set_permission_as_assignable() — cache invalidation added
  * - unsecure.update_perm_set() — cache invalidation added on is_assignable change
@@ -31,16 +35,27 @@ set search_path = public, const, ext, stage, helpers, internal, unsecure, auth,
 -- PART 1: CACHE INVALIDATION TRIGGER FUNCTIONS
 -- =============================================================================
 
--- Cache invalidation on user_group_member DELETE
+-- Cache invalidation on user_group_member DELETE (statement level, transition table old_rows)
 -- Covers: auth.delete_user_group_member(), set_user_group_as_external/internal(), cascade deletes
+-- All members removed by one statement are invalidated with one statement per cache
 create or replace function triggers.cache_user_group_member_delete() returns trigger
     language plpgsql
 as
 $$
+declare
+    __user_ids bigint[];
 begin
-    perform unsecure.clear_permission_cache('trigger', OLD.user_id, null);
-    perform unsecure.invalidate_user_group_id_cache(OLD.user_id, null);
-    return OLD;
+    select array_agg(distinct o.user_id)
+    from old_rows o
+    into __user_ids;
+
+    if __user_ids is not null then
+        perform unsecure.clear_users_permission_cache('trigger', __user_ids, null);
+        perform unsecure.invalidate_users_group_id_cache(__user_ids, null);
+        perform unsecure.clear_user_resource_access_cache(__user_ids, null);
+    end if;
+
+    return null;
 end;
 $$;
 
@@ -56,6 +71,8 @@ begin
             'trigger', NEW.user_group_id, NEW.tenant_id);
         perform unsecure.invalidate_group_members_group_id_cache(
             NEW.user_group_id, NEW.tenant_id);
+        perform unsecure.clear_group_members_resource_access_cache(
+            NEW.user_group_id, NEW.tenant_id);
     end if;
     return NEW;
 end;
@@ -77,9 +94,8 @@ begin
 
     if __affected_user_ids is not null then
         perform unsecure.invalidate_users_permission_cache('trigger', __affected_user_ids, OLD.tenant_id);
-        -- Hard-clear group ID cache for all affected members
-        perform unsecure.invalidate_user_group_id_cache(uid, OLD.tenant_id)
-        from unnest(__affected_user_ids) as uid;
+        perform unsecure.invalidate_users_group_id_cache(__affected_user_ids, OLD.tenant_id);
+        perform unsecure.clear_user_resource_access_cache(__affected_user_ids, OLD.tenant_id);
     end if;
 
     return OLD;
@@ -133,15 +149,25 @@ end;
 $$;
 
 
--- Cache invalidation on user_group_member INSERT
--- Covers: unsecure.create_user_group_member(), auth.create_user_group_member()
+-- Cache invalidation on user_group_member INSERT (statement level, transition table new_rows)
+-- Covers: unsecure.create_user_group_member(), auth.create_user_group_member(), bulk imports and group syncs
 create or replace function triggers.cache_user_group_member_insert() returns trigger
     language plpgsql
 as
 $$
+declare
+    __user_ids bigint[];
 begin
-    perform unsecure.invalidate_user_group_id_cache(NEW.user_id, null);
-    return NEW;
+    select array_agg(distinct n.user_id)
+    from new_rows n
+    into __user_ids;
+
+    if __user_ids is not null then
+        perform unsecure.invalidate_users_group_id_cache(__user_ids, null);
+        perform unsecure.clear_user_resource_access_cache(__user_ids, null);
+    end if;
+
+    return null;
 end;
 $$;
 
@@ -155,6 +181,7 @@ begin
     if TG_OP = 'DELETE' then
         -- CASCADE on user_group_id_cache handles this, but be explicit
         perform unsecure.clear_user_group_id_cache(OLD.user_id, null);
+        perform unsecure.clear_user_resource_access_cache(array [OLD.user_id], null);
         return OLD;
     end if;
 
@@ -162,12 +189,145 @@ begin
     if (OLD.is_active is distinct from NEW.is_active and NEW.is_active = false)
        or (OLD.is_locked is distinct from NEW.is_locked and NEW.is_locked = true) then
         perform unsecure.clear_user_group_id_cache(NEW.user_id, null);
+        perform unsecure.clear_user_resource_access_cache(array [NEW.user_id], null);
     end if;
 
     return NEW;
 end;
 $$;
 
+-- Resource access cache invalidation on grant/deny and role assignment changes
+-- Attached to auth.resource_access and auth.resource_role_assignment (triggers in 034_tables_resource_access.sql)
+-- Covers: assign/deny/revoke_resource_access(), assign/revoke_resource_role(), cascade deletes
+-- A grant on an ancestor type or path reaches any resource of the root type, so the grantee's rows for the
+-- whole root type are cleared
+-- Statement level: one delete per transition table for every (user, tenant, root type) the statement touched,
+-- group grantees expanded to their members
+create or replace function triggers.cache_resource_access_change() returns trigger
+    language plpgsql
+as
+$$
+begin
+    if TG_OP in ('UPDATE', 'DELETE') then
+        delete
+        from auth.user_resource_access_cache urac
+        using (select o.user_id, o.tenant_id, o.root_type
+               from old_rows o
+               where o.user_id is not null
+               union
+               select ugm.user_id, o.tenant_id, o.root_type
+               from old_rows o
+                        inner join auth.user_group_member ugm on ugm.user_group_id = o.user_group_id) affected
+        where urac.user_id = affected.user_id
+          and urac.tenant_id = affected.tenant_id
+          and urac.root_type = affected.root_type;
+    end if;
+
+    if TG_OP in ('INSERT', 'UPDATE') then
+        delete
+        from auth.user_resource_access_cache urac
+        using (select n.user_id, n.tenant_id, n.root_type
+               from new_rows n
+               where n.user_id is not null
+               union
+               select ugm.user_id, n.tenant_id, n.root_type
+               from new_rows n
+                        inner join auth.user_group_member ugm on ugm.user_group_id = n.user_group_id) affected
+        where urac.user_id = affected.user_id
+          and urac.tenant_id = affected.tenant_id
+          and urac.root_type = affected.root_type;
+    end if;
+
+    return null;
+end;
+$$;
+
+-- Resource access cache invalidation on role redefinition (flags added to or removed from a role)
+-- Covers: ensure_resource_role_flags(), delete_resource_role() cascades
+create or replace function triggers.cache_resource_role_flag_change() returns trigger
+    language plpgsql
+as
+$$
+begin
+    perform unsecure.clear_user_resource_access_cache(null, null, split_part(rr.resource_type, '.', 1))
+    from const.resource_role rr
+    where rr.code = coalesce(NEW.resource_role_code, OLD.resource_role_code);
+
+    return null;
+end;
+$$;
+
+-- Resource access cache invalidation on resource type hierarchy or status changes
+-- Covers: update_resource_type(), ensure_resource_types()
+create or replace function triggers.cache_resource_type_change() returns trigger
+    language plpgsql
+as
+$$
+begin
+    perform unsecure.clear_user_resource_access_cache(null, null, split_part(OLD.code, '.', 1));
+    return null;
+end;
+$$;
+
+-- Permission closure maintenance on permission tree changes (statement level, transition tables)
+-- Covers: permission create (insert + node_path update), node_path moves, set_permission_as_assignable()
+-- Every permission of the statement whose node_path or is_assignable changed is handled in one
+-- unsecure.sync_permission_closure call. Deletes need no trigger: closure rows cascade.
+create or replace function triggers.closure_permission_change() returns trigger
+    language plpgsql
+as
+$$
+declare
+    __changed_ids integer[];
+begin
+    if TG_OP = 'INSERT' then
+        __changed_ids := array(select n.permission_id from new_rows n);
+    else
+        __changed_ids := array(select n.permission_id
+                               from new_rows n
+                                        inner join old_rows o on o.permission_id = n.permission_id
+                               where o.node_path is distinct from n.node_path
+                                  or o.is_assignable is distinct from n.is_assignable);
+    end if;
+
+    if cardinality(__changed_ids) > 0 then
+        perform unsecure.sync_permission_closure(__changed_ids);
+    end if;
+
+    return null;
+end;
+$$;
+
+-- Perm set closure maintenance on perm_set is_assignable change
+-- Covers: update_perm_set()
+create or replace function triggers.closure_perm_set_change() returns trigger
+    language plpgsql
+as
+$$
+begin
+    perform unsecure.refresh_perm_set_closure(array [coalesce(NEW.perm_set_id, OLD.perm_set_id)]);
+    return null;
+end;
+$$;
+
+-- Perm set closure maintenance on perm_set_perm INSERT/DELETE (statement level, transition tables)
+-- Covers: create/delete_perm_set_permissions(), copy_perm_set()
+-- Each perm set touched by the statement is recomputed once, not once per permission row
+create or replace function triggers.closure_perm_set_perm_change() returns trigger
+    language plpgsql
+as
+$$
+begin
+    if TG_OP = 'INSERT' then
+        perform unsecure.refresh_perm_set_closure(array(select distinct n.perm_set_id from new_rows n));
+    else
+        perform unsecure.refresh_perm_set_closure(array(select distinct o.perm_set_id from old_rows o));
+    end if;
+
+    return null;
+end;
+$$;
+
 -- =============================================================================
 -- PART 2: NOTIFICATION TRIGGER FUNCTIONS
 -- =============================================================================
@@ -446,6 +606,17 @@ end;
 $$;
 
 
+-- Sends the transaction's coalesced notifications at commit (auth.perm_change_notify_coalesce)
+create or replace function triggers.flush_permission_change_queue() returns trigger
+    language plpgsql
+as
+$$
+begin
+    perform unsecure.flush_permission_change_queue();
+    return null;
+end;
+$$;
+
 -- =============================================================================
 -- PART 3: CREATE TRIGGER STATEMENTS
 -- =============================================================================
@@ -469,7 +640,8 @@ execute function triggers.notify_perm_set_perm();
 create trigger trg_cache_user_group_member_delete
     after delete
     on auth.user_group_member
-    for each row
+    referencing old table as old_rows
+    for each statement
 execute function triggers.cache_user_group_member_delete();
 
 -- Notification on insert/delete
@@ -576,7 +748,8 @@ execute function triggers.notify_api_key();
 create trigger trg_cache_user_group_member_insert
     after insert
     on auth.user_group_member
-    for each row
+    referencing new table as new_rows
+    for each statement
 execute function triggers.cache_user_group_member_insert();
 
 -- ---- user_info (group ID cache) ----
@@ -586,3 +759,54 @@ create trigger trg_cache_user_group_id_on_user_change
     on auth.user_info
     for each row
 execute function triggers.cache_user_group_id_on_user_change();
+
+-- ---- permission / perm_set / perm_set_perm (closure tables) ----
+-- Transition tables allow neither several events nor an update column list per trigger, so the
+-- update trigger fires for every update and the function keeps only node_path / is_assignable changes
+create trigger trg_closure_permission_insert
+    after insert
+    on auth.permission
+    referencing new table as new_rows
+    for each statement
+execute function triggers.closure_permission_change();
+
+create trigger trg_closure_permission_update
+    after update
+    on auth.permission
+    referencing old table as old_rows new table as new_rows
+    for each statement
+execute function triggers.closure_permission_change();
+
+create trigger trg_closure_perm_set_perm_insert
+    after insert
+    on auth.perm_set_perm
+    referencing new table as new_rows
+    for each statement
+execute function triggers.closure_perm_set_perm_change();
+
+create trigger trg_closure_perm_set_perm_delete
+    after delete
+    on auth.perm_set_perm
+    referencing old table as old_rows
+    for each statement
+execute function triggers.closure_perm_set_perm_change();
+
+create trigger trg_closure_perm_set_change
+    after update of is_assignable
+    on auth.perm_set
+    for each row
+    when (OLD.is_assignable is distinct from NEW.is_assignable)
+execute function triggers.closure_perm_set_change();
+
+-- ---- permission_change_queue (coalesced notifications) ----
+-- Fires once per transaction, at commit, for the first queued row
+create constraint trigger trg_flush_permission_change_queue
+    after insert
+    on stage.permission_change_queue
+    deferrable initially deferred
+    for each row
+    when (NEW.is_flush_marker)
+execute function triggers.flush_permission_change_queue();
+
+-- Initial fill: permissions and perm sets seeded before these triggers existed
+select unsecure.rebuild_permission_closures();
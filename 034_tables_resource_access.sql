@@ -8,7 +8,7 @@
  * v3: resource_id is jsonb (composite key support).
  *     const.resource_type has key_schema defining expected key fields.
  *     Hierarchical resource types (ltree), root-type partitioning,
- *     and group membership cache table.
+ *     group membership cache table and per-user resource access cache.
  *
  * This file is part of the PostgreSQL Permissions Model v3
  */
@@ -179,6 +179,16 @@ create index ix_ra_group_resources
     on auth.resource_access (root_type, resource_type, tenant_id, user_group_id)
     where user_group_id is not null;
 
+-- Keyset pages: "next N resources of user / group X after cursor (type, id, path)"
+-- (auth.get_user_accessible_resources_page). Ordered scan stops once the page is full.
+create index ix_ra_user_resource_keyset
+    on auth.resource_access (root_type, tenant_id, user_id, resource_type, resource_id, (coalesce(resource_path::text, '')))
+    where user_id is not null;
+
+create index ix_ra_group_resource_keyset
+    on auth.resource_access (root_type, tenant_id, user_group_id, resource_type, resource_id, (coalesce(resource_path::text, '')))
+    where user_group_id is not null;
+
 -- "Who has access to resource Y?" — uses GIN on resource_id
 -- Combined with root_type/resource_type btree filtering
 create index ix_ra_resource_grants
@@ -316,6 +326,15 @@ create index if not exists ix_rra_group_resources
     on auth.resource_role_assignment (root_type, resource_type, tenant_id, user_group_id)
     where user_group_id is not null;
 
+-- Keyset pages (mirror of ix_ra_user_resource_keyset / ix_ra_group_resource_keyset)
+create index if not exists ix_rra_user_resource_keyset
+    on auth.resource_role_assignment (root_type, tenant_id, user_id, resource_type, resource_id, (coalesce(resource_path::text, '')))
+    where user_id is not null;
+
+create index if not exists ix_rra_group_resource_keyset
+    on auth.resource_role_assignment (root_type, tenant_id, user_group_id, resource_type, resource_id, (coalesce(resource_path::text, '')))
+    where user_group_id is not null;
+
 -- "Who has a role on resource Y?" — combined with GIN on resource_id
 create index if not exists ix_rra_resource_assignments
     on auth.resource_role_assignment (root_type, resource_type, tenant_id);
@@ -438,3 +457,98 @@ create table auth.user_group_id_cache
 
 create unique index uq_user_group_id_cache
     on auth.user_group_id_cache (user_id, tenant_id);
+
+/*
+ * auth.user_resource_access_cache — Cached effective flags per user and resource (opt-in)
+ *
+ * Mirrors the pattern of auth.user_group_id_cache:
+ * - Enabled by the auth.resource_access_cache_enabled sys_param (bool, default false)
+ * - Populated on demand by auth.has_resource_access: one row per (user, tenant, resource_type,
+ *   resource_id, resource_path) holding every flag the user effectively has after deny resolution
+ * - TTL: Same sys_param timeout as permission cache (default 300s)
+ * - Hard invalidation: DELETE on grant/deny/role changes (triggers below), on group membership
+ *   and group status changes and on user disable/lock (triggers.cache_* in 033)
+ */
+create table auth.user_resource_access_cache
+(
+    created_at      timestamptz default now()           not null,
+    created_by      text        default 'unknown'::text not null,
+    updated_at      timestamptz default now()           not null,
+    updated_by      text        default 'unknown'::text not null,
+    cache_id        bigint generated always as identity primary key,
+    user_id         bigint      not null references auth.user_info on delete cascade,
+    tenant_id       integer     not null references auth.tenant on delete cascade,
+    resource_type   text        not null,
+    root_type       text        not null,
+    resource_id     jsonb       not null default '{}'::jsonb,
+    resource_path   ext.ltree,
+    access_flags    text[]      not null default '{}',
+    expiration_date timestamptz not null,
+    constraint urac_created_by_check check (length(created_by) <= 250),
+    constraint urac_updated_by_check check (length(updated_by) <= 250)
+);
+
+-- Repeat checks on a hot resource: one lookup on this index
+create unique index uq_user_resource_access_cache
+    on auth.user_resource_access_cache (user_id, tenant_id, resource_type, md5(resource_id::text),
+                                        coalesce(resource_path::text, ''));
+
+-- Invalidation of a whole root type (role redefinition, resource type changes)
+create index ix_user_resource_access_cache_root_type
+    on auth.user_resource_access_cache (root_type);
+
+-- Cache invalidation on grant/deny and role assignment changes, one statement-level trigger per event
+-- (each event gets only the transition tables it has; trigger functions in 033_triggers_cache_and_notify.sql)
+create trigger trg_cache_resource_access_insert
+    after insert
+    on auth.resource_access
+    referencing new table as new_rows
+    for each statement
+execute function triggers.cache_resource_access_change();
+
+create trigger trg_cache_resource_access_update
+    after update
+    on auth.resource_access
+    referencing old table as old_rows new table as new_rows
+    for each statement
+execute function triggers.cache_resource_access_change();
+
+create trigger trg_cache_resource_access_delete
+    after delete
+    on auth.resource_access
+    referencing old table as old_rows
+    for each statement
+execute function triggers.cache_resource_access_change();
+
+create trigger trg_cache_resource_role_assignment_insert
+    after insert
+    on auth.resource_role_assignment
+    referencing new table as new_rows
+    for each statement
+execute function triggers.cache_resource_access_change();
+
+create trigger trg_cache_resource_role_assignment_update
+    after update
+    on auth.resource_role_assignment
+    referencing old table as old_rows new table as new_rows
+    for each statement
+execute function triggers.cache_resource_access_change();
+
+create trigger trg_cache_resource_role_assignment_delete
+    after delete
+    on auth.resource_role_assignment
+    referencing old table as old_rows
+    for each statement
+execute function triggers.cache_resource_access_change();
+
+create trigger trg_cache_resource_role_flag_change
+    after insert or delete
+    on const.resource_role_flag
+    for each row
+execute function triggers.cache_resource_role_flag_change();
+
+create trigger trg_cache_resource_type_change
+    after update of path, is_active, key_schema or delete
+    on const.resource_type
+    for each row
+execute function triggers.cache_resource_type_change();
@@ -4,6 +4,7 @@
  *
  * Functions for resource-based authorization:
  * - auth.has_resource_access          — single resource check (with hierarchy walk-up)
+ * - unsecure.get_cached_resource_access_flags — opt-in per-user effective flag cache for has_resource_access
  * - auth.filter_accessible_resources  — bulk filter (with hierarchy walk-up)
  * - auth.get_resource_access_flags    — effective flags for a user on a resource
  * - auth.get_resource_access_matrix   — full sub-type × flag matrix for UI
@@ -13,6 +14,7 @@
  * - auth.revoke_all_resource_access   — revoke all flags for a resource
  * - auth.get_resource_grants          — list all grants/denies for a resource
  * - auth.get_user_accessible_resources — list resources a user can access
+ * - auth.get_user_accessible_resources_page — keyset-paginated list of resources a user can access
  * - auth.create_resource_type         — register a new resource type (with hierarchy)
  * - auth.update_resource_type         — update resource type title/description/active/source
  * - auth.ensure_resource_types        — bulk-ensure resource types from JSONB array
@@ -132,6 +134,138 @@ begin
 end;
 $$;
 
+-- ============================================================================
+-- Effective flag cache (unsecure)
+-- ============================================================================
+--
+-- Opt-in (auth.resource_access_cache_enabled sys_param) cache of the flags a
+-- user effectively has on one resource, in auth.user_resource_access_cache.
+-- Computed with the same rules as the has_resource_access walk-up, for all
+-- flags at once: per flag, the most specific ancestor type with a user deny or
+-- any grant decides, and a user deny at that level wins.
+
+create or replace function unsecure.calculate_user_resource_access_flags(
+    _user_id       bigint,
+    _tenant_id     integer,
+    _resource_type text,
+    _resource_id   jsonb,
+    _resource_path ext.ltree,
+    _group_ids     integer[]
+) returns text[]
+    stable
+    language sql
+as
+$$
+with ancestors as (
+    select rt.code
+         , ext.nlevel(rt.path) as depth
+         -- id-component lookup key for this ancestor
+         , case
+               when rt.key_schema is not null and rt.key_schema <> '{}'::jsonb
+                   then coalesce((select jsonb_object_agg(k, _resource_id -> k)
+                                  from jsonb_object_keys(rt.key_schema) as k
+                                  where _resource_id ? k), '{}'::jsonb)
+               else _resource_id
+           end               as ancestor_key
+    from const.resource_type rt
+    where rt.path @> (select path from const.resource_type where code = _resource_type)
+      and rt.is_active = true)
+   , matches as (
+    select a.depth, ra.access_flag, ra.is_deny
+    from ancestors a
+             inner join auth.resource_access ra
+                        on ra.resource_type = a.code
+                            and (ra.resource_id = '{}'::jsonb or ra.resource_id = a.ancestor_key)
+    where ra.root_type = split_part(_resource_type, '.', 1)
+      and ra.tenant_id = _tenant_id
+      and (ra.resource_path is null
+           or (_resource_path is not null and _resource_path <@ ra.resource_path))
+      and (ra.user_id = _user_id
+           or (ra.user_group_id = any(_group_ids) and ra.is_deny = false))
+    union all
+    select a.depth, rrf.access_flag_code, false
+    from ancestors a
+             inner join auth.resource_role_assignment rra
+                        on rra.resource_type = a.code
+                            and (rra.resource_id = '{}'::jsonb or rra.resource_id = a.ancestor_key)
+             inner join const.resource_role_flag rrf
+                        on rrf.resource_role_code = rra.role_code
+    where rra.root_type = split_part(_resource_type, '.', 1)
+      and rra.tenant_id = _tenant_id
+      and (rra.resource_path is null
+           or (_resource_path is not null and _resource_path <@ rra.resource_path))
+      and (rra.user_id = _user_id or rra.user_group_id = any(_group_ids)))
+   , decided as (
+    select distinct on (m.access_flag) m.access_flag, m.is_deny
+    from matches m
+    order by m.access_flag, m.depth desc, m.is_deny desc)
+select coalesce(array_agg(d.access_flag order by d.access_flag) filter ( where not d.is_deny ), array []::text[])
+from decided d;
+$$;
+
+-- Returns the cached effective flags of a user on a resource.
+-- On cache miss or expiry: calculates them, upserts the cache row, returns.
+-- Uses the same TTL sys_param as the permission cache (default 300s).
+create or replace function unsecure.get_cached_resource_access_flags(
+    _user_id       bigint,
+    _tenant_id     integer,
+    _resource_type text,
+    _resource_id   jsonb,
+    _resource_path ext.ltree
+) returns text[]
+    language plpgsql
+as
+$$
+declare
+    __access_flags            text[];
+    __perm_cache_timeout_in_s bigint;
+begin
+    select urac.access_flags
+    from auth.user_resource_access_cache urac
+    where urac.user_id = _user_id
+      and urac.tenant_id = _tenant_id
+      and urac.resource_type = _resource_type
+      and md5(urac.resource_id::text) = md5(_resource_id::text)
+      and coalesce(urac.resource_path::text, '') = coalesce(_resource_path::text, '')
+      and urac.resource_id = _resource_id
+      and urac.expiration_date > now()
+    into __access_flags;
+
+    if found then
+        return __access_flags;
+    end if;
+
+    __access_flags := unsecure.calculate_user_resource_access_flags(
+        _user_id, _tenant_id, _resource_type, _resource_id, _resource_path,
+        unsecure.get_cached_group_ids(_user_id, _tenant_id));
+
+    select number_value
+    from const.sys_param sp
+    where sp.group_code = 'auth'
+      and sp.code = 'perm_cache_timeout_in_s'
+    into __perm_cache_timeout_in_s;
+
+    if __perm_cache_timeout_in_s is null then
+        __perm_cache_timeout_in_s := 300;
+    end if;
+
+    insert into auth.user_resource_access_cache (
+        created_by, updated_by, user_id, tenant_id, resource_type, root_type,
+        resource_id, resource_path, access_flags, expiration_date
+    ) values (
+        'cache', 'cache', _user_id, _tenant_id, _resource_type, split_part(_resource_type, '.', 1),
+        _resource_id, _resource_path, __access_flags, now() + interval '1 second' * __perm_cache_timeout_in_s
+    )
+    on conflict (user_id, tenant_id, resource_type, md5(resource_id::text), coalesce(resource_path::text, '')) do update
+    set access_flags = excluded.access_flags,
+        expiration_date = excluded.expiration_date,
+        updated_by = 'cache',
+        updated_at = now();
+
+    return __access_flags;
+end;
+$$;
+
 -- ============================================================================
 -- Core check: auth.has_resource_access
 -- ============================================================================
@@ -139,14 +273,15 @@ $$;
 -- Deny-overrides algorithm with hierarchy walk-up:
 -- 1. System user (id=1) → true
 -- 2. Tenant owner → true
--- 3. Get cached group IDs
--- 4. Walk up the type hierarchy (most specific first):
+-- 3. Effective flag cache enabled → answer from auth.user_resource_access_cache
+-- 4. Get cached group IDs
+-- 5. Walk up the type hierarchy (most specific first):
 --    a. User-level DENY     (resource_access)          → false
 --    b. User-level GRANT    (resource_access)          → true
 --    c. User role GRANT     (resource_role_assignment) → true
 --    d. Group-level GRANT   (resource_access)          → true
 --    e. Group role GRANT    (resource_role_assignment) → true
--- 5. No grant found → false (or throw error)
+-- 6. No grant found → false (or throw error)
 --
 -- resource_id is jsonb; matching uses containment (@>). resource_path (ltree,
 -- passed as text) enables path-addressed grants that cascade via <@ walks.
@@ -181,11 +316,26 @@ begin
         return true;
     end if;
 
-    __cached_group_ids := unsecure.get_cached_group_ids(_user_id, _tenant_id);
-    __root_type        := split_part(_resource_type, '.', 1);
     _resource_id      := coalesce(_resource_id, '{}'::jsonb);
     __resource_path_lt := ext.text2ltree(_resource_path);
 
+    -- Repeat checks on the same resource: one cache lookup, any flag
+    if internal.is_resource_access_cache_enabled() then
+        if _required_flag = any (unsecure.get_cached_resource_access_flags(
+                _user_id, _tenant_id, _resource_type, _resource_id, __resource_path_lt)) then
+            return true;
+        end if;
+
+        if _throw_err then
+            perform error.raise_35001(_user_id, _resource_type, _resource_id, _tenant_id);
+        end if;
+
+        return false;
+    end if;
+
+    __cached_group_ids := unsecure.get_cached_group_ids(_user_id, _tenant_id);
+    __root_type        := split_part(_resource_type, '.', 1);
+
     for __ancestor in
         select rt.code, rt.key_schema
         from const.resource_type rt
@@ -355,136 +505,85 @@ begin
       and rt.is_active = true
     into __ancestor_types;
 
+    -- Single pass per mode: each candidate is joined once against the user's and groups' rows in
+    -- auth.resource_access (grants and user denies, GIN / GiST probe) and once against their role
+    -- assignments. A candidate is returned when it has a grant and no user-level deny; duplicates
+    -- and input order are kept.
+
     -- ID-based filtering (composite-key rows only; path rows are excluded)
     if _resource_ids is not null then
         return query
-        select r.id
-        from unnest(_resource_ids) as r(id)
-        where not exists (
-            select 1 from auth.resource_access ra
+        with candidates as (
+            select r.id, r.ord
+            from unnest(_resource_ids) with ordinality as r(id, ord))
+           , matches as (
+            select c.ord, c.id, ra.is_deny
+            from candidates c
+                     inner join auth.resource_access ra
+                                on ra.resource_id @> c.id
             where ra.root_type = __root_type
               and ra.resource_type = any(__ancestor_types)
               and ra.tenant_id = _tenant_id
               and ra.resource_path is null
-              and ra.resource_id @> r.id
-              and ra.user_id = _user_id
               and ra.access_flag = _required_flag
-              and ra.is_deny = true
-        )
-        and (
-            exists (
-                select 1 from auth.resource_access ra
-                where ra.root_type = __root_type
-                  and ra.resource_type = any(__ancestor_types)
-                  and ra.tenant_id = _tenant_id
-                  and ra.resource_path is null
-                  and ra.resource_id @> r.id
-                  and ra.user_id = _user_id
-                  and ra.access_flag = _required_flag
-                  and ra.is_deny = false
-            )
-            or exists (
-                select 1 from auth.resource_role_assignment rra
-                inner join const.resource_role_flag rrf
-                    on rrf.resource_role_code = rra.role_code
-                where rra.root_type = __root_type
-                  and rra.resource_type = any(__ancestor_types)
-                  and rra.tenant_id = _tenant_id
-                  and rra.resource_path is null
-                  and rra.resource_id @> r.id
-                  and rra.user_id = _user_id
-                  and rrf.access_flag_code = _required_flag
-            )
-            or exists (
-                select 1 from auth.resource_access ra
-                where ra.root_type = __root_type
-                  and ra.resource_type = any(__ancestor_types)
-                  and ra.tenant_id = _tenant_id
-                  and ra.resource_path is null
-                  and ra.resource_id @> r.id
-                  and ra.user_group_id = any(__cached_group_ids)
-                  and ra.access_flag = _required_flag
-                  and ra.is_deny = false
-            )
-            or exists (
-                select 1 from auth.resource_role_assignment rra
-                inner join const.resource_role_flag rrf
-                    on rrf.resource_role_code = rra.role_code
-                where rra.root_type = __root_type
-                  and rra.resource_type = any(__ancestor_types)
-                  and rra.tenant_id = _tenant_id
-                  and rra.resource_path is null
-                  and rra.resource_id @> r.id
-                  and rra.user_group_id = any(__cached_group_ids)
-                  and rrf.access_flag_code = _required_flag
-            )
-        );
+              and (ra.user_id = _user_id
+                   or (ra.user_group_id = any(__cached_group_ids) and ra.is_deny = false))
+            union all
+            select c.ord, c.id, false
+            from candidates c
+                     inner join auth.resource_role_assignment rra
+                                on rra.resource_id @> c.id
+                     inner join const.resource_role_flag rrf
+                                on rrf.resource_role_code = rra.role_code
+            where rra.root_type = __root_type
+              and rra.resource_type = any(__ancestor_types)
+              and rra.tenant_id = _tenant_id
+              and rra.resource_path is null
+              and (rra.user_id = _user_id or rra.user_group_id = any(__cached_group_ids))
+              and rrf.access_flag_code = _required_flag)
+        select m.id
+        from matches m
+        group by m.ord, m.id
+        having not bool_or(m.is_deny)
+        order by m.ord;
     end if;
 
     -- Path-based filtering (ancestor-walk via <@)
     if __resource_paths_lt is not null then
         return query
-        select jsonb_build_object('path', p.path::text)
-        from unnest(__resource_paths_lt) as p(path)
-        where not exists (
-            select 1 from auth.resource_access ra
+        with candidates as (
+            select p.path, p.ord
+            from unnest(__resource_paths_lt) with ordinality as p(path, ord))
+           , matches as (
+            select c.ord, c.path, ra.is_deny
+            from candidates c
+                     inner join auth.resource_access ra
+                                on c.path <@ ra.resource_path
             where ra.root_type = __root_type
               and ra.resource_type = any(__ancestor_types)
               and ra.tenant_id = _tenant_id
               and ra.resource_path is not null
-              and p.path <@ ra.resource_path
-              and ra.user_id = _user_id
               and ra.access_flag = _required_flag
-              and ra.is_deny = true
-        )
-        and (
-            exists (
-                select 1 from auth.resource_access ra
-                where ra.root_type = __root_type
-                  and ra.resource_type = any(__ancestor_types)
-                  and ra.tenant_id = _tenant_id
-                  and ra.resource_path is not null
-                  and p.path <@ ra.resource_path
-                  and ra.user_id = _user_id
-                  and ra.access_flag = _required_flag
-                  and ra.is_deny = false
-            )
-            or exists (
-                select 1 from auth.resource_role_assignment rra
-                inner join const.resource_role_flag rrf
-                    on rrf.resource_role_code = rra.role_code
-                where rra.root_type = __root_type
-                  and rra.resource_type = any(__ancestor_types)
-                  and rra.tenant_id = _tenant_id
-                  and rra.resource_path is not null
-                  and p.path <@ rra.resource_path
-                  and rra.user_id = _user_id
-                  and rrf.access_flag_code = _required_flag
-            )
-            or exists (
-                select 1 from auth.resource_access ra
-                where ra.root_type = __root_type
-                  and ra.resource_type = any(__ancestor_types)
-                  and ra.tenant_id = _tenant_id
-                  and ra.resource_path is not null
-                  and p.path <@ ra.resource_path
-                  and ra.user_group_id = any(__cached_group_ids)
-                  and ra.access_flag = _required_flag
-                  and ra.is_deny = false
-            )
-            or exists (
-                select 1 from auth.resource_role_assignment rra
-                inner join const.resource_role_flag rrf
-                    on rrf.resource_role_code = rra.role_code
-                where rra.root_type = __root_type
-                  and rra.resource_type = any(__ancestor_types)
-                  and rra.tenant_id = _tenant_id
-                  and rra.resource_path is not null
-                  and p.path <@ rra.resource_path
-                  and rra.user_group_id = any(__cached_group_ids)
-                  and rrf.access_flag_code = _required_flag
-            )
-        );
+              and (ra.user_id = _user_id
+                   or (ra.user_group_id = any(__cached_group_ids) and ra.is_deny = false))
+            union all
+            select c.ord, c.path, false
+            from candidates c
+                     inner join auth.resource_role_assignment rra
+                                on c.path <@ rra.resource_path
+                     inner join const.resource_role_flag rrf
+                                on rrf.resource_role_code = rra.role_code
+            where rra.root_type = __root_type
+              and rra.resource_type = any(__ancestor_types)
+              and rra.tenant_id = _tenant_id
+              and rra.resource_path is not null
+              and (rra.user_id = _user_id or rra.user_group_id = any(__cached_group_ids))
+              and rrf.access_flag_code = _required_flag)
+        select jsonb_build_object('path', m.path::text)
+        from matches m
+        group by m.ord, m.path
+        having not bool_or(m.is_deny)
+        order by m.ord;
     end if;
 end;
 $$;
@@ -1455,6 +1554,273 @@ begin
 end;
 $$;
 
+-- ============================================================================
+-- Query: auth.get_user_accessible_resources_page
+-- ============================================================================
+--
+-- Keyset-paginated variant of get_user_accessible_resources for users with
+-- many grants. Rows are ordered by (resource_type, resource_id, resource_path)
+-- and one row is returned per resource and type. Pass the last row's
+-- __resource_type / __resource_id / __resource_path as the _after_* cursor to
+-- get the next page (all null = first page).
+--
+-- Each source (direct, user role, group, group role) is read in key order
+-- from its keyset index after the cursor and stops after _page_size distinct
+-- resources, so a deep page costs the same as the first one. Flags and source
+-- are then resolved for the page's resources only, with the same precedence
+-- and deny handling as get_user_accessible_resources.
+-- _access_flag = null returns resources with any flag.
+--
+create or replace function auth.get_user_accessible_resources_page(
+    _user_id             bigint,
+    _correlation_id      text,
+    _target_user_id      bigint,
+    _resource_type       text,
+    _access_flag         text    default 'read',
+    _tenant_id           integer default 1,
+    _page_size           integer default 100,
+    _after_resource_type text    default null,
+    _after_resource_id   jsonb   default null,
+    _after_resource_path text    default null
+) returns table(
+    __resource_type text,
+    __resource_id   jsonb,
+    __resource_path text,
+    __access_flags  text[],
+    __source        text
+)
+    language plpgsql
+as
+$$
+declare
+    __cached_group_ids integer[];
+    __root_type        text;
+    __ancestor_types   text[];
+    __after_type       text;
+    __after_id         jsonb;
+    __after_path       text;
+begin
+    if _user_id <> _target_user_id then
+        perform auth.has_permission(_user_id, _correlation_id, 'resources.get_grants', _tenant_id);
+    end if;
+
+    _page_size := greatest(1, least(coalesce(_page_size, 100), 1000));
+
+    __cached_group_ids := unsecure.get_cached_group_ids(_target_user_id, _tenant_id);
+    __root_type        := split_part(_resource_type, '.', 1);
+
+    select array_agg(rt.code)
+    from const.resource_type rt
+    where rt.path @> (select path from const.resource_type where code = _resource_type)
+      and rt.is_active = true
+    into __ancestor_types;
+
+    -- First page: '' sorts before every resource type code, so the cursor comparison stays a plain index condition
+    __after_type := coalesce(_after_resource_type, '');
+    __after_id   := coalesce(_after_resource_id, '{}'::jsonb);
+    __after_path := coalesce(_after_resource_path, '');
+
+    return query
+    with page_keys as (
+        select k.resource_type, k.resource_id, k.resource_path_key
+        from (
+                 (select distinct ra.resource_type, ra.resource_id, coalesce(ra.resource_path::text, '') as resource_path_key
+                  from auth.resource_access ra
+                  where ra.root_type = __root_type
+                    and ra.tenant_id = _tenant_id
+                    and ra.user_id = _target_user_id
+                    and (ra.resource_type, ra.resource_id, coalesce(ra.resource_path::text, ''))
+                        > (__after_type, __after_id, __after_path)
+                    and ra.resource_type = any(__ancestor_types)
+                    and ra.is_deny = false
+                    and (_access_flag is null or ra.access_flag = _access_flag)
+                    and not exists (
+                        select 1 from auth.resource_access df
+                        where df.root_type = __root_type
+                          and df.resource_type = any(__ancestor_types)
+                          and df.tenant_id = _tenant_id
+                          and df.user_id = _target_user_id
+                          and df.is_deny = true
+                          and df.resource_id = ra.resource_id
+                          and df.resource_path is not distinct from ra.resource_path
+                          and df.access_flag = ra.access_flag
+                    )
+                  order by 1, 2, 3
+                  limit _page_size)
+                 union
+                 (select distinct rra.resource_type, rra.resource_id, coalesce(rra.resource_path::text, '')
+                  from auth.resource_role_assignment rra
+                  inner join const.resource_role_flag rrf
+                      on rrf.resource_role_code = rra.role_code
+                  where rra.root_type = __root_type
+                    and rra.tenant_id = _tenant_id
+                    and rra.user_id = _target_user_id
+                    and (rra.resource_type, rra.resource_id, coalesce(rra.resource_path::text, ''))
+                        > (__after_type, __after_id, __after_path)
+                    and rra.resource_type = any(__ancestor_types)
+                    and (_access_flag is null or rrf.access_flag_code = _access_flag)
+                    and not exists (
+                        select 1 from auth.resource_access df
+                        where df.root_type = __root_type
+                          and df.resource_type = any(__ancestor_types)
+                          and df.tenant_id = _tenant_id
+                          and df.user_id = _target_user_id
+                          and df.is_deny = true
+                          and df.resource_id = rra.resource_id
+                          and df.resource_path is not distinct from rra.resource_path
+                          and df.access_flag = rrf.access_flag_code
+                    )
+                  order by 1, 2, 3
+                  limit _page_size)
+                 union
+                 -- One ordered scan per group: an ordered scan cannot merge several group ids
+                 (select gk.resource_type, gk.resource_id, gk.resource_path_key
+                  from unnest(__cached_group_ids) as g(user_group_id)
+                  cross join lateral (
+                      select distinct ra.resource_type, ra.resource_id, coalesce(ra.resource_path::text, '') as resource_path_key
+                      from auth.resource_access ra
+                      where ra.root_type = __root_type
+                        and ra.tenant_id = _tenant_id
+                        and ra.user_group_id = g.user_group_id
+                        and (ra.resource_type, ra.resource_id, coalesce(ra.resource_path::text, ''))
+                            > (__after_type, __after_id, __after_path)
+                        and ra.resource_type = any(__ancestor_types)
+                        and ra.is_deny = false
+                        and (_access_flag is null or ra.access_flag = _access_flag)
+                        and not exists (
+                            select 1 from auth.resource_access df
+                            where df.root_type = __root_type
+                              and df.resource_type = any(__ancestor_types)
+                              and df.tenant_id = _tenant_id
+                              and df.user_id = _target_user_id
+                              and df.is_deny = true
+                              and df.resource_id = ra.resource_id
+                              and df.resource_path is not distinct from ra.resource_path
+                              and df.access_flag = ra.access_flag
+                        )
+                      order by 1, 2, 3
+                      limit _page_size) gk)
+                 union
+                 (select gk.resource_type, gk.resource_id, gk.resource_path_key
+                  from unnest(__cached_group_ids) as g(user_group_id)
+                  cross join lateral (
+                      select distinct rra.resource_type, rra.resource_id, coalesce(rra.resource_path::text, '') as resource_path_key
+                      from auth.resource_role_assignment rra
+                      inner join const.resource_role_flag rrf
+                          on rrf.resource_role_code = rra.role_code
+                      where rra.root_type = __root_type
+                        and rra.tenant_id = _tenant_id
+                        and rra.user_group_id = g.user_group_id
+                        and (rra.resource_type, rra.resource_id, coalesce(rra.resource_path::text, ''))
+                            > (__after_type, __after_id, __after_path)
+                        and rra.resource_type = any(__ancestor_types)
+                        and (_access_flag is null or rrf.access_flag_code = _access_flag)
+                        and not exists (
+                            select 1 from auth.resource_access df
+                            where df.root_type = __root_type
+                              and df.resource_type = any(__ancestor_types)
+                              and df.tenant_id = _tenant_id
+                              and df.user_id = _target_user_id
+                              and df.is_deny = true
+                              and df.resource_id = rra.resource_id
+                              and df.resource_path is not distinct from rra.resource_path
+                              and df.access_flag = rrf.access_flag_code
+                        )
+                      order by 1, 2, 3
+                      limit _page_size) gk)
+             ) k
+        order by k.resource_type, k.resource_id, k.resource_path_key
+        limit _page_size
+    ),
+    -- Not-denied flags of the page's resources, per source (1 = direct, 2 = user role, 3 = group, 4 = group role)
+    page_flags as (
+        select 1 as precedence, pk.resource_type, pk.resource_id, pk.resource_path_key,
+               ra.access_flag, null::text as source_part, ra.resource_path
+        from page_keys pk
+        inner join auth.resource_access ra
+            on ra.resource_type = pk.resource_type
+            and ra.resource_id = pk.resource_id
+            and coalesce(ra.resource_path::text, '') = pk.resource_path_key
+        where ra.root_type = __root_type
+          and ra.tenant_id = _tenant_id
+          and ra.user_id = _target_user_id
+          and ra.is_deny = false
+        union all
+        select 2, pk.resource_type, pk.resource_id, pk.resource_path_key,
+               rrf.access_flag_code, rra.role_code, rra.resource_path
+        from page_keys pk
+        inner join auth.resource_role_assignment rra
+            on rra.resource_type = pk.resource_type
+            and rra.resource_id = pk.resource_id
+            and coalesce(rra.resource_path::text, '') = pk.resource_path_key
+        inner join const.resource_role_flag rrf
+            on rrf.resource_role_code = rra.role_code
+        where rra.root_type = __root_type
+          and rra.tenant_id = _tenant_id
+          and rra.user_id = _target_user_id
+        union all
+        select 3, pk.resource_type, pk.resource_id, pk.resource_path_key,
+               ra.access_flag, ug.title, ra.resource_path
+        from page_keys pk
+        inner join auth.resource_access ra
+            on ra.resource_type = pk.resource_type
+            and ra.resource_id = pk.resource_id
+            and coalesce(ra.resource_path::text, '') = pk.resource_path_key
+        inner join auth.user_group ug on ug.user_group_id = ra.user_group_id
+        where ra.root_type = __root_type
+          and ra.tenant_id = _tenant_id
+          and ra.user_group_id = any(__cached_group_ids)
+          and ra.is_deny = false
+        union all
+        select 4, pk.resource_type, pk.resource_id, pk.resource_path_key,
+               rrf.access_flag_code, ug.title, rra.resource_path
+        from page_keys pk
+        inner join auth.resource_role_assignment rra
+            on rra.resource_type = pk.resource_type
+            and rra.resource_id = pk.resource_id
+            and coalesce(rra.resource_path::text, '') = pk.resource_path_key
+        inner join const.resource_role_flag rrf
+            on rrf.resource_role_code = rra.role_code
+        inner join auth.user_group ug on ug.user_group_id = rra.user_group_id
+        where rra.root_type = __root_type
+          and rra.tenant_id = _tenant_id
+          and rra.user_group_id = any(__cached_group_ids)
+    ),
+    page_sources as (
+        select pf.precedence, pf.resource_type, pf.resource_id, pf.resource_path_key,
+               array_agg(distinct pf.access_flag) as access_flags,
+               array_agg(distinct pf.source_part) filter ( where pf.source_part is not null ) as source_parts
+        from page_flags pf
+        where (_access_flag is null or pf.access_flag = _access_flag)
+          and not exists (
+              select 1 from auth.resource_access df
+              where df.root_type = __root_type
+                and df.resource_type = any(__ancestor_types)
+                and df.tenant_id = _tenant_id
+                and df.user_id = _target_user_id
+                and df.is_deny = true
+                and df.resource_id = pf.resource_id
+                and df.resource_path is not distinct from pf.resource_path
+                and df.access_flag = pf.access_flag
+          )
+        group by pf.precedence, pf.resource_type, pf.resource_id, pf.resource_path_key
+    )
+    select distinct on (ps.resource_type, ps.resource_id, ps.resource_path_key)
+           ps.resource_type,
+           ps.resource_id,
+           nullif(ps.resource_path_key, ''),
+           ps.access_flags,
+           case ps.precedence
+               when 1 then 'direct'
+               when 2 then 'role:' || array_to_string(ps.source_parts, ',')
+               when 3 then array_to_string(ps.source_parts, ', ')
+               else array_to_string(ps.source_parts, ', ') || ' (role)'
+           end
+    from page_sources ps
+    order by ps.resource_type, ps.resource_id, ps.resource_path_key, ps.precedence;
+end;
+$$;
+
 -- ============================================================================
 -- Resource type CRUD, access flag CRUD, and translations-aware functions
 -- ============================================================================
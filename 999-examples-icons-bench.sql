@@ -0,0 +1,359 @@
+/*
+ * Benchmark: path-based ACL checks against the icons ltree hierarchy
+ * ==================================================================
+ *
+ * Uses the demo.fs_item tree from 999-examples-icons.sql (loaded
+ * automatically when the demo schema is missing) and measures how
+ * auth.has_resource_access and auth.filter_accessible_resources
+ * (_resource_paths := ...) scale with
+ *
+ *   - grant depth  : nlevel() of the granted resource_path (1 .. 5)
+ *   - grant count  : 1 / 10 / 100 / 1000 path grants per principal
+ *   - target depth : nlevel() of the checked path
+ *   - principal    : direct user grants vs. grants via a group
+ *
+ * Every (depth, count) pair gets its own user; every depth gets one group
+ * (100 grants) with one member. Grants are inserted directly into
+ * auth.resource_access (the fixture is not what is being measured), the
+ * random choices are seeded, so re-runs on the same tree pick the same
+ * paths and workload.
+ *
+ * How to run (from the repository root, NOTICE output goes to stderr):
+ *   ./debee.ps1 -Operations execSql -SqlFile 999-examples-icons-bench.sql *> bench_output.txt
+ *   ./debee.sh --operations execSql --sql-file 999-examples-icons-bench.sql > bench_output.txt 2>&1
+ *
+ * All bench users, groups and grants (icons_bench_*) are removed at the end;
+ * the demo schema and the example's own grants are left untouched.
+ */
+
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+\set QUIET on
+\pset footer off
+
+-- ============================================================================
+-- 1. Fixture: icon tree + bench principals and grants
+-- ============================================================================
+
+select to_regclass('demo.fs_item') is null as icons_missing \gset
+\if :icons_missing
+    \i 999-examples-icons.sql
+\endif
+
+-- Clean slate (safe to re-run after an aborted run)
+delete from auth.resource_access
+where root_type = 'fsitem'
+  and (user_id in (select user_id from auth.user_info where code like 'icons_bench_%')
+       or user_group_id in (select user_group_id from auth.user_group where code like 'icons_bench_%'));
+delete from auth.user_group_member where user_group_id in
+    (select user_group_id from auth.user_group where code like 'icons_bench_%');
+delete from auth.user_group where code like 'icons_bench_%';
+delete from auth.user_info where code like 'icons_bench_%';
+
+create temp table bench_principal
+(
+    principal    text    not null primary key,
+    kind         text    not null,      -- 'user' or 'group'
+    grant_depth  integer not null,
+    grant_target integer not null,      -- requested number of grants
+    user_id      bigint  not null,      -- user the checks run as
+    user_group_id integer,
+    grant_count  integer not null default 0
+);
+
+select setseed(0.42);
+
+do $$
+declare
+    __depth         integer;
+    __count         integer;
+    __principal     text;
+    __user_id       bigint;
+    __user_group_id integer;
+begin
+    -- Direct user grants: one user per (depth, count)
+    foreach __depth in array array[1, 2, 3, 4, 5]
+    loop
+        foreach __count in array array[1, 10, 100, 1000]
+        loop
+            __principal := 'icons_bench_d' || __depth || '_g' || __count;
+
+            insert into auth.user_info (created_by, updated_by, display_name, code, username, original_username, email, can_login)
+            values ('bench', 'bench', __principal, __principal,
+                    __principal || '@example.com', __principal || '@example.com', __principal || '@example.com', true)
+            returning user_id into __user_id;
+
+            insert into bench_principal (principal, kind, grant_depth, grant_target, user_id)
+            values (__principal, 'user', __depth, __count, __user_id);
+
+            insert into auth.resource_access (created_by, updated_by, tenant_id, resource_type, root_type,
+                                              resource_path, user_id, access_flag)
+            select 'bench', 'bench', 1, 'fsitem', 'fsitem', fi.path, __user_id, 'read'
+            from (select path from demo.fs_item
+                  where ext.nlevel(path) = __depth
+                  order by random()
+                  limit __count) fi;
+        end loop;
+    end loop;
+
+    -- Group grants: one group per depth (100 grants) with a single member
+    foreach __depth in array array[1, 2, 3, 4, 5]
+    loop
+        __principal := 'icons_bench_grp_d' || __depth;
+
+        insert into auth.user_info (created_by, updated_by, display_name, code, username, original_username, email, can_login)
+        values ('bench', 'bench', __principal || '_member', __principal || '_member',
+                __principal || '@example.com', __principal || '@example.com', __principal || '@example.com', true)
+        returning user_id into __user_id;
+
+        insert into auth.user_group (created_by, updated_by, tenant_id, title, code, is_active, is_assignable)
+        values ('bench', 'bench', 1, __principal, __principal, true, true)
+        returning user_group_id into __user_group_id;
+
+        insert into auth.user_group_member (created_by, user_group_id, user_id, member_type_code)
+        values ('bench', __user_group_id, __user_id, 'manual');
+
+        insert into bench_principal (principal, kind, grant_depth, grant_target, user_id, user_group_id)
+        values (__principal, 'group', __depth, 100, __user_id, __user_group_id);
+
+        insert into auth.resource_access (created_by, updated_by, tenant_id, resource_type, root_type,
+                                          resource_path, user_group_id, access_flag)
+        select 'bench', 'bench', 1, 'fsitem', 'fsitem', fi.path, __user_group_id, 'read'
+        from (select path from demo.fs_item
+              where ext.nlevel(path) = __depth
+              order by random()
+              limit 100) fi;
+    end loop;
+end $$;
+
+update bench_principal bp
+set grant_count = (select count(*)
+                   from auth.resource_access ra
+                   where ra.root_type = 'fsitem'
+                     and (ra.user_id = bp.user_id or ra.user_group_id = bp.user_group_id));
+
+analyze auth.resource_access;
+
+-- Workload: up to 500 random paths per target depth, shared by all principals
+create temp table bench_path as
+select s.path, ext.nlevel(s.path) as depth
+from (select fi.path,
+             row_number() over (partition by ext.nlevel(fi.path) order by random()) as rn
+      from demo.fs_item fi) s
+where s.rn <= 500;
+
+select depth as target_depth, count(*) as paths
+from bench_path
+group by depth
+order by depth;
+
+select kind, grant_depth, grant_target, grant_count, principal
+from bench_principal
+order by kind desc, grant_depth, grant_target;
+
+-- ============================================================================
+-- 2. auth.has_resource_access — one call per (principal, path)
+-- ============================================================================
+
+create temp table bench_check
+(
+    principal    text    not null,
+    target_depth integer not null,
+    granted      boolean not null,
+    us           numeric not null
+);
+
+do $$
+declare
+    __principal record;
+    __path      record;
+    __granted   boolean;
+    __t0        timestamptz;
+begin
+    for __principal in
+        select * from bench_principal order by kind desc, grant_depth, grant_target
+    loop
+        -- Warm-up: group id cache, plan cache of the function body
+        perform auth.has_resource_access(__principal.user_id, null, 'fsitem',
+                                         _required_flag := 'read', _throw_err := false,
+                                         _resource_path := 'src');
+
+        for __path in select path, depth from bench_path
+        loop
+            __t0 := clock_timestamp();
+            __granted := auth.has_resource_access(
+                _user_id        := __principal.user_id,
+                _correlation_id := null,
+                _resource_type  := 'fsitem',
+                _required_flag  := 'read',
+                _throw_err      := false,
+                _resource_path  := __path.path::text
+            );
+            insert into bench_check (principal, target_depth, granted, us)
+            values (__principal.principal, __path.depth, __granted,
+                    extract(epoch from clock_timestamp() - __t0) * 1000000);
+        end loop;
+    end loop;
+end $$;
+
+\echo
+\echo '--- has_resource_access latency by grant depth and grant count (us per call) ---'
+select bp.kind,
+       bp.grant_depth,
+       bp.grant_count,
+       count(*)                                                                   as checks,
+       round(100.0 * count(*) filter (where bc.granted) / count(*), 1)            as granted_pct,
+       round(avg(bc.us), 1)                                                       as avg_us,
+       round(percentile_cont(0.5) within group (order by bc.us)::numeric, 1)      as p50_us,
+       round(percentile_cont(0.95) within group (order by bc.us)::numeric, 1)     as p95_us,
+       round(max(bc.us), 1)                                                       as max_us
+from bench_check bc
+    inner join bench_principal bp on bp.principal = bc.principal
+group by bp.kind, bp.grant_depth, bp.grant_count
+order by bp.kind desc, bp.grant_depth, bp.grant_count;
+
+\echo
+\echo '--- has_resource_access latency by target path depth (user principals) ---'
+select bc.target_depth,
+       count(*)                                                                   as checks,
+       round(100.0 * count(*) filter (where bc.granted) / count(*), 1)            as granted_pct,
+       round(avg(bc.us), 1)                                                       as avg_us,
+       round(percentile_cont(0.5) within group (order by bc.us)::numeric, 1)      as p50_us,
+       round(percentile_cont(0.95) within group (order by bc.us)::numeric, 1)     as p95_us
+from bench_check bc
+    inner join bench_principal bp on bp.principal = bc.principal and bp.kind = 'user'
+group by bc.target_depth
+order by bc.target_depth;
+
+\echo
+\echo '--- has_resource_access latency by grant count, granted vs. denied (user principals) ---'
+select bp.grant_target                                                            as grant_bucket,
+       bc.granted,
+       count(*)                                                                   as checks,
+       round(avg(bc.us), 1)                                                       as avg_us,
+       round(percentile_cont(0.95) within group (order by bc.us)::numeric, 1)     as p95_us
+from bench_check bc
+    inner join bench_principal bp on bp.principal = bc.principal and bp.kind = 'user'
+group by bp.grant_target, bc.granted
+order by bp.grant_target, bc.granted;
+
+-- ============================================================================
+-- 3. auth.filter_accessible_resources — all workload paths in one call
+-- ============================================================================
+
+create temp table bench_filter
+(
+    principal  text    not null,
+    paths      integer not null,
+    accessible integer not null,
+    run        integer not null,
+    ms         numeric not null
+);
+
+do $$
+declare
+    __principal  record;
+    __paths      text[];
+    __accessible integer;
+    __run        integer;
+    __t0         timestamptz;
+begin
+    select array_agg(path::text order by path) from bench_path into __paths;
+
+    for __principal in
+        select * from bench_principal order by kind desc, grant_depth, grant_target
+    loop
+        for __run in 1..3
+        loop
+            __t0 := clock_timestamp();
+            select count(*)
+            from auth.filter_accessible_resources(
+                _user_id        := __principal.user_id,
+                _correlation_id := null,
+                _resource_type  := 'fsitem',
+                _required_flag  := 'read',
+                _resource_paths := __paths
+            )
+            into __accessible;
+
+            insert into bench_filter (principal, paths, accessible, run, ms)
+            values (__principal.principal, cardinality(__paths), __accessible, __run,
+                    extract(epoch from clock_timestamp() - __t0) * 1000);
+        end loop;
+    end loop;
+end $$;
+
+\echo
+\echo '--- filter_accessible_resources (best of 3 runs) ---'
+select bp.kind,
+       bp.grant_depth,
+       bp.grant_count,
+       min(bf.paths)                                     as paths,
+       min(bf.accessible)                                as accessible,
+       round(min(bf.ms), 2)                              as best_ms,
+       round(min(bf.ms) * 1000 / min(bf.paths), 1)       as us_per_path
+from bench_filter bf
+    inner join bench_principal bp on bp.principal = bf.principal
+group by bp.kind, bp.grant_depth, bp.grant_count
+order by bp.kind desc, bp.grant_depth, bp.grant_count;
+
+-- ============================================================================
+-- 4. Plan check — is the ancestor walk served by ix_ra_resource_path?
+-- ============================================================================
+-- Same predicate shape as the user GRANT probe in has_resource_access, for the
+-- principal with the most grants on the deepest workload path.
+
+select bp.user_id as bench_user_id
+from bench_principal bp
+where bp.kind = 'user'
+order by bp.grant_count desc, bp.grant_depth desc
+limit 1 \gset
+
+select path::text as bench_path
+from bench_path
+order by depth desc, path
+limit 1 \gset
+
+\echo
+\echo '--- Plan of the ancestor-walk probe (user' :bench_user_id ', path' :bench_path ') ---'
+explain (analyze, buffers, costs off, timing off)
+select 1
+from auth.resource_access ra
+where ra.root_type = 'fsitem'
+  and ra.resource_type = 'fsitem'
+  and ra.tenant_id = 1
+  and (ra.resource_path is null or :'bench_path'::ext.ltree <@ ra.resource_path)
+  and ra.resource_id = '{}'::jsonb
+  and ra.user_id = :bench_user_id
+  and ra.access_flag = 'read'
+  and ra.is_deny = false
+limit 1;
+
+explain (analyze, buffers, costs off, timing off)
+select 1
+from auth.resource_access ra
+where ra.root_type = 'fsitem'
+  and ra.resource_path is not null
+  and :'bench_path'::ext.ltree <@ ra.resource_path
+  and ra.user_id = :bench_user_id
+  and ra.access_flag = 'read'
+  and ra.is_deny = false
+limit 1;
+
+-- ============================================================================
+-- 5. Cleanup
+-- ============================================================================
+
+delete from auth.resource_access
+where root_type = 'fsitem'
+  and (user_id in (select user_id from bench_principal)
+       or user_group_id in (select user_group_id from bench_principal where user_group_id is not null));
+delete from auth.user_group_member where user_group_id in
+    (select user_group_id from bench_principal where user_group_id is not null);
+delete from auth.user_group where code like 'icons_bench_%';
+delete from auth.user_info where code like 'icons_bench_%';
+
+drop table bench_filter;
+drop table bench_check;
+drop table bench_path;
+drop table bench_principal;
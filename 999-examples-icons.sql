@@ -8,9 +8,10 @@
  * checks and bulk filtering to exercise the ACL at realistic scale.
  *
  * How to run:
- *   1. Regenerate the insert data (if not already present):
- *      python gen_icons_inserts.py
- *   2. Execute this file:
+ *   1. Regenerate the COPY data (if not already present):
+ *      python gen_icons_inserts.py --copy
+ *   2. Execute this file from the repository root (psql \copy reads the
+ *      .tsv relative to the current directory):
  *      ./debee.ps1 -Operations execSql -SqlFile 999-examples-icons.sql
  *
  * Everything lives under the `demo` schema so you can drop it wholesale
@@ -51,16 +52,38 @@ create table demo.fs_item
     has_permissions boolean   not null default false
 );
 
+-- ============================================================================
+-- 2. Load the generated data
+-- ============================================================================
+-- COPY into an unlogged staging table (no WAL, no indexes), merge into
+-- demo.fs_item in a single statement (first occurrence of a path wins, as with
+-- the old `on conflict (path) do nothing` batches), then build the indexes
+-- once over the finished table instead of maintaining them row by row.
+
+create unlogged table demo.fs_item_stage
+(
+    stage_id     bigint generated always as identity,
+    path         ext.ltree not null,
+    display_path text      not null,
+    kind         text      not null,
+    name         text      not null
+);
+
+\copy demo.fs_item_stage (path, display_path, kind, name) from '999-examples-icons-data.tsv'
+
+insert into demo.fs_item (path, display_path, kind, name)
+select distinct on (s.path) s.path, s.display_path, s.kind, s.name
+from demo.fs_item_stage s
+order by s.path, s.stage_id;
+
+drop table demo.fs_item_stage;
+
 create unique index uq_fs_item_path      on demo.fs_item (path);
 create index        ix_fs_item_path_g    on demo.fs_item using gist (path);
 create index        ix_fs_item_kind      on demo.fs_item (kind);
 create index        ix_fs_item_has_perms on demo.fs_item (has_permissions) where has_permissions;
 
--- ============================================================================
--- 2. Load the generated data
--- ============================================================================
-
-\i 999-examples-icons-data.sql
+analyze demo.fs_item;
 
 do $$
 declare
@@ -0,0 +1,459 @@
+/*
+ * Benchmark: permission cache misses in unsecure.recalculate_user_permissions
+ * ===========================================================================
+ *
+ * Compares the set-based recalculation (one statement: CTEs plus
+ * insert ... on conflict and delete as data-modifying CTEs) with the previous
+ * implementation, which materialized every miss in a
+ * `create temporary table __temp_users_groups_permissions ... on commit drop`.
+ * The previous implementation is recreated below as
+ * pg_temp.recalculate_user_permissions_temp_table, unchanged except for its
+ * name, so both run against the same data in the same session.
+ *
+ * Reported per variant:
+ *   - miss latency : avg / p50 / p95 / max per call, cache expired before every call
+ *   - catalog churn: tuples inserted / deleted in pg_class, pg_attribute, pg_type
+ *                    and pg_depend during the run (pg_stat_xact_sys_tables)
+ *
+ * The fixture user belongs to 5 groups in tenant 1, each with one assignable
+ * perm set, and has one perm set and one permission subtree assigned directly.
+ *
+ * How to run (from the repository root, NOTICE output goes to stderr):
+ *   ./debee.ps1 -Operations execSql -SqlFile 999-perm-cache-bench.sql *> bench_output.txt
+ *   ./debee.sh --operations execSql --sql-file 999-perm-cache-bench.sql > bench_output.txt 2>&1
+ *
+ * The fixture (perm_cache_bench_*) is removed at the end.
+ */
+
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+\set QUIET on
+\pset footer off
+
+-- ============================================================================
+-- 1. Fixture: user with group and direct assignments
+-- ============================================================================
+
+-- Clean slate (safe to re-run after an aborted run)
+delete from auth.user_permission_cache where user_id in (select user_id from auth.user_info where code = 'perm_cache_bench_user');
+delete from auth.permission_assignment
+where user_id in (select user_id from auth.user_info where code = 'perm_cache_bench_user')
+   or user_group_id in (select user_group_id from auth.user_group where code like 'perm_cache_bench_%');
+delete from auth.user_group_member where user_group_id in
+    (select user_group_id from auth.user_group where code like 'perm_cache_bench_%');
+delete from auth.user_group where code like 'perm_cache_bench_%';
+delete from auth.user_info where code = 'perm_cache_bench_user';
+
+do $$
+declare
+    __user_id       bigint;
+    __user_group_id integer;
+    __perm_set_ids  integer[];
+    __i             integer;
+begin
+    insert into auth.user_info (created_by, updated_by, display_name, code, username, original_username, email, can_login)
+    values ('bench', 'bench', 'perm_cache_bench_user', 'perm_cache_bench_user',
+            'perm_cache_bench_user@example.com', 'perm_cache_bench_user@example.com', 'perm_cache_bench_user@example.com', true)
+    returning user_id into __user_id;
+
+    select array_agg(ps.perm_set_id order by ps.perm_set_id)
+    from (select perm_set_id
+          from auth.perm_set
+          where tenant_id = 1
+            and is_assignable
+          order by perm_set_id
+          limit 6) ps
+    into __perm_set_ids;
+
+    for __i in 1..5
+    loop
+        insert into auth.user_group (created_by, updated_by, tenant_id, title, code, is_active, is_assignable)
+        values ('bench', 'bench', 1, 'perm_cache_bench_g' || __i, 'perm_cache_bench_g' || __i, true, true)
+        returning user_group_id into __user_group_id;
+
+        insert into auth.user_group_member (created_by, user_group_id, user_id, member_type_code)
+        values ('bench', __user_group_id, __user_id, 'manual');
+
+        insert into auth.permission_assignment (created_by, tenant_id, user_group_id, perm_set_id)
+        select 'bench', 1, __user_group_id, __perm_set_ids[1 + (__i - 1) % cardinality(__perm_set_ids)]
+        where cardinality(__perm_set_ids) > 0;
+    end loop;
+
+    insert into auth.permission_assignment (created_by, tenant_id, user_id, perm_set_id)
+    select 'bench', 1, __user_id, __perm_set_ids[cardinality(__perm_set_ids)]
+    where cardinality(__perm_set_ids) > 0;
+
+    -- A whole subtree through one direct permission assignment
+    insert into auth.permission_assignment (created_by, tenant_id, user_id, permission_id)
+    select 'bench', 1, __user_id, p.permission_id
+    from auth.permission p
+    where p.is_assignable
+      and ext.nlevel(p.node_path) = 1
+    order by p.permission_id
+    limit 1;
+end $$;
+
+select user_id as bench_user_id
+from auth.user_info
+where code = 'perm_cache_bench_user' \gset
+
+set perm_cache_bench.iterations = 500;
+
+-- ============================================================================
+-- 2. Previous implementation (temporary table per miss), for comparison
+-- ============================================================================
+
+create function pg_temp.recalculate_user_permissions_temp_table(_created_by text, _target_user_id bigint, _tenant_id integer DEFAULT NULL::integer)
+    returns TABLE(__tenant_id integer, __tenant_uuid uuid, __groups text[], __permissions text[], __short_code_permissions text[])
+    language plpgsql
+as
+$$
+declare
+    __perm_cache_timeout_in_s bigint;
+    __expiration_date         timestamptz;
+    __is_active               boolean;
+    __is_locked               boolean;
+begin
+
+    -- Check if user is active and not locked
+    select is_active, is_locked
+    from auth.user_info
+    where user_id = _target_user_id
+    into __is_active, __is_locked;
+
+    if __is_active is null then
+        perform error.raise_33001(_target_user_id, null);
+    end if;
+
+    if not __is_active then
+        perform error.raise_33003(_target_user_id);
+    end if;
+
+    if __is_locked then
+        perform error.raise_33004(_target_user_id);
+    end if;
+
+    if _tenant_id is not null and exists(
+            select
+            from auth.user_permission_cache
+            where tenant_id = _tenant_id
+              and user_id = _target_user_id
+              and expiration_date > now())
+    then
+
+        -- The cache stores permission ids only; codes are resolved through the permission table
+        return query
+            select _tenant_id
+                 , upc.tenant_uuid
+                 , upc.groups
+                 , coalesce(array_agg(distinct p.full_code::text) filter ( where p.full_code is not null ), array []::text[])
+                 , coalesce(array_agg(distinct p.short_code) filter ( where p.short_code is not null ), array []::text[])
+            from auth.user_permission_cache upc
+                     left join auth.permission p on p.permission_id = any (upc.permission_ids)
+            where upc.tenant_id = _tenant_id
+              and upc.user_id = _target_user_id
+            group by upc.tenant_uuid, upc.groups;
+    else
+        select number_value
+        from const.sys_param sp
+        where sp.group_code = 'auth'
+          and sp.code = 'perm_cache_timeout_in_s'
+        into __perm_cache_timeout_in_s;
+
+        if
+            (__perm_cache_timeout_in_s is null)
+        then
+            __perm_cache_timeout_in_s := 300;
+        end if;
+
+        drop table if exists __temp_users_groups_permissions;
+        create temporary table __temp_users_groups_permissions
+        (
+            tenant_id                integer,
+            tenant_uuid              uuid,
+            group_codes              text[],
+            permission_codes         text[],
+            short_code_permission_codes text[],
+            permission_ids           integer[]
+        ) on commit drop;
+
+        with ugs as (
+            select ugm.tenant_id
+                 , t.uuid as tenant_uuid
+                 , user_group_id
+                 , group_code
+            from auth.user_group_members ugm
+                     inner join auth.tenant t on t.tenant_id = ugm.tenant_id
+            where ugm.user_id = _target_user_id)
+           , group_assignments as (
+            select distinct pa.tenant_id
+                          , ug.tenant_uuid
+                          , ep.permission_id
+                          , ep.permission_code as full_code
+                          , ep.permission_short_code as short_code
+            from ugs ug
+                     inner join auth.permission_assignment pa
+                                on ug.user_group_id = pa.user_group_id
+                     inner join auth.effective_permissions ep on pa.perm_set_id = ep.perm_set_id
+            where ep.perm_set_is_assignable = true
+              and ep.permission_is_assignable = true
+            union
+            select distinct pa.tenant_id
+                          , ug.tenant_uuid
+                          , sp.permission_id
+                          , sp.full_code
+                          , sp.short_code
+            from ugs ug
+                     inner join auth.permission_assignment pa
+                                on ug.user_group_id = pa.user_group_id
+                     inner join auth.permission p on pa.permission_id = p.permission_id
+                     inner join auth.permission sp
+                                on sp.node_path <@ p.node_path and sp.is_assignable = true)
+           , user_assignments as (
+            select distinct pa.tenant_id
+                          , t.uuid             as tenant_uuid
+                          , ep.permission_id
+                          , ep.permission_code as full_code
+                          , ep.permission_short_code as short_code
+            from auth.permission_assignment pa
+                     inner join auth.tenant t on pa.tenant_id = t.tenant_id
+                     inner join auth.effective_permissions ep
+                                on pa.perm_set_id = ep.perm_set_id
+            where pa.user_id = _target_user_id
+              and ep.perm_set_is_assignable = true
+              and ep.permission_is_assignable = true
+            union
+            select distinct pa.tenant_id
+                          , t.uuid as tenant_uuid
+                          , sp.permission_id
+                          , sp.full_code
+                          , sp.short_code
+            from auth.permission_assignment pa
+                     inner join auth.tenant t on pa.tenant_id = t.tenant_id
+                     inner join auth.permission p
+                                on pa.permission_id = p.permission_id
+                     inner join auth.permission sp
+                                on sp.node_path <@ p.node_path and sp.is_assignable = true
+            where pa.user_id = _target_user_id)
+           , user_permissions as (
+            select distinct ga.tenant_id
+                          , ga.tenant_uuid
+                          , ga.permission_id
+                          , ga.full_code
+                          , ga.short_code
+            from group_assignments ga
+            union
+            select ua.tenant_id
+                 , ua.tenant_uuid
+                 , ua.permission_id
+                 , ua.full_code
+                 , ua.short_code
+            from user_assignments ua
+            order by full_code)
+        insert
+        into __temp_users_groups_permissions(tenant_id, tenant_uuid, group_codes, permission_codes, short_code_permission_codes, permission_ids)
+        select data.tenant_id
+             , data.tenant_uuid
+             , coalesce(array_agg(distinct data.groups) filter ( where data.groups is not null ), array []::text[])
+             , coalesce(array_agg(distinct data.perms) filter ( where data.perms is not null ), array []::text[])
+             , coalesce(array_agg(distinct data.short_code_perms) filter ( where data.short_code_perms is not null ), array []::text[])
+             -- distinct sorts, so the ids are stored in ascending order
+             , coalesce(array_agg(distinct data.perm_id) filter ( where data.perm_id is not null ), array []::integer[])
+        from (
+                 select ug.tenant_id
+                      , ug.tenant_uuid
+                      , ug.group_code as groups
+                      , null          as perms
+                      , null          as short_code_perms
+                      , null::integer as perm_id
+                 from ugs ug
+                 union
+                 select up.tenant_id
+                      , up.tenant_uuid
+                      , null
+                      , up.full_code::text
+                      , up.short_code
+                      , up.permission_id
+                 from user_permissions up) data
+        group by data.tenant_id, data.tenant_uuid;
+
+        __expiration_date := now() + interval '1 second' * __perm_cache_timeout_in_s;
+
+        insert into auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids,
+                                                expiration_date)
+        select _created_by
+             , _target_user_id
+             , tugp.tenant_id
+             , tugp.tenant_uuid
+             , tugp.group_codes
+             , tugp.permission_ids
+             , __expiration_date
+        from __temp_users_groups_permissions tugp
+        on conflict (user_id, tenant_id )
+            do update
+            set updated_at              = now()
+              , updated_by              = _created_by
+              , groups                  = excluded.groups
+              , permission_ids          = excluded.permission_ids
+              , expiration_date         = __expiration_date
+              , last_requested_at       = now();
+
+        -- Tenants where the user no longer has any group or permission keep no cache row
+        delete
+        from auth.user_permission_cache upc
+        where upc.user_id = _target_user_id
+          and not exists(select
+                         from __temp_users_groups_permissions tugp
+                         where tugp.tenant_id = upc.tenant_id);
+
+        return query
+            select ugp.tenant_id
+                 , ugp.tenant_uuid
+                 , ugp.group_codes
+                 , ugp.permission_codes
+                 , ugp.short_code_permission_codes
+            from __temp_users_groups_permissions ugp
+            where _tenant_id is null
+               or ugp.tenant_id = _tenant_id
+            order by ugp.tenant_id;
+    end if;
+end;
+$$;
+
+-- ============================================================================
+-- 3. Both variants compute the same result
+-- ============================================================================
+
+\echo
+\echo '--- Result rows that differ between the variants (expected: none) ---'
+(select 'temp_table' as variant, *
+ from pg_temp.recalculate_user_permissions_temp_table('bench', :bench_user_id)
+ except
+ select 'temp_table', *
+ from unsecure.recalculate_user_permissions('bench', :bench_user_id))
+union all
+(select 'set_based', *
+ from unsecure.recalculate_user_permissions('bench', :bench_user_id)
+ except
+ select 'set_based', *
+ from pg_temp.recalculate_user_permissions_temp_table('bench', :bench_user_id));
+
+select t.__tenant_id                       as tenant_id,
+       cardinality(t.__groups)             as groups,
+       cardinality(t.__permissions)        as permissions,
+       cardinality(t.__short_code_permissions) as short_codes
+from unsecure.recalculate_user_permissions('bench', :bench_user_id) t;
+
+-- ============================================================================
+-- 4. Miss latency and catalog churn
+-- ============================================================================
+-- Every call runs with an expired cache row for tenant 1 (the has_permissions
+-- path). Each variant runs in its own transaction (one bench_run call), so the
+-- pg_stat_xact_sys_tables counters cover exactly that run. The drop of the
+-- last temporary table happens at commit and is not counted.
+
+create temp table bench_miss
+(
+    variant   text    not null,
+    iteration integer not null,
+    us        numeric not null
+);
+
+create temp table bench_churn
+(
+    variant  text   not null,
+    relname  name   not null,
+    inserted bigint not null,
+    deleted  bigint not null
+);
+
+create function pg_temp.bench_run(_variant text) returns void
+    language plpgsql
+as
+$$
+declare
+    __user_id    bigint  := (select user_id from auth.user_info where code = 'perm_cache_bench_user');
+    __iterations integer := current_setting('perm_cache_bench.iterations')::integer;
+    __i          integer;
+    __t0         timestamptz;
+    __before     jsonb;
+begin
+    select jsonb_object_agg(relname, jsonb_build_array(n_tup_ins, n_tup_del))
+    from pg_stat_xact_sys_tables
+    where relname in ('pg_class', 'pg_attribute', 'pg_type', 'pg_depend')
+    into __before;
+
+    for __i in 1..__iterations
+    loop
+        update auth.user_permission_cache
+        set expiration_date = now() - interval '1 second'
+        where user_id = __user_id;
+
+        __t0 := clock_timestamp();
+        if _variant = 'temp_table' then
+            perform pg_temp.recalculate_user_permissions_temp_table('bench', __user_id, 1);
+        else
+            perform unsecure.recalculate_user_permissions('bench', __user_id, 1);
+        end if;
+
+        insert into bench_miss (variant, iteration, us)
+        values (_variant, __i, extract(epoch from clock_timestamp() - __t0) * 1000000);
+    end loop;
+
+    insert into bench_churn (variant, relname, inserted, deleted)
+    select _variant
+         , s.relname
+         , s.n_tup_ins - coalesce((__before -> s.relname::text ->> 0)::bigint, 0)
+         , s.n_tup_del - coalesce((__before -> s.relname::text ->> 1)::bigint, 0)
+    from pg_stat_xact_sys_tables s
+    where s.relname in ('pg_class', 'pg_attribute', 'pg_type', 'pg_depend');
+end;
+$$;
+
+-- Warm-up (plan caches), not recorded
+select pg_temp.bench_run('temp_table');
+select pg_temp.bench_run('set_based');
+truncate bench_miss, bench_churn;
+
+select pg_temp.bench_run('temp_table');
+select pg_temp.bench_run('set_based');
+
+\echo
+\echo '--- Cache miss latency (us per recalculate_user_permissions call) ---'
+select variant,
+       count(*)                                                               as calls,
+       round(avg(us), 1)                                                      as avg_us,
+       round(percentile_cont(0.5) within group (order by us)::numeric, 1)     as p50_us,
+       round(percentile_cont(0.95) within group (order by us)::numeric, 1)    as p95_us,
+       round(max(us), 1)                                                      as max_us
+from bench_miss
+group by variant
+order by variant desc;
+
+\echo
+\echo '--- Catalog churn per run (tuples inserted / deleted) ---'
+select variant,
+       relname,
+       inserted,
+       deleted,
+       round((inserted + deleted)::numeric / current_setting('perm_cache_bench.iterations')::integer, 1) as per_call
+from bench_churn
+order by variant desc, relname;
+
+-- ============================================================================
+-- 5. Cleanup
+-- ============================================================================
+
+delete from auth.user_permission_cache where user_id = :bench_user_id;
+delete from auth.permission_assignment
+where user_id = :bench_user_id
+   or user_group_id in (select user_group_id from auth.user_group where code like 'perm_cache_bench_%');
+delete from auth.user_group_member where user_group_id in
+    (select user_group_id from auth.user_group where code like 'perm_cache_bench_%');
+delete from auth.user_group where code like 'perm_cache_bench_%';
+delete from auth.user_info where code = 'perm_cache_bench_user';
+
+drop function pg_temp.bench_run(text);
+drop function pg_temp.recalculate_user_permissions_temp_table(text, bigint, integer);
+drop table bench_churn;
+drop table bench_miss;
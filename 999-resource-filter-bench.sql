@@ -0,0 +1,396 @@
+/*
+ * Benchmark: auth.filter_accessible_resources over 10k candidate ids
+ * ==================================================================
+ *
+ * Compares the single-pass filter (candidates joined once against the user's
+ * and groups' grants, denies and role assignments) with the previous
+ * implementation, which ran five correlated exists probes per candidate id.
+ * The previous implementation is recreated below as
+ * pg_temp.filter_accessible_resources_per_id, unchanged except for its name,
+ * so both run against the same data in the same session.
+ *
+ * Fixture (resource type filter_bench, keys {"doc_id": n}, n = 1..10000):
+ *   - 2000 direct user grants, 2000 group grants
+ *   - 500 user denies on group-granted ids
+ *   - 500 user and 500 group role assignments (role filter_bench_viewer)
+ *   - 10000 grants for another user (noise in the same partition)
+ *
+ * Reported per variant: identical results check, then best / avg of
+ * filter_bench.iterations calls over all 10k ids.
+ *
+ * How to run (from the repository root, NOTICE output goes to stderr):
+ *   ./debee.ps1 -Operations execSql -SqlFile 999-resource-filter-bench.sql *> bench_output.txt
+ *   ./debee.sh --operations execSql --sql-file 999-resource-filter-bench.sql > bench_output.txt 2>&1
+ *
+ * The fixture (filter_bench*) is removed at the end.
+ */
+
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+\set QUIET on
+\pset footer off
+
+-- ============================================================================
+-- 1. Fixture: users, group, role and 10k-id grant set
+-- ============================================================================
+
+-- Clean slate (safe to re-run after an aborted run)
+delete from auth.resource_role_assignment where resource_type = 'filter_bench';
+delete from auth.resource_access where resource_type = 'filter_bench';
+delete from const.resource_role where code = 'filter_bench_viewer';
+delete from const.resource_type where code = 'filter_bench';
+delete from auth.user_group_id_cache where user_id in (select user_id from auth.user_info where code like 'filter_bench_%');
+delete from auth.user_group_member where user_group_id in
+    (select user_group_id from auth.user_group where code = 'filter_bench_group');
+delete from auth.user_group where code = 'filter_bench_group';
+delete from auth.user_info where code like 'filter_bench_%';
+
+insert into const.resource_type (code, source, path, key_schema)
+values ('filter_bench', 'bench', 'filter_bench', '{"doc_id": "bigint"}');
+
+insert into const.resource_role (code, resource_type, source)
+values ('filter_bench_viewer', 'filter_bench', 'bench');
+
+insert into const.resource_role_flag (resource_role_code, access_flag_code)
+values ('filter_bench_viewer', 'read');
+
+do $$
+declare
+    __user_id       bigint;
+    __other_id      bigint;
+    __user_group_id integer;
+begin
+    insert into auth.user_info (created_by, updated_by, display_name, code, username, original_username, email, can_login)
+    values ('bench', 'bench', 'filter_bench_user', 'filter_bench_user',
+            'filter_bench_user@example.com', 'filter_bench_user@example.com', 'filter_bench_user@example.com', true)
+    returning user_id into __user_id;
+
+    insert into auth.user_info (created_by, updated_by, display_name, code, username, original_username, email, can_login)
+    values ('bench', 'bench', 'filter_bench_other', 'filter_bench_other',
+            'filter_bench_other@example.com', 'filter_bench_other@example.com', 'filter_bench_other@example.com', true)
+    returning user_id into __other_id;
+
+    insert into auth.user_group (created_by, updated_by, tenant_id, title, code, is_active, is_assignable)
+    values ('bench', 'bench', 1, 'filter_bench_group', 'filter_bench_group', true, true)
+    returning user_group_id into __user_group_id;
+
+    insert into auth.user_group_member (created_by, user_group_id, user_id, member_type_code)
+    values ('bench', __user_group_id, __user_id, 'manual');
+
+    -- Direct user grants: n % 5 = 0
+    insert into auth.resource_access (created_by, updated_by, tenant_id, resource_type, root_type, resource_id, user_id, access_flag)
+    select 'bench', 'bench', 1, 'filter_bench', 'filter_bench', jsonb_build_object('doc_id', n), __user_id, 'read'
+    from generate_series(5, 10000, 5) n;
+
+    -- Group grants: n % 5 = 1
+    insert into auth.resource_access (created_by, updated_by, tenant_id, resource_type, root_type, resource_id, user_group_id, access_flag)
+    select 'bench', 'bench', 1, 'filter_bench', 'filter_bench', jsonb_build_object('doc_id', n), __user_group_id, 'read'
+    from generate_series(1, 10000, 5) n;
+
+    -- User denies overriding a quarter of the group grants: n % 20 = 1
+    insert into auth.resource_access (created_by, updated_by, tenant_id, resource_type, root_type, resource_id, user_id, access_flag, is_deny)
+    select 'bench', 'bench', 1, 'filter_bench', 'filter_bench', jsonb_build_object('doc_id', n), __user_id, 'read', true
+    from generate_series(1, 10000, 20) n;
+
+    -- Role assignments: user on n % 20 = 2, group on n % 20 = 3
+    insert into auth.resource_role_assignment (created_by, updated_by, tenant_id, resource_type, root_type, resource_id, user_id, role_code)
+    select 'bench', 'bench', 1, 'filter_bench', 'filter_bench', jsonb_build_object('doc_id', n), __user_id, 'filter_bench_viewer'
+    from generate_series(2, 10000, 20) n;
+
+    insert into auth.resource_role_assignment (created_by, updated_by, tenant_id, resource_type, root_type, resource_id, user_group_id, role_code)
+    select 'bench', 'bench', 1, 'filter_bench', 'filter_bench', jsonb_build_object('doc_id', n), __user_group_id, 'filter_bench_viewer'
+    from generate_series(3, 10000, 20) n;
+
+    -- Noise: another user with a grant on every id
+    insert into auth.resource_access (created_by, updated_by, tenant_id, resource_type, root_type, resource_id, user_id, access_flag)
+    select 'bench', 'bench', 1, 'filter_bench', 'filter_bench', jsonb_build_object('doc_id', n), __other_id, 'read'
+    from generate_series(1, 10000) n;
+end $$;
+
+analyze auth.resource_access;
+analyze auth.resource_role_assignment;
+
+select user_id as bench_user_id
+from auth.user_info
+where code = 'filter_bench_user' \gset
+
+create temp table bench_ids as
+select array_agg(jsonb_build_object('doc_id', n) order by n) as ids
+from generate_series(1, 10000) n;
+
+set filter_bench.iterations = 5;
+
+-- ============================================================================
+-- 2. Previous implementation (per-id exists probes), for comparison
+-- ============================================================================
+
+create function pg_temp.filter_accessible_resources_per_id(
+    _user_id         bigint,
+    _correlation_id  text,
+    _resource_type   text,
+    _resource_ids    jsonb[] default null,
+    _required_flag   text    default 'read',
+    _tenant_id       integer default 1,
+    _resource_paths  text[]  default null
+) returns table(__resource_id jsonb)
+    language plpgsql
+as
+$$
+declare
+    __cached_group_ids   integer[];
+    __root_type          text;
+    __ancestor_types     text[];
+    __resource_paths_lt  ext.ltree[];
+begin
+    if _resource_ids is null and _resource_paths is null then
+        return;
+    end if;
+
+    if _resource_paths is not null then
+        select array_agg(ext.text2ltree(p))
+        from unnest(_resource_paths) as p
+        into __resource_paths_lt;
+    end if;
+
+    if _user_id = 1 or auth.is_owner(_user_id, _correlation_id, null, _tenant_id) then
+        if _resource_ids is not null then
+            return query select unnest(_resource_ids);
+        end if;
+        if _resource_paths is not null then
+            return query select jsonb_build_object('path', p) from unnest(_resource_paths) as p;
+        end if;
+        return;
+    end if;
+
+    __cached_group_ids := unsecure.get_cached_group_ids(_user_id, _tenant_id);
+    __root_type        := split_part(_resource_type, '.', 1);
+
+    select array_agg(rt.code)
+    from const.resource_type rt
+    where rt.path @> (select path from const.resource_type where code = _resource_type)
+      and rt.is_active = true
+    into __ancestor_types;
+
+    -- ID-based filtering (composite-key rows only; path rows are excluded)
+    if _resource_ids is not null then
+        return query
+        select r.id
+        from unnest(_resource_ids) as r(id)
+        where not exists (
+            select 1 from auth.resource_access ra
+            where ra.root_type = __root_type
+              and ra.resource_type = any(__ancestor_types)
+              and ra.tenant_id = _tenant_id
+              and ra.resource_path is null
+              and ra.resource_id @> r.id
+              and ra.user_id = _user_id
+              and ra.access_flag = _required_flag
+              and ra.is_deny = true
+        )
+        and (
+            exists (
+                select 1 from auth.resource_access ra
+                where ra.root_type = __root_type
+                  and ra.resource_type = any(__ancestor_types)
+                  and ra.tenant_id = _tenant_id
+                  and ra.resource_path is null
+                  and ra.resource_id @> r.id
+                  and ra.user_id = _user_id
+                  and ra.access_flag = _required_flag
+                  and ra.is_deny = false
+            )
+            or exists (
+                select 1 from auth.resource_role_assignment rra
+                inner join const.resource_role_flag rrf
+                    on rrf.resource_role_code = rra.role_code
+                where rra.root_type = __root_type
+                  and rra.resource_type = any(__ancestor_types)
+                  and rra.tenant_id = _tenant_id
+                  and rra.resource_path is null
+                  and rra.resource_id @> r.id
+                  and rra.user_id = _user_id
+                  and rrf.access_flag_code = _required_flag
+            )
+            or exists (
+                select 1 from auth.resource_access ra
+                where ra.root_type = __root_type
+                  and ra.resource_type = any(__ancestor_types)
+                  and ra.tenant_id = _tenant_id
+                  and ra.resource_path is null
+                  and ra.resource_id @> r.id
+                  and ra.user_group_id = any(__cached_group_ids)
+                  and ra.access_flag = _required_flag
+                  and ra.is_deny = false
+            )
+            or exists (
+                select 1 from auth.resource_role_assignment rra
+                inner join const.resource_role_flag rrf
+                    on rrf.resource_role_code = rra.role_code
+                where rra.root_type = __root_type
+                  and rra.resource_type = any(__ancestor_types)
+                  and rra.tenant_id = _tenant_id
+                  and rra.resource_path is null
+                  and rra.resource_id @> r.id
+                  and rra.user_group_id = any(__cached_group_ids)
+                  and rrf.access_flag_code = _required_flag
+            )
+        );
+    end if;
+
+    -- Path-based filtering (ancestor-walk via <@)
+    if __resource_paths_lt is not null then
+        return query
+        select jsonb_build_object('path', p.path::text)
+        from unnest(__resource_paths_lt) as p(path)
+        where not exists (
+            select 1 from auth.resource_access ra
+            where ra.root_type = __root_type
+              and ra.resource_type = any(__ancestor_types)
+              and ra.tenant_id = _tenant_id
+              and ra.resource_path is not null
+              and p.path <@ ra.resource_path
+              and ra.user_id = _user_id
+              and ra.access_flag = _required_flag
+              and ra.is_deny = true
+        )
+        and (
+            exists (
+                select 1 from auth.resource_access ra
+                where ra.root_type = __root_type
+                  and ra.resource_type = any(__ancestor_types)
+                  and ra.tenant_id = _tenant_id
+                  and ra.resource_path is not null
+                  and p.path <@ ra.resource_path
+                  and ra.user_id = _user_id
+                  and ra.access_flag = _required_flag
+                  and ra.is_deny = false
+            )
+            or exists (
+                select 1 from auth.resource_role_assignment rra
+                inner join const.resource_role_flag rrf
+                    on rrf.resource_role_code = rra.role_code
+                where rra.root_type = __root_type
+                  and rra.resource_type = any(__ancestor_types)
+                  and rra.tenant_id = _tenant_id
+                  and rra.resource_path is not null
+                  and p.path <@ rra.resource_path
+                  and rra.user_id = _user_id
+                  and rrf.access_flag_code = _required_flag
+            )
+            or exists (
+                select 1 from auth.resource_access ra
+                where ra.root_type = __root_type
+                  and ra.resource_type = any(__ancestor_types)
+                  and ra.tenant_id = _tenant_id
+                  and ra.resource_path is not null
+                  and p.path <@ ra.resource_path
+                  and ra.user_group_id = any(__cached_group_ids)
+                  and ra.access_flag = _required_flag
+                  and ra.is_deny = false
+            )
+            or exists (
+                select 1 from auth.resource_role_assignment rra
+                inner join const.resource_role_flag rrf
+                    on rrf.resource_role_code = rra.role_code
+                where rra.root_type = __root_type
+                  and rra.resource_type = any(__ancestor_types)
+                  and rra.tenant_id = _tenant_id
+                  and rra.resource_path is not null
+                  and p.path <@ rra.resource_path
+                  and rra.user_group_id = any(__cached_group_ids)
+                  and rrf.access_flag_code = _required_flag
+            )
+        );
+    end if;
+end;
+$$;
+
+-- ============================================================================
+-- 3. Both variants return the same ids in the same order
+-- ============================================================================
+
+\echo
+\echo '--- Identical results (expected: t, 4500 accessible of 10000) ---'
+select (select array_agg(f.__resource_id)
+        from pg_temp.filter_accessible_resources_per_id(:bench_user_id, 'bench', 'filter_bench', b.ids, 'read') f)
+       is not distinct from
+       (select array_agg(f.__resource_id)
+        from auth.filter_accessible_resources(:bench_user_id, 'bench', 'filter_bench', b.ids, 'read') f) as identical,
+       (select count(*)
+        from auth.filter_accessible_resources(:bench_user_id, 'bench', 'filter_bench', b.ids, 'read')) as accessible
+from bench_ids b;
+
+-- ============================================================================
+-- 4. Latency over 10k ids
+-- ============================================================================
+
+create temp table bench_filter
+(
+    variant   text    not null,
+    iteration integer not null,
+    ms        numeric not null
+);
+
+create function pg_temp.bench_run(_variant text) returns void
+    language plpgsql
+as
+$$
+declare
+    __user_id    bigint  := (select user_id from auth.user_info where code = 'filter_bench_user');
+    __iterations integer := current_setting('filter_bench.iterations')::integer;
+    __ids        jsonb[] := (select ids from bench_ids);
+    __i          integer;
+    __t0         timestamptz;
+begin
+    for __i in 1..__iterations
+    loop
+        __t0 := clock_timestamp();
+        if _variant = 'per_id' then
+            perform count(*) from pg_temp.filter_accessible_resources_per_id(__user_id, 'bench', 'filter_bench', __ids, 'read');
+        else
+            perform count(*) from auth.filter_accessible_resources(__user_id, 'bench', 'filter_bench', __ids, 'read');
+        end if;
+
+        insert into bench_filter (variant, iteration, ms)
+        values (_variant, __i, extract(epoch from clock_timestamp() - __t0) * 1000);
+    end loop;
+end;
+$$;
+
+-- Warm-up (plan caches, group id cache), not recorded
+select pg_temp.bench_run('per_id');
+select pg_temp.bench_run('single_pass');
+truncate bench_filter;
+
+select pg_temp.bench_run('per_id');
+select pg_temp.bench_run('single_pass');
+
+\echo
+\echo '--- filter_accessible_resources over 10000 ids (ms per call) ---'
+select variant,
+       count(*)           as calls,
+       round(min(ms), 1)  as best_ms,
+       round(avg(ms), 1)  as avg_ms,
+       round(max(ms), 1)  as max_ms
+from bench_filter
+group by variant
+order by variant;
+
+-- ============================================================================
+-- 5. Cleanup
+-- ============================================================================
+
+delete from auth.resource_role_assignment where resource_type = 'filter_bench';
+delete from auth.resource_access where resource_type = 'filter_bench';
+delete from const.resource_role where code = 'filter_bench_viewer';
+delete from const.resource_type where code = 'filter_bench';
+delete from auth.user_group_id_cache where user_id in (select user_id from auth.user_info where code like 'filter_bench_%');
+delete from auth.user_group_member where user_group_id in
+    (select user_group_id from auth.user_group where code = 'filter_bench_group');
+delete from auth.user_group where code = 'filter_bench_group';
+delete from auth.user_info where code like 'filter_bench_%';
+
+drop function pg_temp.bench_run(text);
+drop function pg_temp.filter_accessible_resources_per_id(bigint, text, text, jsonb[], text, integer, text[]);
+drop table bench_filter;
+drop table bench_ids;
@@ -117,7 +117,7 @@ OPERATIONS  (comma-separated; default: fullService)
   preUpdateScripts     Run the semicolon-separated SQL files in DBPREUPDATESCRIPTS (before update).
   postUpdateScripts    Run the semicolon-separated SQL files in DBPOSTUPDATESCRIPTS (after update).
   prepareVersionTable  Extract DB objects via extract-db-objects.py and emit documentation in the
-                       formats from DBVERSIONTABLEFORMATS (json;md;csv;html) to DBVERSIONTABLEOUTPUTFOLDER.
+                       formats from DBVERSIONTABLEFORMATS (json;md;csv;html;sqlite) to DBVERSIONTABLEOUTPUTFOLDER.
   execSql              Run ad-hoc SQL: inline via --sql / -Sql, or a file via --sql-file / -SqlFile.
                        With neither, opens an interactive psql session against the target DB.
   runTests             Run SQL test files / suites from the tests/ folder. Global ordering from
@@ -176,7 +176,7 @@ ENVIRONMENT VARIABLES
     DBPREUPDATESCRIPTS    Semicolon-separated SQL files for preUpdateScripts
     DBPOSTUPDATESCRIPTS   Semicolon-separated SQL files for postUpdateScripts
   Version table:
-    DBVERSIONTABLEFORMATS       Semicolon list: json;md;csv;html (default json;md)
+    DBVERSIONTABLEFORMATS       Semicolon list: json;md;csv;html;sqlite (default json;md)
     DBVERSIONTABLEOUTPUTFOLDER  Output directory (default .)
     DBVERSIONTABLEFILENAME      Base output filename (default db-objects)
   Tooling / safety:
@@ -573,10 +573,10 @@ function Prepare-VersionTable {
 	}
 
 	# Validate formats
-	$validFormats = @("json", "md", "markdown", "csv", "html")
+	$validFormats = @("json", "md", "markdown", "csv", "html", "sqlite")
 	$invalidFormats = $formats | Where-Object { $_ -notin $validFormats }
 	if ($invalidFormats) {
-		Write-Error "Invalid formats: $($invalidFormats -join ', '). Valid formats: json, md, csv, html"
+		Write-Error "Invalid formats: $($invalidFormats -join ', '). Valid formats: json, md, csv, html, sqlite"
 		return
 	}
 
@@ -612,19 +612,22 @@ function Prepare-VersionTable {
 	$generatedFiles = @()
 
 	try {
-		# Generate each requested format
+		# Generate all requested formats from a single parse
+		$outputBase = Join-Path $outputFolder $baseFilename
+		$formatsCsv = $formats -join ','
+
+		Write-Info "Generating $($formatsCsv.ToUpper()) format(s): $outputBase.*"
+
+		$result = & $pythonCmd "extract-db-objects.py" --format $formatsCsv --output $outputBase 2>&1
+		if ($LASTEXITCODE -ne 0) {
+			Write-Error "Failed to generate $formatsCsv`: $result"
+			return
+		}
+
 		foreach ($fmt in $formats) {
 			# Determine extension
 			$extension = if ($fmt -eq "markdown") { "md" } else { $fmt }
-			$outputFile = Join-Path $outputFolder "$baseFilename.$extension"
-
-			Write-Info "Generating $($fmt.ToUpper()) format: $outputFile"
-
-			$result = & $pythonCmd "extract-db-objects.py" --format $fmt --output $outputFile 2>&1
-			if ($LASTEXITCODE -ne 0) {
-				Write-Error "Failed to generate $fmt`: $result"
-				return
-			}
+			$outputFile = "$outputBase.$extension"
 
 			if (Test-Path $outputFile) {
 				Write-Host "Successfully generated $outputFile" -ForegroundColor Green
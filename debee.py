@@ -413,10 +413,10 @@ class DebeeOrchestrator:
             formats = ["json", "md"]
 
         # Validate formats
-        valid_formats = {"json", "md", "markdown", "csv", "html"}
+        valid_formats = {"json", "md", "markdown", "csv", "html", "sqlite"}
         invalid_formats = [fmt for fmt in formats if fmt not in valid_formats]
         if invalid_formats:
-            self.print_error(f"Invalid formats: {', '.join(invalid_formats)}. Valid formats: json, md, csv, html")
+            self.print_error(f"Invalid formats: {', '.join(invalid_formats)}. Valid formats: json, md, csv, html, sqlite")
             return False
 
         # Normalize markdown format
@@ -461,30 +461,25 @@ class DebeeOrchestrator:
         generated_files = []
 
         try:
-            # Generate each requested format
-            for fmt in formats:
-                # Determine extension
-                if fmt == "markdown":
-                    extension = "md"
-                else:
-                    extension = fmt
-
-                output_file = output_path / f"{base_filename}.{extension}"
+            # Generate all requested formats from a single parse
+            output_base = output_path / base_filename
+            output_files = [output_path / f"{base_filename}.{'md' if fmt == 'markdown' else fmt}" for fmt in formats]
 
-                self.print_info(f"Generating {fmt.upper()} format: {output_file}")
+            self.print_info(f"Generating {', '.join(fmt.upper() for fmt in formats)} format(s): {output_base}.*")
 
-                result = subprocess.run(
-                    [python_cmd, str(extract_script), "--format", fmt, "--output", str(output_file)],
-                    capture_output=True,
-                    text=True,
-                    cwd=Path.cwd(),
-                    env=os.environ
-                )
+            result = subprocess.run(
+                [python_cmd, str(extract_script), "--format", ",".join(formats), "--output", str(output_base)],
+                capture_output=True,
+                text=True,
+                cwd=Path.cwd(),
+                env=os.environ
+            )
 
-                if result.returncode != 0:
-                    self.print_error(f"Failed to generate {fmt}: {result.stderr}")
-                    return False
+            if result.returncode != 0:
+                self.print_error(f"Failed to generate {', '.join(formats)}: {result.stderr}")
+                return False
 
+            for output_file in output_files:
                 if output_file.exists():
                     self.print_success(f"Successfully generated {output_file}")
                     generated_files.append(str(output_file))
@@ -1236,7 +1231,7 @@ OPERATIONS  (comma-separated; default: fullService)
   preUpdateScripts     Run the semicolon-separated SQL files in DBPREUPDATESCRIPTS (before update).
   postUpdateScripts    Run the semicolon-separated SQL files in DBPOSTUPDATESCRIPTS (after update).
   prepareVersionTable  Extract DB objects via extract-db-objects.py and emit documentation in the
-                       formats from DBVERSIONTABLEFORMATS (json;md;csv;html) to DBVERSIONTABLEOUTPUTFOLDER.
+                       formats from DBVERSIONTABLEFORMATS (json;md;csv;html;sqlite) to DBVERSIONTABLEOUTPUTFOLDER.
   execSql              Run ad-hoc SQL: inline via --sql / -Sql, or a file via --sql-file / -SqlFile.
                        With neither, opens an interactive psql session against the target DB.
   runTests             Run SQL test files / suites from the tests/ folder. Global ordering from
@@ -1295,7 +1290,7 @@ ENVIRONMENT VARIABLES
     DBPREUPDATESCRIPTS    Semicolon-separated SQL files for preUpdateScripts
     DBPOSTUPDATESCRIPTS   Semicolon-separated SQL files for postUpdateScripts
   Version table:
-    DBVERSIONTABLEFORMATS       Semicolon list: json;md;csv;html (default json;md)
+    DBVERSIONTABLEFORMATS       Semicolon list: json;md;csv;html;sqlite (default json;md)
     DBVERSIONTABLEOUTPUTFOLDER  Output directory (default .)
     DBVERSIONTABLEFILENAME      Base output filename (default db-objects)
   Tooling / safety:
@@ -338,7 +338,7 @@ prepare_version_table() {
     fi
 
     # Validate formats
-    local valid_formats=("json" "md" "markdown" "csv" "html")
+    local valid_formats=("json" "md" "markdown" "csv" "html" "sqlite")
     local invalid_formats=()
     for fmt in "${formats[@]}"; do
         local valid=false
@@ -354,7 +354,7 @@ prepare_version_table() {
     done
 
     if [[ ${#invalid_formats[@]} -gt 0 ]]; then
-        print_error "Invalid formats: ${invalid_formats[*]}. Valid formats: json, md, csv, html"
+        print_error "Invalid formats: ${invalid_formats[*]}. Valid formats: json, md, csv, html, sqlite"
         return 1
     fi
 
@@ -402,7 +402,19 @@ prepare_version_table() {
 
     local generated_files=()
 
-    # Generate each requested format
+    # Generate all requested formats from a single parse
+    local output_base="$output_folder/$base_filename"
+    local formats_csv
+    formats_csv=$(IFS=','; echo "${formats[*]}")
+
+    print_info "Generating ${formats_csv^^} format(s): $output_base.*"
+
+    local output
+    if ! output=$($python_cmd "extract-db-objects.py" --format "$formats_csv" --output "$output_base" 2>&1); then
+        print_error "Failed to generate $formats_csv: $output"
+        return 1
+    fi
+
     for fmt in "${formats[@]}"; do
         # Determine extension
         local extension="$fmt"
@@ -410,15 +422,7 @@ prepare_version_table() {
             extension="md"
         fi
 
-        local output_file="$output_folder/$base_filename.$extension"
-
-        print_info "Generating ${fmt^^} format: $output_file"
-
-        local output
-        if ! output=$($python_cmd "extract-db-objects.py" --format "$fmt" --output "$output_file" 2>&1); then
-            print_error "Failed to generate $fmt: $output"
-            return 1
-        fi
+        local output_file="$output_base.$extension"
 
         if [[ -f "$output_file" ]]; then
             print_success "Successfully generated $output_file"
@@ -1222,7 +1226,7 @@ OPERATIONS  (comma-separated; default: fullService)
   preUpdateScripts     Run the semicolon-separated SQL files in DBPREUPDATESCRIPTS (before update).
   postUpdateScripts    Run the semicolon-separated SQL files in DBPOSTUPDATESCRIPTS (after update).
   prepareVersionTable  Extract DB objects via extract-db-objects.py and emit documentation in the
-                       formats from DBVERSIONTABLEFORMATS (json;md;csv;html) to DBVERSIONTABLEOUTPUTFOLDER.
+                       formats from DBVERSIONTABLEFORMATS (json;md;csv;html;sqlite) to DBVERSIONTABLEOUTPUTFOLDER.
   execSql              Run ad-hoc SQL: inline via --sql / -Sql, or a file via --sql-file / -SqlFile.
                        With neither, opens an interactive psql session against the target DB.
   runTests             Run SQL test files / suites from the tests/ folder. Global ordering from
@@ -1281,7 +1285,7 @@ ENVIRONMENT VARIABLES
     DBPREUPDATESCRIPTS    Semicolon-separated SQL files for preUpdateScripts
     DBPOSTUPDATESCRIPTS   Semicolon-separated SQL files for postUpdateScripts
   Version table:
-    DBVERSIONTABLEFORMATS       Semicolon list: json;md;csv;html (default json;md)
+    DBVERSIONTABLEFORMATS       Semicolon list: json;md;csv;html;sqlite (default json;md)
     DBVERSIONTABLEOUTPUTFOLDER  Output directory (default .)
     DBVERSIONTABLEFILENAME      Base output filename (default db-objects)
   Tooling / safety:
@@ -5,15 +5,82 @@ Tracks all updates and determines the latest version of each object.
 
 Also scans ad-hoc scripts from directory specified by DBADHOCDIRECTORY environment variable.
 Ad-hoc files are marked with (AD-HOC) prefix in output for easy identification.
+
+Per-file parse results are cached in .db-objects-cache.json (keyed by path, size, mtime
+and content hash), so only new or changed files are re-parsed on subsequent runs.
 """
 
 import os
 import re
+import sys
 import json
 import csv
+import mmap
+import hashlib
+import io
+import sqlite3
 import argparse
+import subprocess
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
+
+# Bump when the shape of cached parse results changes
+CACHE_VERSION = 2
+DEFAULT_CACHE_FILE = '.db-objects-cache.json'
+
+# Object detection patterns: (object_type, [regex, ...]); group 1 = operation, group 2 = name
+OBJECT_PATTERNS = {
+    'function': [
+        r'^\s*(CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION)\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*\(',
+        r'^\s*(DROP\s+FUNCTION)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
+    ],
+    'procedure': [
+        r'^\s*(CREATE\s+(?:OR\s+REPLACE\s+)?PROCEDURE)\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*\(',
+        r'^\s*(DROP\s+PROCEDURE)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
+    ],
+    'table': [
+        r'^\s*(CREATE\s+(?:UNLOGGED\s+|TEMPORARY\s+|TEMP\s+)?TABLE)(?:\s+IF\s+NOT\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
+        r'^\s*(ALTER\s+TABLE)\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
+        r'^\s*(DROP\s+TABLE)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
+    ],
+    'index': [
+        r'^\s*(CREATE\s+(?:UNIQUE\s+)?INDEX)(?:\s+CONCURRENTLY)?(?:\s+IF\s+NOT\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s+ON',
+        r'^\s*(DROP\s+INDEX)(?:\s+CONCURRENTLY)?(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
+        r'^\s*(ALTER\s+INDEX)\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
+    ],
+    'view': [
+        r'^\s*(CREATE\s+(?:OR\s+REPLACE\s+)?VIEW)\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
+        r'^\s*(DROP\s+VIEW)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
+    ],
+    'trigger': [
+        r'^\s*(CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER)\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
+        r'^\s*(DROP\s+TRIGGER)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
+    ],
+    'schema': [
+        r'^\s*(CREATE\s+SCHEMA)(?:\s+IF\s+NOT\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
+        r'^\s*(DROP\s+SCHEMA)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
+    ]
+}
+
+COMPILED_PATTERNS = [
+    (object_type, [re.compile(pattern, re.IGNORECASE) for pattern in type_patterns])
+    for object_type, type_patterns in OBJECT_PATTERNS.items()
+]
+
+# Files at least this large are memory-mapped and scanned with byte-level searches
+LARGE_FILE_THRESHOLD = 1024 * 1024
+
+# Line starts that can open a tracked DDL statement or a bulk-data statement worth skipping
+CANDIDATE_LINE_RE = re.compile(rb'^[ \t\r\f\v]*(create|alter|drop|insert|copy|values)\b', re.IGNORECASE | re.MULTILINE)
+COPY_FROM_STDIN_RE = re.compile(rb'\bfrom\s+stdin\b', re.IGNORECASE)
+# A skipped bulk-data range must not contain a line the line-by-line parser would match
+DDL_LINE_RE = re.compile(rb'^[ \t\r\f\v]*(create|alter|drop)\b', re.IGNORECASE | re.MULTILINE)
+
+# Cache entries are only valid for the exact parser that produced them
+PARSER_SIGNATURE = hashlib.sha256(
+    json.dumps([CACHE_VERSION, OBJECT_PATTERNS], sort_keys=True).encode('utf-8')
+).hexdigest()
 
 def get_sql_files() -> List[Path]:
     """Get all SQL files in order based on numbering."""
@@ -49,112 +116,841 @@ def get_sql_files() -> List[Path]:
 
     return sorted(sql_files, key=sort_key)
 
+def match_sql_line(line: str, line_num: int, filename: str) -> Optional[Dict[str, Any]]:
+    """Match a single SQL line against the object patterns."""
+    line = line.strip()
+
+    # Skip comments and empty lines
+    if not line or line.startswith('--') or line.startswith('/*'):
+        return None
+
+    for object_type, type_patterns in COMPILED_PATTERNS:
+        for pattern in type_patterns:
+            match = pattern.match(line)
+            if match:
+                operation_text = match.group(1).strip().upper()
+                object_name = match.group(2).strip()
+
+                # Parse operation type
+                if 'CREATE' in operation_text:
+                    if 'REPLACE' in operation_text:
+                        operation = 'CREATE_OR_REPLACE'
+                    else:
+                        operation = 'CREATE'
+                elif 'ALTER' in operation_text:
+                    operation = 'ALTER'
+                else:
+                    operation = 'DROP'
+
+                # Parse schema and name
+                if '.' in object_name:
+                    schema, name = object_name.split('.', 1)
+                else:
+                    schema = 'public'
+                    name = object_name
+
+                return {
+                    'schema': schema,
+                    'object_name': name,
+                    'object_type': object_type,
+                    'operation': operation,
+                    'file': filename,
+                    'line': line_num,
+                    'full_line': line
+                }
+
+    return None
+
 def parse_sql_objects(content: str, filename: str) -> List[Dict[str, Any]]:
     """Parse SQL content to extract database objects."""
     objects = []
     lines = content.split('\n')
 
-    # Updated patterns with better capture groups
-    patterns = {
-        'function': [
-            r'^\s*(CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION)\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*\(',
-            r'^\s*(DROP\s+FUNCTION)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
-        ],
-        'procedure': [
-            r'^\s*(CREATE\s+(?:OR\s+REPLACE\s+)?PROCEDURE)\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*\(',
-            r'^\s*(DROP\s+PROCEDURE)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
-        ],
-        'table': [
-            r'^\s*(CREATE\s+(?:UNLOGGED\s+|TEMPORARY\s+|TEMP\s+)?TABLE)(?:\s+IF\s+NOT\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
-            r'^\s*(ALTER\s+TABLE)\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
-            r'^\s*(DROP\s+TABLE)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
-        ],
-        'index': [
-            r'^\s*(CREATE\s+(?:UNIQUE\s+)?INDEX)(?:\s+CONCURRENTLY)?(?:\s+IF\s+NOT\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s+ON',
-            r'^\s*(DROP\s+INDEX)(?:\s+CONCURRENTLY)?(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
-            r'^\s*(ALTER\s+INDEX)\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
-        ],
-        'view': [
-            r'^\s*(CREATE\s+(?:OR\s+REPLACE\s+)?VIEW)\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
-            r'^\s*(DROP\s+VIEW)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
-        ],
-        'trigger': [
-            r'^\s*(CREATE\s+(?:OR\s+REPLACE\s+)?TRIGGER)\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
-            r'^\s*(DROP\s+TRIGGER)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
-        ],
-        'schema': [
-            r'^\s*(CREATE\s+SCHEMA)(?:\s+IF\s+NOT\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)',
-            r'^\s*(DROP\s+SCHEMA)(?:\s+IF\s+EXISTS)?\s+([a-zA-Z_][a-zA-Z0-9_.]*)'
-        ]
-    }
-
     for line_num, line in enumerate(lines, 1):
-        line = line.strip()
+        obj = match_sql_line(line, line_num, filename)
+        if obj:
+            objects.append(obj)
 
-        # Skip comments and empty lines
-        if not line or line.startswith('--') or line.startswith('/*'):
+    return objects
+
+def scan_large_sql_file(data, filename: str) -> List[Dict[str, Any]]:
+    """
+    Extract database objects from a large (memory-mapped) SQL file.
+
+    Only lines starting with a DDL keyword are decoded and matched. INSERT / VALUES
+    statements are skipped up to their first ';' and COPY ... FROM STDIN blocks up to
+    the closing '\\.' line, using byte-level finds instead of per-line regex work.
+
+    The ';' found this way is not necessarily the end of the statement (the INSERT may
+    sit in a comment, or a literal may contain ';'), so a range is only skipped when it
+    holds no line starting with create/alter/drop. Otherwise scanning resumes on the
+    next line, which keeps the results identical to parse_sql_objects().
+    """
+    objects = []
+    size = len(data)
+    pos = 0
+    line_num = 1
+
+    while pos < size:
+        match = CANDIDATE_LINE_RE.search(data, pos)
+        if not match:
+            break
+
+        start = match.start()
+        line_num += data[pos:start].count(b'\n')
+        line_end = data.find(b'\n', start)
+        if line_end == -1:
+            line_end = size
+
+        keyword = match.group(1).lower()
+        next_pos = line_end
+
+        if keyword in (b'create', b'alter', b'drop'):
+            obj = match_sql_line(decode_sql_bytes(data[start:line_end]), line_num, filename)
+            if obj:
+                objects.append(obj)
+        else:
+            # Bulk data: skip to its first ';' (a COPY block to its '\.' line)
+            statement_end = data.find(b';', start)
+            if statement_end != -1:
+                next_pos = data.find(b'\n', statement_end)
+                if next_pos == -1:
+                    next_pos = size
+
+                if keyword == b'copy' and COPY_FROM_STDIN_RE.search(data, start, statement_end):
+                    data_end = data.find(b'\n\\.', next_pos)
+                    if data_end != -1:
+                        next_pos = data.find(b'\n', data_end + 1)
+                        if next_pos == -1:
+                            next_pos = size
+
+                if DDL_LINE_RE.search(data, line_end, next_pos):
+                    next_pos = line_end
+
+        line_num += data[start:next_pos].count(b'\n')
+        pos = next_pos
+
+    return objects
+
+# Schema resolution order used by the migration files (set search_path = ...)
+DEFAULT_SEARCH_PATH = ['public', 'const', 'ext', 'stage', 'helpers', 'internal', 'unsecure', 'auth', 'triggers']
+
+# Tokens that can hide a ';' from the statement splitter
+SQL_TOKEN_RE = re.compile(
+    r"--[^\n]*"
+    r"|/\*.*?\*/"
+    r"|'[^']*(?:''[^']*)*'"
+    r'|"[^"]*(?:""[^"]*)*"'
+    r"|\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$"
+    r"|;",
+    re.DOTALL
+)
+STATEMENT_PREFIX_RE = re.compile(r"(?:\s+|--[^\n]*|/\*.*?\*/|\\[^\n]*)*", re.DOTALL)
+DOLLAR_QUOTE_RE = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+QUALIFIED_NAME = r'((?:[a-zA-Z_][a-zA-Z0-9_]*\.)?[a-zA-Z_][a-zA-Z0-9_]*)'
+
+CREATE_ROUTINE_RE = re.compile(
+    r'create\s+(?:or\s+replace\s+)?(function|procedure)\s+' + QUALIFIED_NAME + r'\s*\(', re.IGNORECASE)
+DROP_ROUTINE_RE = re.compile(r'drop\s+(function|procedure)\s+(?:if\s+exists\s+)?', re.IGNORECASE)
+CREATE_VIEW_RE = re.compile(
+    r'create\s+(?:or\s+replace\s+)?(materialized\s+)?view\s+(?:if\s+not\s+exists\s+)?' + QUALIFIED_NAME
+    + r'.*?\bas\b', re.IGNORECASE | re.DOTALL)
+DROP_VIEW_RE = re.compile(r'drop\s+(?:materialized\s+)?view\s+(?:if\s+exists\s+)?([^;]*)', re.IGNORECASE)
+CREATE_TABLE_RE = re.compile(
+    r'create\s+(?:unlogged\s+|temporary\s+|temp\s+)?table\s+(?:if\s+not\s+exists\s+)?' + QUALIFIED_NAME,
+    re.IGNORECASE)
+DROP_TABLE_RE = re.compile(r'drop\s+table\s+(?:if\s+exists\s+)?([^;]*)', re.IGNORECASE)
+CREATE_TRIGGER_RE = re.compile(
+    r'create\s+(?:or\s+replace\s+)?(?:constraint\s+)?trigger\s+([a-zA-Z_][a-zA-Z0-9_]*)\s+'
+    r'(before|after|instead\s+of)\s+(.+?)\s+on\s+' + QUALIFIED_NAME
+    + r'.*?\bexecute\s+(?:function|procedure)\s+' + QUALIFIED_NAME + r'\s*\(',
+    re.IGNORECASE | re.DOTALL)
+DROP_TRIGGER_RE = re.compile(
+    r'drop\s+trigger\s+(?:if\s+exists\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s+on\s+' + QUALIFIED_NAME, re.IGNORECASE)
+SET_SEARCH_PATH_RE = re.compile(r'set\s+search_path\s*(?:=|to)\s*([^;]+)', re.IGNORECASE)
+
+# Body analysis: comments and literals are blanked before matching references
+BODY_NOISE_RE = re.compile(r"--[^\n]*|/\*.*?\*/|'[^']*(?:''[^']*)*'", re.DOTALL)
+CALL_RE = re.compile(r'(?<![\w.$])' + QUALIFIED_NAME + r'\s*\(')
+WRITE_RE = re.compile(
+    r'\b(?:insert\s+into|update|delete\s+from|merge\s+into|truncate(?:\s+table)?)\s+(?:only\s+)?' + QUALIFIED_NAME,
+    re.IGNORECASE)
+READ_RE = re.compile(r'(\bdelete\s+)?\b(?:from|join)\s+(?:only\s+|lateral\s+)?' + QUALIFIED_NAME, re.IGNORECASE)
+
+def iter_sql_statements(content: str):
+    """
+    Split SQL content into top-level statements.
+
+    Yields (line, text) pairs, where line is the 1-based line of the first keyword.
+    Comments, quoted literals and dollar-quoted bodies are honoured, so semicolons
+    inside function bodies do not split statements. psql meta-commands are skipped.
+    """
+    size = len(content)
+    start = STATEMENT_PREFIX_RE.match(content, 0).end()
+    line = 1 + content.count('\n', 0, start)
+    pos = start
+
+    while pos < size:
+        token = SQL_TOKEN_RE.search(content, pos)
+        if not token:
+            break
+
+        text = token.group(0)
+        if text.startswith('$'):
+            closing = content.find(text, token.end())
+            pos = size if closing == -1 else closing + len(text)
+            continue
+        if text != ';':
+            pos = token.end()
             continue
 
-        for object_type, type_patterns in patterns.items():
-            for pattern in type_patterns:
-                match = re.match(pattern, line, re.IGNORECASE)
-                if match:
-                    operation_text = match.group(1).strip().upper()
-                    object_name = match.group(2).strip()
-
-                    # Parse operation type
-                    if 'CREATE' in operation_text:
-                        if 'REPLACE' in operation_text:
-                            operation = 'CREATE_OR_REPLACE'
-                        else:
-                            operation = 'CREATE'
-                    elif 'ALTER' in operation_text:
-                        operation = 'ALTER'
-                    else:
-                        operation = 'DROP'
+        statement = content[start:token.end()]
+        if statement.strip() != ';':
+            yield line, statement
+
+        next_start = STATEMENT_PREFIX_RE.match(content, token.end()).end()
+        line += content.count('\n', start, next_start)
+        start = pos = next_start
+
+    if content[start:].strip():
+        yield line, content[start:]
+
+def split_top_level(text: str, separator: str = ',') -> List[str]:
+    """Split text on a separator that is not nested inside parentheses or quotes."""
+    parts = []
+    depth = 0
+    current = []
+    quote = None
+
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+
+    parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+def find_closing_paren(text: str, open_pos: int) -> int:
+    """Return the index of the parenthesis closing the one at open_pos (-1 if unbalanced)."""
+    depth = 0
+    quote = None
+
+    for index in range(open_pos, len(text)):
+        char = text[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return index
+
+    return -1
+
+def routine_signature(arguments: str) -> str:
+    """Reduce a routine argument list to its identity (input argument types only)."""
+    # Words that start a multi-word type name rather than an argument name
+    multiword_types = {'double', 'character', 'timestamp', 'time', 'bit', 'interval', 'national'}
+    types = []
+
+    for argument in split_top_level(arguments):
+        argument = re.split(r'\s+default\s+|\s*=\s*', argument, maxsplit=1, flags=re.IGNORECASE)[0]
+        tokens = argument.split()
+        if not tokens:
+            continue
+
+        mode = tokens[0].lower()
+        if mode == 'out':
+            continue
+        if mode in ('in', 'inout', 'variadic'):
+            tokens = tokens[1:]
+
+        if len(tokens) > 1 and (tokens[0].startswith('_') or tokens[0].lower() not in multiword_types):
+            tokens = tokens[1:]
 
-                    # Parse schema and name
-                    if '.' in object_name:
-                        schema, name = object_name.split('.', 1)
+        types.append(' '.join(tokens).lower())
+
+    return ','.join(types)
+
+def qualify_name(name: str, default_schema: str = 'public') -> Tuple[str, str]:
+    """Split a possibly unqualified name into (schema, name)."""
+    name = name.lower()
+    if '.' in name:
+        schema, object_name = name.split('.', 1)
+        return schema, object_name
+    return default_schema, name
+
+def extract_definitions(sql_files: List[Path]) -> Dict[str, Dict[str, Any]]:
+    """
+    Replay the SQL files in order and return the surviving definitions.
+
+    Result keys: 'routines' (keyed by schema.name(arg types)), 'views' and 'tables'
+    (keyed by schema.name) and 'triggers' (keyed by schema.table.trigger). Later
+    files replace earlier definitions; DROP statements remove them.
+    """
+    routines = {}
+    views = {}
+    tables = {}
+    triggers = {}
+
+    for file_path in sql_files:
+        try:
+            with open(file_path, 'rb') as f:
+                content = decode_sql_bytes(f.read())
+        except OSError as e:
+            print(f"Error reading {file_path}: {e}")
+            continue
+
+        search_path = DEFAULT_SEARCH_PATH
+
+        for line, statement in iter_sql_statements(content):
+            location = {'file': file_path.name, 'line': line}
+
+            if match := SET_SEARCH_PATH_RE.match(statement):
+                schemas = [s.strip().strip('"\'').lower() for s in match.group(1).split(',')]
+                search_path = [s for s in schemas if s and s != '$user'] or search_path
+
+            elif match := CREATE_ROUTINE_RE.match(statement):
+                args_end = find_closing_paren(statement, match.end() - 1)
+                if args_end == -1:
+                    continue
+                schema, name = qualify_name(match.group(2), search_path[0])
+                signature = routine_signature(statement[match.end():args_end])
+
+                body_start = DOLLAR_QUOTE_RE.search(statement, args_end)
+                if body_start:
+                    body_end = statement.find(body_start.group(0), body_start.end())
+                    body = statement[body_start.end():body_end if body_end != -1 else len(statement)]
+                else:
+                    body = statement[args_end + 1:]
+
+                routines[f"{schema}.{name}({signature})"] = {
+                    'schema': schema,
+                    'object_name': name,
+                    'object_type': match.group(1).lower(),
+                    'signature': signature,
+                    'definition': statement.strip(),
+                    'body': body,
+                    'search_path': search_path,
+                    **location
+                }
+
+            elif match := DROP_ROUTINE_RE.match(statement):
+                for target in split_top_level(statement[match.end():].rstrip().rstrip(';')):
+                    target = re.sub(r'\s+(?:cascade|restrict)$', '', target, flags=re.IGNORECASE)
+                    paren = target.find('(')
+                    schema, name = qualify_name(target[:paren] if paren != -1 else target)
+                    prefix = f"{schema}.{name}("
+                    if paren != -1:
+                        args_end = find_closing_paren(target, paren)
+                        routines.pop(f"{prefix}{routine_signature(target[paren + 1:args_end])})", None)
                     else:
-                        schema = 'public'
-                        name = object_name
-
-                    objects.append({
-                        'schema': schema,
-                        'object_name': name,
-                        'object_type': object_type,
-                        'operation': operation,
-                        'file': filename,
-                        'line': line_num,
-                        'full_line': line
-                    })
-                    break
+                        for key in [k for k in routines if k.startswith(prefix)]:
+                            del routines[key]
+
+            elif match := CREATE_VIEW_RE.match(statement):
+                schema, name = qualify_name(match.group(2), search_path[0])
+                views[f"{schema}.{name}"] = {
+                    'schema': schema,
+                    'object_name': name,
+                    'object_type': 'materialized_view' if match.group(1) else 'view',
+                    'definition': statement.strip(),
+                    'body': statement[match.end():],
+                    'search_path': search_path,
+                    **location
+                }
 
-    return objects
+            elif match := DROP_VIEW_RE.match(statement):
+                for target in split_top_level(match.group(1)):
+                    schema, name = qualify_name(target.split()[0])
+                    views.pop(f"{schema}.{name}", None)
+
+            elif match := CREATE_TABLE_RE.match(statement):
+                schema, name = qualify_name(match.group(1), search_path[0])
+                tables[f"{schema}.{name}"] = {'schema': schema, 'object_name': name, 'object_type': 'table', **location}
+
+            elif match := DROP_TABLE_RE.match(statement):
+                for target in split_top_level(match.group(1)):
+                    schema, name = qualify_name(target.split()[0])
+                    tables.pop(f"{schema}.{name}", None)
+                    for key in [k for k in triggers if k.startswith(f"{schema}.{name}.")]:
+                        del triggers[key]
+
+            elif match := CREATE_TRIGGER_RE.match(statement):
+                table_schema, table_name = qualify_name(match.group(4))
+                function_schema, function_name = qualify_name(match.group(5))
+                triggers[f"{table_schema}.{table_name}.{match.group(1).lower()}"] = {
+                    'schema': table_schema,
+                    'object_name': match.group(1).lower(),
+                    'object_type': 'trigger',
+                    'table': f"{table_schema}.{table_name}",
+                    'function': f"{function_schema}.{function_name}",
+                    'timing': ' '.join(match.group(2).lower().split()),
+                    'events': ' '.join(match.group(3).lower().split()),
+                    **location
+                }
+
+            elif match := DROP_TRIGGER_RE.match(statement):
+                table_schema, table_name = qualify_name(match.group(2))
+                triggers.pop(f"{table_schema}.{table_name}.{match.group(1).lower()}", None)
+
+    return {'routines': routines, 'views': views, 'tables': tables, 'triggers': triggers}
+
+def resolve_reference(name: str, known: Dict[str, Any], search_path: List[str]) -> Optional[str]:
+    """Resolve a (possibly unqualified) identifier against known schema.name keys."""
+    name = name.lower()
+    if '.' in name:
+        return name if name in known else None
+
+    for schema in search_path:
+        if f"{schema}.{name}" in known:
+            return f"{schema}.{name}"
+
+    return None
+
+def build_dependency_graph(definitions: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build a dependency graph from extracted definitions.
+
+    Nodes are functions/procedures (overloads merged by name), tables, views and
+    triggers. Edges: calls (routine -> routine), reads (routine/view -> table/view),
+    writes (routine -> table), executes (trigger -> function), fires (table -> trigger).
+    """
+    nodes = {}
+    edges = set()
+
+    routines_by_name = {}
+    for routine in definitions['routines'].values():
+        node_id = f"{routine['schema']}.{routine['object_name']}"
+        routines_by_name.setdefault(node_id, []).append(routine)
+        nodes[node_id] = {
+            'id': node_id,
+            'type': routine['object_type'],
+            'file': routine['file'],
+            'line': routine['line']
+        }
+
+    relations = {**definitions['tables'], **definitions['views']}
+    for key, relation in relations.items():
+        nodes[key] = {'id': key, 'type': relation['object_type'], 'file': relation['file'], 'line': relation['line']}
+
+    def add_body_edges(source: str, body: str, search_path: List[str], analyse_calls: bool):
+        body = BODY_NOISE_RE.sub(' ', body)
+
+        if analyse_calls:
+            for match in CALL_RE.finditer(body):
+                target = resolve_reference(match.group(1), routines_by_name, search_path)
+                if target:
+                    edges.add((source, target, 'calls'))
+
+            for match in WRITE_RE.finditer(body):
+                target = resolve_reference(match.group(1), definitions['tables'], search_path)
+                if target:
+                    edges.add((source, target, 'writes'))
+
+        for match in READ_RE.finditer(body):
+            if match.group(1):
+                continue
+            target = resolve_reference(match.group(2), relations, search_path)
+            if target and target != source:
+                edges.add((source, target, 'reads'))
+
+    for node_id, overloads in routines_by_name.items():
+        for routine in overloads:
+            add_body_edges(node_id, routine['body'], routine['search_path'], analyse_calls=True)
+
+    for key, view in definitions['views'].items():
+        add_body_edges(key, view['body'], view['search_path'], analyse_calls=False)
+
+    for key, trigger in definitions['triggers'].items():
+        nodes[key] = {
+            'id': key,
+            'type': 'trigger',
+            'file': trigger['file'],
+            'line': trigger['line'],
+            'timing': trigger['timing'],
+            'events': trigger['events']
+        }
+        edges.add((trigger['table'], key, 'fires'))
+        edges.add((key, trigger['function'], 'executes'))
+
+    return {
+        'nodes': [nodes[key] for key in sorted(nodes)],
+        'edges': [{'from': source, 'to': target, 'type': edge_type}
+                  for source, target, edge_type in sorted(edges)]
+    }
+
+def output_graph_json(graph: Dict[str, Any], output_file: str):
+    """Output the dependency graph as JSON."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(graph, f, indent=2)
+    print(f"Dependency graph saved to: {output_file}")
+
+def output_graph_dot(graph: Dict[str, Any], output_file: str):
+    """Output the dependency graph in Graphviz DOT format."""
+    node_styles = {
+        'function': 'shape=box',
+        'procedure': 'shape=box, style=rounded',
+        'table': 'shape=cylinder',
+        'view': 'shape=note',
+        'materialized_view': 'shape=note, style=bold',
+        'trigger': 'shape=diamond'
+    }
+    edge_styles = {
+        'calls': '',
+        'reads': 'style=dashed, color=gray40',
+        'writes': 'color=red',
+        'executes': 'style=dotted',
+        'fires': 'style=dotted, color=blue'
+    }
+
+    lines = ['digraph db_objects {', '    rankdir=LR;', '    node [fontname="Helvetica", fontsize=10];']
+    for node in graph['nodes']:
+        lines.append(f'    "{node["id"]}" [{node_styles.get(node["type"], "shape=ellipse")}];')
+    for edge in graph['edges']:
+        style = edge_styles.get(edge['type'], '')
+        attributes = f'label="{edge["type"]}"' + (f', {style}' if style else '')
+        lines.append(f'    "{edge["from"]}" -> "{edge["to"]}" [{attributes}];')
+    lines.append('}')
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    print(f"Dependency graph saved to: {output_file}")
+
+DRIFT_SCHEMA_PREFIX = '__drift_'
+DRIFT_ROW_MARKER = 'DRIFT'
+
+def drift_scratch_definition(obj: Dict[str, Any]) -> Optional[str]:
+    """Rewrite a file definition so it creates the object in its drift scratch schema."""
+    scratch_schema = f"{DRIFT_SCHEMA_PREFIX}{obj['schema']}"
+    definition = obj['definition'].rstrip().rstrip(';')
+
+    if obj['object_type'] in ('function', 'procedure'):
+        match = CREATE_ROUTINE_RE.match(definition)
+        if not match:
+            return None
+        return (f"create or replace {obj['object_type']} {scratch_schema}.{obj['object_name']}("
+                + definition[match.end():] + ';')
+
+    match = CREATE_VIEW_RE.match(definition)
+    if not match:
+        return None
+
+    if obj['object_type'] == 'materialized_view':
+        # Never populate the scratch copy; only its definition is compared
+        query = re.sub(r'\s+with\s+(?:no\s+)?data\s*$', '', definition[match.end():], flags=re.IGNORECASE)
+        return f"create materialized view {scratch_schema}.{obj['object_name']} as {query} with no data;"
+
+    return f"create or replace view {scratch_schema}.{obj['object_name']}" + definition[match.end(2):] + ';'
+
+def build_drift_script(candidates: List[Dict[str, Any]]) -> str:
+    """
+    Build a psql script that compares file definitions with the live catalog.
+
+    Every candidate is created in a per-schema scratch schema inside a transaction
+    that is rolled back, so both sides are rendered by pg_get_functiondef /
+    pg_get_viewdef and compared as normalized md5 hashes. One result row per
+    candidate is emitted as DRIFT|index|status, plus DRIFT|extra|name rows for
+    live objects no file defines.
+    """
+    schemas = sorted({obj['schema'] for obj in candidates})
+    schema_list = ', '.join(f"'{schema}'" for schema in schemas)
+    normalize = "md5(regexp_replace(btrim({0}), '\\s+', ' ', 'g'))"
+    # Argument types of oid::regprocedure ('(bigint,text)'), so overloads are told apart by type only
+    identity = "substr(p.oid::regprocedure::text, strpos(p.oid::regprocedure::text, '('))"
+
+    lines = [
+        '\\set ON_ERROR_STOP off',
+        '\\set ON_ERROR_ROLLBACK on',
+        'begin;',
+        'set local check_function_bodies = off;',
+        f"set local search_path = {', '.join(DEFAULT_SEARCH_PATH)};",
+        'create temporary table __drift_candidate (idx int primary key, scratch_oid oid, kind text) on commit drop;'
+    ]
+    lines.extend(f'create schema {DRIFT_SCHEMA_PREFIX}{schema};' for schema in schemas)
 
-def process_files() -> Dict[str, Dict[str, Any]]:
+    for index, obj in enumerate(candidates):
+        scratch = drift_scratch_definition(obj)
+        if scratch is None:
+            continue
+
+        scratch_schema = f"{DRIFT_SCHEMA_PREFIX}{obj['schema']}"
+        lines.append(f"set local search_path = {', '.join(obj['search_path'])};")
+        lines.append(scratch)
+        if obj['object_type'] in ('function', 'procedure'):
+            regprocedure = f"{scratch_schema}.{obj['object_name']}({obj['signature']})".replace("'", "''")
+            lines.append(
+                f"insert into __drift_candidate select {index}, p.oid, 'routine' from pg_proc p"
+                f" where p.oid = to_regprocedure('{regprocedure}');")
+        else:
+            lines.append(
+                f"insert into __drift_candidate select {index}, c.oid, 'view' from pg_class c"
+                f" join pg_namespace n on n.oid = c.relnamespace"
+                f" where n.nspname = '{scratch_schema}' and c.relname = '{obj['object_name']}';")
+
+    lines.append(f"set local search_path = {', '.join(DEFAULT_SEARCH_PATH)};")
+    lines.append('\\pset format unaligned')
+    lines.append('\\pset tuples_only on')
+    lines.append(f"""with scratch as (
+    select dc.idx, dc.kind, substr(n.nspname, {len(DRIFT_SCHEMA_PREFIX) + 1}) as live_schema, p.proname as live_name,
+           {identity} as identity,
+           replace(pg_get_functiondef(p.oid), n.nspname || '.', substr(n.nspname, {len(DRIFT_SCHEMA_PREFIX) + 1}) || '.') as def
+    from __drift_candidate dc
+        inner join pg_proc p on p.oid = dc.scratch_oid
+        inner join pg_namespace n on n.oid = p.pronamespace
+    where dc.kind = 'routine'
+    union all
+    select dc.idx, dc.kind, substr(n.nspname, {len(DRIFT_SCHEMA_PREFIX) + 1}), c.relname, '', pg_get_viewdef(c.oid)
+    from __drift_candidate dc
+        inner join pg_class c on c.oid = dc.scratch_oid
+        inner join pg_namespace n on n.oid = c.relnamespace
+    where dc.kind = 'view'
+), live as (
+    select 'routine' as kind, n.nspname as live_schema, p.proname as live_name,
+           {identity} as identity, pg_get_functiondef(p.oid) as def
+    from pg_proc p
+        inner join pg_namespace n on n.oid = p.pronamespace
+    where n.nspname in ({schema_list}) and p.prokind in ('f', 'p')
+    union all
+    select 'view', n.nspname, c.relname, '', pg_get_viewdef(c.oid)
+    from pg_class c
+        inner join pg_namespace n on n.oid = c.relnamespace
+    where n.nspname in ({schema_list}) and c.relkind in ('v', 'm')
+)
+select '{DRIFT_ROW_MARKER}', s.idx,
+       case when l.def is null then 'missing'
+            when {normalize.format('l.def')} = {normalize.format('s.def')} then 'match'
+            else 'drifted' end
+from scratch s
+    left join live l on l.kind = s.kind and l.live_schema = s.live_schema
+        and l.live_name = s.live_name and l.identity = s.identity
+union all
+select '{DRIFT_ROW_MARKER}', -1, l.live_schema || '.' || l.live_name || l.identity
+from live l
+where not exists (select 1 from scratch s where s.kind = l.kind and s.live_schema = l.live_schema
+                                             and s.live_name = l.live_name and s.identity = l.identity);""")
+    lines.append('rollback;')
+
+    return '\n'.join(lines) + '\n'
+
+def check_catalog_drift(definitions: Dict[str, Dict[str, Any]], output_file: str,
+                        database: Optional[str] = None) -> Optional[bool]:
+    """
+    Compare the latest file definitions of functions, procedures and views with a live database.
+
+    Writes a SQL bundle re-creating only the drifted or missing objects to output_file.
+    Returns True if drift was found, False if the catalog matches, None on failure.
+    """
+    candidates = list(definitions['routines'].values()) + list(definitions['views'].values())
+    candidates.sort(key=lambda obj: (obj['file'], obj['line']))
+
+    psql_cmd = os.environ.get('DBPSQLFILE', 'psql')
+    command = [psql_cmd, '-X', '-q', '-f', '-']
+    if database:
+        command.extend(['-d', database])
+
+    print(f"Comparing {len(candidates)} definitions with the live catalog...")
+    try:
+        result = subprocess.run(command, input=build_drift_script(candidates), capture_output=True,
+                                text=True, env=os.environ)
+    except FileNotFoundError:
+        print(f"psql command not found: {psql_cmd}")
+        return None
+
+    statuses = {}
+    extras = []
+    for line in result.stdout.splitlines():
+        parts = line.split('|', 2)
+        if len(parts) != 3 or parts[0] != DRIFT_ROW_MARKER:
+            continue
+        if parts[1] == '-1':
+            extras.append(parts[2])
+        else:
+            statuses[int(parts[1])] = parts[2]
+
+    if result.returncode != 0 or not statuses:
+        print(f"Drift check failed (psql exit code {result.returncode})")
+        if result.stderr:
+            print(result.stderr)
+        return None
+
+    bundle = []
+    counts = {'match': 0, 'drifted': 0, 'missing': 0, 'unchecked': 0}
+    for index, obj in enumerate(candidates):
+        status = statuses.get(index, 'unchecked')
+        counts[status] += 1
+        if status == 'match':
+            continue
+
+        name = f"{obj['schema']}.{obj['object_name']}"
+        if obj['object_type'] in ('function', 'procedure'):
+            name += f"({obj['signature']})"
+        print(f"  {status.upper():9} {obj['object_type']:17} {name}  ({obj['file']}:{obj['line']})")
+
+        if status == 'unchecked':
+            continue
+
+        definition = obj['definition'].rstrip()
+        if obj['object_type'] in ('function', 'procedure'):
+            definition = re.sub(r'^create\s+(?:or\s+replace\s+)?', 'create or replace ', definition,
+                                flags=re.IGNORECASE)
+        bundle.extend([
+            f"-- {name}: {status} (from {obj['file']}:{obj['line']})",
+            f"set search_path = {', '.join(obj['search_path'])};",
+            definition if definition.endswith(';') else definition + ';',
+            ''
+        ])
+
+    for name in sorted(extras):
+        print(f"  EXTRA     {name}  (in database, not defined by any file)")
+
+    print(f"\nDrift check: {counts['match']} match, {counts['drifted']} drifted, {counts['missing']} missing, "
+          f"{counts['unchecked']} unchecked, {len(extras)} extra")
+    if counts['unchecked']:
+        print("Unchecked definitions could not be created in the scratch schema:")
+        if result.stderr:
+            print(result.stderr)
+
+    if not bundle:
+        print("Catalog matches the migration files, no redeploy needed")
+        return False
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(f"-- Redeploy bundle generated by extract-db-objects.py --drift-check\n"
+                f"-- {counts['drifted']} drifted, {counts['missing']} missing object(s)\n\n")
+        f.write('\n'.join(bundle))
+    print(f"Redeploy bundle saved to: {output_file}")
+    return True
+
+def load_parse_cache(cache_file: str) -> Dict[str, Dict[str, Any]]:
+    """Load per-file parse results from the cache file, discarding it if stale or unreadable."""
+    if not cache_file or not Path(cache_file).is_file():
+        return {}
+
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable cache {cache_file}: {e}")
+        return {}
+
+    if data.get('parser_signature') != PARSER_SIGNATURE:
+        print("Parser changed since cache was written, re-parsing all files")
+        return {}
+
+    return data.get('files', {})
+
+def save_parse_cache(cache_file: str, entries: Dict[str, Dict[str, Any]]):
+    """Write per-file parse results to the cache file (atomically, via a temp file)."""
+    if not cache_file:
+        return
+
+    tmp_file = f"{cache_file}.tmp"
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'parser_signature': PARSER_SIGNATURE, 'files': entries}, f, separators=(',', ':'))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Could not write cache {cache_file}: {e}")
+
+def decode_sql_bytes(raw: bytes) -> str:
+    """Decode file content as UTF-8, falling back to latin1."""
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('latin1')
+
+def parse_file_cached(file_path: Path, cache: Dict[str, Dict[str, Any]],
+                      new_cache: Dict[str, Dict[str, Any]]) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+    """
+    Return (objects, from_cache) for a file, re-parsing only when it changed.
+
+    A matching size + mtime is trusted without reading the file; otherwise the
+    content hash decides, so a touched-but-unchanged file is still a cache hit.
+    """
+    cache_key = str(file_path)
+
+    try:
+        stat = file_path.stat()
+    except OSError as e:
+        print(f"Error reading {file_path}: {e}")
+        return None
+
+    entry = cache.get(cache_key)
+    if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        new_cache[cache_key] = entry
+        return entry['objects'], True
+
+    try:
+        with open(file_path, 'rb') as f:
+            if stat.st_size >= LARGE_FILE_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    content_hash = hashlib.sha256(data).hexdigest()
+                    if entry and entry.get('sha256') == content_hash:
+                        objects = entry['objects']
+                        from_cache = True
+                    else:
+                        objects = scan_large_sql_file(data, file_path.name)
+                        from_cache = False
+            else:
+                raw = f.read()
+                content_hash = hashlib.sha256(raw).hexdigest()
+                if entry and entry.get('sha256') == content_hash:
+                    objects = entry['objects']
+                    from_cache = True
+                else:
+                    objects = parse_sql_objects(decode_sql_bytes(raw), file_path.name)
+                    from_cache = False
+    except (OSError, ValueError) as e:
+        print(f"Error reading {file_path}: {e}")
+        return None
+
+    new_cache[cache_key] = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': content_hash,
+        'objects': objects
+    }
+    return objects, from_cache
+
+def process_files(cache_file: Optional[str] = DEFAULT_CACHE_FILE) -> Dict[str, Dict[str, Any]]:
     """Process all SQL files and extract objects."""
     all_objects = {}
     sql_files = get_sql_files()
 
     print(f"Scanning {len(sql_files)} SQL files...")
 
-    for file_path in sql_files:
-        print(f"Processing: {file_path.name}")
+    cache = load_parse_cache(cache_file)
+    new_cache = {}
+    parsed_count = 0
+    cached_count = 0
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            try:
-                with open(file_path, 'r', encoding='latin1') as f:
-                    content = f.read()
-            except Exception as e:
-                print(f"Error reading {file_path}: {e}")
-                continue
+    for file_path in sql_files:
+        result = parse_file_cached(file_path, cache, new_cache)
+        if result is None:
+            continue
 
-        objects = parse_sql_objects(content, file_path.name)
+        objects, from_cache = result
+        if from_cache:
+            cached_count += 1
+        else:
+            parsed_count += 1
+            print(f"Processing: {file_path.name}")
 
         # Determine if this file is from ad-hoc directory
         adhoc_dir = os.environ.get('DBADHOCDIRECTORY', '')
@@ -202,71 +998,116 @@ def process_files() -> Dict[str, Dict[str, Any]]:
             all_objects[key]['last_update_operation'] = obj['operation']
             all_objects[key]['last_update_source'] = source_type
 
-    return all_objects
+    if cache_file:
+        # Only files seen in this run are kept, so deleted files drop out of the cache
+        save_parse_cache(cache_file, new_cache)
+        print(f"Parsed {parsed_count} changed file(s), reused {cached_count} from cache")
 
-def output_json(objects: Dict[str, Dict[str, Any]], output_file: str = None):
-    """Output objects as JSON."""
-    results = []
-
-    for key in sorted(objects.keys()):
-        obj = objects[key]
-
-        results.append({
-            'schema': obj['schema'],
-            'object_name': obj['object_name'],
-            'object_type': obj['object_type'],
-            'last_update_file': obj['last_update_file'],
-            'last_update_line': obj['last_update_line'],
-            'last_update_source': obj.get('last_update_source', 'migration'),
-            'total_updates': len(obj['all_updates']),
-            'all_updates': obj['all_updates']  # Now includes 'source' field for each update
-        })
-
-    output = json.dumps(results, indent=2)
+    return all_objects
 
+# Output formats: name -> file extension ('md' is accepted as an alias for markdown)
+OUTPUT_FORMATS = {'json': 'json', 'csv': 'csv', 'markdown': 'md', 'html': 'html', 'sqlite': 'sqlite'}
+DEFAULT_SQLITE_FILE = 'db-objects.sqlite'
+
+SQLITE_SCHEMA = '''
+create table object
+(
+    object_id             integer primary key,
+    schema                text    not null,
+    object_name           text    not null,
+    object_type           text    not null,
+    last_update_file      text    not null,
+    last_update_line      integer not null,
+    last_update_operation text    not null,
+    last_update_source    text    not null,
+    total_updates         integer not null
+);
+
+create table object_update
+(
+    object_id integer not null references object (object_id),
+    seq       integer not null,
+    file      text    not null,
+    line      integer not null,
+    operation text    not null,
+    source    text    not null,
+    primary key (object_id, seq)
+) without rowid;
+
+create index ix_object_name on object (object_name, schema);
+create index ix_object_schema_name on object (schema, object_name);
+create index ix_object_update_file on object_update (file, line);
+'''
+
+@contextmanager
+def open_output(output_file: Optional[str] = None, newline: Optional[str] = None):
+    """Yield a writable text stream for output_file, or stdout when no file is given."""
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(output)
+        with open(output_file, 'w', encoding='utf-8', newline=newline) as f:
+            yield f
         print(f"Output saved to: {output_file}")
     else:
-        print(output)
+        yield sys.stdout
+        sys.stdout.write('\n')
+
+def output_json(objects: Dict[str, Dict[str, Any]], output_file: str = None):
+    """Output objects as JSON, streaming one object at a time."""
+    with open_output(output_file) as f:
+        if not objects:
+            f.write('[]')
+            return
+
+        f.write('[')
+        for index, key in enumerate(sorted(objects.keys())):
+            obj = objects[key]
+
+            item = json.dumps({
+                'schema': obj['schema'],
+                'object_name': obj['object_name'],
+                'object_type': obj['object_type'],
+                'last_update_file': obj['last_update_file'],
+                'last_update_line': obj['last_update_line'],
+                'last_update_source': obj.get('last_update_source', 'migration'),
+                'total_updates': len(obj['all_updates']),
+                'all_updates': obj['all_updates']  # Now includes 'source' field for each update
+            }, indent=2)
+
+            # Same layout as json.dumps(list, indent=2): items nested one level deeper
+            f.write(',\n  ' if index else '\n  ')
+            f.write(item.replace('\n', '\n  '))
+        f.write('\n]')
 
 def output_csv(objects: Dict[str, Dict[str, Any]], output_file: str = None):
-    """Output objects as CSV."""
-    results = []
+    """Output objects as CSV, streaming one row at a time."""
+    fieldnames = ['Schema', 'ObjectName', 'ObjectType', 'LastUpdateFile', 'LastUpdateLine',
+                  'TotalUpdates', 'LastUpdateSource', 'AllUpdates']
 
-    for key in sorted(objects.keys()):
-        obj = objects[key]
-        # Include source in each update entry
-        all_updates_str = "; ".join([f"{u['file']}:{u['line']}:{u['operation']}({u.get('source', 'migration')})" for u in obj['all_updates']])
-
-        # Use the last update source from the object
-        last_source = obj.get('last_update_source', 'migration')
-        last_source_display = 'Ad-hoc' if last_source == 'ad-hoc' else 'Migration'
-
-        results.append({
-            'Schema': obj['schema'],
-            'ObjectName': obj['object_name'],
-            'ObjectType': obj['object_type'],
-            'LastUpdateFile': obj['last_update_file'],
-            'LastUpdateLine': obj['last_update_line'],
-            'TotalUpdates': len(obj['all_updates']),
-            'LastUpdateSource': last_source_display,
-            'AllUpdates': all_updates_str
-        })
+    with open_output(output_file, newline='') as f:
+        if not objects:
+            return
 
-    if output_file:
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            if results:
-                writer = csv.DictWriter(f, fieldnames=results[0].keys())
-                writer.writeheader()
-                writer.writerows(results)
-        print(f"Output saved to: {output_file}")
-    else:
-        if results:
-            writer = csv.DictWriter(sys.stdout, fieldnames=results[0].keys())
-            writer.writeheader()
-            writer.writerows(results)
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+
+        for key in sorted(objects.keys()):
+            obj = objects[key]
+            # Include source in each update entry
+            all_updates_str = "; ".join([f"{u['file']}:{u['line']}:{u['operation']}({u.get('source', 'migration')})" for u in obj['all_updates']])
+
+            # Use the last update source from the object
+            last_source = obj.get('last_update_source', 'migration')
+            last_source_display = 'Ad-hoc' if last_source == 'ad-hoc' else 'Migration'
+
+            writer.writerow({
+                'Schema': obj['schema'],
+                'ObjectName': obj['object_name'],
+                'ObjectType': obj['object_type'],
+                'LastUpdateFile': obj['last_update_file'],
+                'LastUpdateLine': obj['last_update_line'],
+                'TotalUpdates': len(obj['all_updates']),
+                'LastUpdateSource': last_source_display,
+                'AllUpdates': all_updates_str
+            })
 
 def escape_markdown(text: str) -> str:
     """Escape special markdown characters in text."""
@@ -275,11 +1116,10 @@ def escape_markdown(text: str) -> str:
 
 def output_markdown(objects: Dict[str, Dict[str, Any]], output_file: str = None):
     """Output objects as Markdown."""
-    lines = [
-        "# Database Objects Tracking\n",
-        "| Schema | Object Name | Type | Last File | Line | Updates | Migration Updates | Ad-hoc Updates |",
-        "|--------|-------------|------|-----------|------|---------|------------------|----------------|"
-    ]
+    out = io.StringIO()
+    out.write("# Database Objects Tracking\n\n"
+              "| Schema | Object Name | Type | Last File | Line | Updates | Migration Updates | Ad-hoc Updates |\n"
+              "|--------|-------------|------|-----------|------|---------|------------------|----------------|")
 
     for key in sorted(objects.keys()):
         obj = objects[key]
@@ -308,8 +1148,8 @@ def output_markdown(objects: Dict[str, Dict[str, Any]], output_file: str = None)
         object_name_escaped = escape_markdown(obj['object_name'])
         last_file_escaped = escape_markdown(obj['last_update_file'])
 
-        lines.append(
-            f"| {schema_escaped} | {object_name_escaped} | {obj['object_type']} | "
+        out.write(
+            f"\n| {schema_escaped} | {object_name_escaped} | {obj['object_type']} | "
             f"{last_file_escaped} | {obj['last_update_line']} | "
             f"{len(obj['all_updates'])} | {migration_updates_str} | {adhoc_updates_str} |"
         )
@@ -335,27 +1175,17 @@ def output_markdown(objects: Dict[str, Dict[str, Any]], output_file: str = None)
             else:
                 migration_updates += 1
 
-    summary_lines = [
-        "\n## Summary",
-        f"- **Total Objects**: {total_objects}",
-        f"- **By Type**: {', '.join([f'{k}: {v}' for k, v in sorted(by_type.items())])}",
-        f"- **By Schema**: {', '.join([f'{k}: {v}' for k, v in sorted(by_schema.items())])}"
-    ]
+    out.write("\n\n## Summary")
+    out.write(f"\n- **Total Objects**: {total_objects}")
+    out.write(f"\n- **By Type**: {', '.join([f'{k}: {v}' for k, v in sorted(by_type.items())])}")
+    out.write(f"\n- **By Schema**: {', '.join([f'{k}: {v}' for k, v in sorted(by_schema.items())])}")
 
     # Add update type summary if there are ad-hoc scripts
     if adhoc_updates > 0:
-        summary_lines.append(f"- **Updates**: {migration_updates} migration, {adhoc_updates} ad-hoc")
+        out.write(f"\n- **Updates**: {migration_updates} migration, {adhoc_updates} ad-hoc")
 
-    lines.extend(summary_lines)
-
-    output = '\n'.join(lines)
-
-    if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(output)
-        print(f"Output saved to: {output_file}")
-    else:
-        print(output)
+    with open_output(output_file) as f:
+        f.write(out.getvalue())
 
 def output_html(objects: Dict[str, Dict[str, Any]], output_file: str = None, use_template: bool = True):
     """Output objects as HTML table using template if available."""
@@ -423,10 +1253,9 @@ def output_html(objects: Dict[str, Dict[str, Any]], output_file: str = None, use
         }}
         """
 
-        # Replace the loadData function in the template
-        import re
+        # Replace the loadData function in the template (callable replacement: the JSON may contain backslashes)
         pattern = r'function loadData\(\) \{[^}]*// For now, using empty array[^}]*\}'
-        output = re.sub(pattern, js_injection.strip(), template_content)
+        output = re.sub(pattern, lambda _: js_injection.strip(), template_content)
 
         # If pattern didn't match, try simpler replacement
         if '// <!-- DATA_PLACEHOLDER -->' in output:
@@ -438,42 +1267,44 @@ def output_html(objects: Dict[str, Dict[str, Any]], output_file: str = None, use
         if use_template:
             print("Template not found, using fallback HTML generation")
 
-        html_parts = ['<!DOCTYPE html>', '<html lang="en">', '<head>',
-                     '    <meta charset="UTF-8">',
-                     '    <meta name="viewport" content="width=device-width, initial-scale=1.0">',
-                     '    <title>Database Objects Tracking</title>',
-                     '    <style>',
-                     '        body { font-family: Arial, sans-serif; margin: 20px; }',
-                     '        h1 { color: #333; }',
-                     '        h2 { color: #555; margin-top: 30px; }',
-                     '        table { border-collapse: collapse; width: 100%; margin-top: 20px; }',
-                     '        th { background-color: #4CAF50; color: white; padding: 12px; text-align: left; border: 1px solid #ddd; }',
-                     '        td { padding: 8px; text-align: left; border: 1px solid #ddd; }',
-                     '        tr:nth-child(even) { background-color: #f2f2f2; }',
-                     '        tr:hover { background-color: #e8f4e8; }',
-                     '        .summary { margin-top: 30px; padding: 20px; background-color: #f9f9f9; border-left: 4px solid #4CAF50; }',
-                     '        .summary ul { list-style-type: none; padding-left: 0; }',
-                     '        .summary li { margin: 10px 0; }',
-                     '        .update-list { max-height: 100px; overflow-y: auto; font-size: 0.9em; }',
-                     '        .update-item { margin: 2px 0; }',
-                     '    </style>',
-                     '</head>',
-                     '<body>',
-                     '    <h1>Database Objects Tracking</h1>',
-                     '    <table>',
-                     '        <thead>',
-                     '            <tr>',
-                     '                <th>Schema</th>',
-                     '                <th>Object Name</th>',
-                     '                <th>Type</th>',
-                     '                <th>Last File</th>',
-                     '                <th>Line</th>',
-                     '                <th>Updates</th>',
-                     '                <th>Migration Updates</th>',
-                     '                <th>Ad-hoc Updates</th>',
-                     '            </tr>',
-                     '        </thead>',
-                     '        <tbody>']
+        out = io.StringIO()
+        out.write('\n'.join([
+            '<!DOCTYPE html>', '<html lang="en">', '<head>',
+            '    <meta charset="UTF-8">',
+            '    <meta name="viewport" content="width=device-width, initial-scale=1.0">',
+            '    <title>Database Objects Tracking</title>',
+            '    <style>',
+            '        body { font-family: Arial, sans-serif; margin: 20px; }',
+            '        h1 { color: #333; }',
+            '        h2 { color: #555; margin-top: 30px; }',
+            '        table { border-collapse: collapse; width: 100%; margin-top: 20px; }',
+            '        th { background-color: #4CAF50; color: white; padding: 12px; text-align: left; border: 1px solid #ddd; }',
+            '        td { padding: 8px; text-align: left; border: 1px solid #ddd; }',
+            '        tr:nth-child(even) { background-color: #f2f2f2; }',
+            '        tr:hover { background-color: #e8f4e8; }',
+            '        .summary { margin-top: 30px; padding: 20px; background-color: #f9f9f9; border-left: 4px solid #4CAF50; }',
+            '        .summary ul { list-style-type: none; padding-left: 0; }',
+            '        .summary li { margin: 10px 0; }',
+            '        .update-list { max-height: 100px; overflow-y: auto; font-size: 0.9em; }',
+            '        .update-item { margin: 2px 0; }',
+            '    </style>',
+            '</head>',
+            '<body>',
+            '    <h1>Database Objects Tracking</h1>',
+            '    <table>',
+            '        <thead>',
+            '            <tr>',
+            '                <th>Schema</th>',
+            '                <th>Object Name</th>',
+            '                <th>Type</th>',
+            '                <th>Last File</th>',
+            '                <th>Line</th>',
+            '                <th>Updates</th>',
+            '                <th>Migration Updates</th>',
+            '                <th>Ad-hoc Updates</th>',
+            '            </tr>',
+            '        </thead>',
+            '        <tbody>']))
 
         for key in sorted(objects.keys()):
             obj = objects[key]
@@ -497,37 +1328,125 @@ def output_html(objects: Dict[str, Dict[str, Any]], output_file: str = None, use
             migration_updates_html = '<br>'.join(migration_updates) if migration_updates else '-'
             adhoc_updates_html = '<br>'.join(adhoc_updates) if adhoc_updates else '-'
 
-            html_parts.extend([
-                '            <tr>',
-                f'                <td>{obj["schema"]}</td>',
-                f'                <td>{obj["object_name"]}</td>',
-                f'                <td>{obj["object_type"]}</td>',
-                f'                <td>{obj["last_update_file"]}</td>',
-                f'                <td>{obj["last_update_line"]}</td>',
-                f'                <td>{len(obj["all_updates"])}</td>',
-                f'                <td>{migration_updates_html}</td>',
-                f'                <td>{adhoc_updates_html}</td>',
-                '            </tr>'
-            ])
-
-        html_parts.extend(['        </tbody>', '    </table>', '</body>', '</html>'])
-        output = '\n'.join(html_parts)
-
-    if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(output)
-        print(f"Output saved to: {output_file}")
-    else:
-        print(output)
+            out.write(
+                '\n            <tr>'
+                f'\n                <td>{obj["schema"]}</td>'
+                f'\n                <td>{obj["object_name"]}</td>'
+                f'\n                <td>{obj["object_type"]}</td>'
+                f'\n                <td>{obj["last_update_file"]}</td>'
+                f'\n                <td>{obj["last_update_line"]}</td>'
+                f'\n                <td>{len(obj["all_updates"])}</td>'
+                f'\n                <td>{migration_updates_html}</td>'
+                f'\n                <td>{adhoc_updates_html}</td>'
+                '\n            </tr>'
+            )
+
+        out.write('\n        </tbody>\n    </table>\n</body>\n</html>')
+        output = out.getvalue()
+
+    with open_output(output_file) as f:
+        f.write(output)
+
+def output_sqlite(objects: Dict[str, Dict[str, Any]], output_file: str = None):
+    """Output objects and their update history as an indexed SQLite database."""
+    output_file = output_file or DEFAULT_SQLITE_FILE
+    tmp_file = f"{output_file}.tmp"
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    # Build into a temp file and swap it in, so readers never see a half-written index
+    connection = sqlite3.connect(tmp_file)
+    try:
+        connection.execute('pragma journal_mode = off')
+        connection.execute('pragma synchronous = off')
+        connection.executescript(SQLITE_SCHEMA)
+
+        with connection:
+            for object_id, key in enumerate(sorted(objects.keys()), 1):
+                obj = objects[key]
+                connection.execute(
+                    'insert into object values (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (object_id, obj['schema'], obj['object_name'], obj['object_type'],
+                     obj['last_update_file'], obj['last_update_line'], obj.get('last_update_operation', ''),
+                     obj.get('last_update_source', 'migration'), len(obj['all_updates'])))
+                connection.executemany(
+                    'insert into object_update values (?, ?, ?, ?, ?, ?)',
+                    [(object_id, seq, u['file'], u['line'], u['operation'], u.get('source', 'migration'))
+                     for seq, u in enumerate(obj['all_updates'], 1)])
+
+        connection.execute('analyze')
+    finally:
+        connection.close()
+
+    os.replace(tmp_file, output_file)
+    print(f"Output saved to: {output_file}")
+
+def parse_formats(formats_str: str) -> List[str]:
+    """Parse a comma/semicolon separated format list ('md' is an alias for markdown)."""
+    formats = []
+    for fmt in re.split(r'[,;]', formats_str):
+        fmt = fmt.strip().lower()
+        if fmt == 'md':
+            fmt = 'markdown'
+        if not fmt:
+            continue
+        if fmt not in OUTPUT_FORMATS:
+            raise argparse.ArgumentTypeError(
+                f"invalid format '{fmt}' (choose from json, csv, markdown/md, html, sqlite)")
+        if fmt not in formats:
+            formats.append(fmt)
+
+    if not formats:
+        raise argparse.ArgumentTypeError('at least one format is required')
+    return formats
+
+def format_output_file(output: Optional[str], fmt: str, multiple: bool) -> Optional[str]:
+    """
+    Resolve the output file for one format.
+
+    Only a known format extension (.json, .md, .csv, ...) counts as an extension; any
+    other --output, dotted or not (db-objects, dump.v2), is a base path and gets the
+    format's own extension, so debee can pass the same base for one format or several.
+    A single format with a known extension writes to --output as given. With several
+    formats a known extension is stripped and each format's own is added.
+    """
+    if not output:
+        return output
+
+    base, extension = os.path.splitext(output)
+    if extension.lstrip('.').lower() not in set(OUTPUT_FORMATS.values()) | set(OUTPUT_FORMATS):
+        base, extension = output, ''
+    if not multiple and extension:
+        return output
+    return f"{base}.{OUTPUT_FORMATS[fmt]}"
 
 def main():
     parser = argparse.ArgumentParser(description='Extract database objects from SQL migration files')
-    parser.add_argument('--format', choices=['json', 'csv', 'markdown', 'html'], default='json',
-                      help='Output format (default: json)')
-    parser.add_argument('--output', help='Output file (default: stdout)')
+    parser.add_argument('--format', type=parse_formats, default=['json'],
+                      help='Output format(s), comma separated: json, csv, markdown (md), html, sqlite (default: json). '
+                           'All formats are written from a single parse')
+    parser.add_argument('--output', help='Output file (default: stdout). Without a known format extension, or with '
+                                         'several formats, this is the base path and each format adds its own extension')
+    parser.add_argument('--cache-file', default=DEFAULT_CACHE_FILE,
+                      help=f'Parse cache file (default: {DEFAULT_CACHE_FILE})')
+    parser.add_argument('--no-cache', action='store_true',
+                      help='Re-parse every file and do not read or write the parse cache')
+    parser.add_argument('--graph-json', help='Also write the object dependency graph as JSON to this file')
+    parser.add_argument('--graph-dot', help='Also write the object dependency graph as Graphviz DOT to this file')
+    parser.add_argument('--drift-check', action='store_true',
+                      help='Compare function/view definitions with the live database (PG* env vars) '
+                           'and write a redeploy bundle for drifted objects only')
+    parser.add_argument('--drift-output', default='drift-redeploy.sql',
+                      help='Redeploy bundle written by --drift-check (default: drift-redeploy.sql)')
+    parser.add_argument('--database', default=os.environ.get('DBDESTDB'),
+                      help='Database for --drift-check (default: DBDESTDB, then PGDATABASE)')
 
     args = parser.parse_args()
 
+    if args.drift_check:
+        drifted = check_catalog_drift(extract_definitions(get_sql_files()), args.drift_output, args.database)
+        sys.exit(2 if drifted is None else int(drifted))
+
     # Show configuration
     adhoc_dir = os.environ.get('DBADHOCDIRECTORY', '')
     if adhoc_dir:
@@ -538,7 +1457,7 @@ def main():
     else:
         print("Ad-hoc directory: not configured (set DBADHOCDIRECTORY to include ad-hoc scripts)")
 
-    objects = process_files()
+    objects = process_files(None if args.no_cache else args.cache_file)
 
     print(f"\nFound {len(objects)} database objects")
 
@@ -552,15 +1471,19 @@ def main():
     for obj_type, count in sorted(by_type.items()):
         print(f"  {obj_type}: {count}")
 
-    # Generate output
-    if args.format == 'json':
-        output_json(objects, args.output)
-    elif args.format == 'csv':
-        output_csv(objects, args.output)
-    elif args.format == 'markdown':
-        output_markdown(objects, args.output)
-    elif args.format == 'html':
-        output_html(objects, args.output)
+    # Generate output, every requested format from the same parse
+    writers = {'json': output_json, 'csv': output_csv, 'markdown': output_markdown, 'html': output_html,
+               'sqlite': output_sqlite}
+    for fmt in args.format:
+        writers[fmt](objects, format_output_file(args.output, fmt, len(args.format) > 1))
+
+    if args.graph_json or args.graph_dot:
+        graph = build_dependency_graph(extract_definitions(get_sql_files()))
+        print(f"\nDependency graph: {len(graph['nodes'])} nodes, {len(graph['edges'])} edges")
+        if args.graph_json:
+            output_graph_json(graph, args.graph_json)
+        if args.graph_dot:
+            output_graph_dot(graph, args.graph_dot)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,9 +1,32 @@
-"""Generate SQL INSERT statements from the Material Design Icons directory tree."""
+"""Generate SQL INSERT statements (or a COPY stream) from the Material Design Icons directory tree.
+
+    python gen_icons_inserts.py                      # 999-examples-icons-data.sql
+    python gen_icons_inserts.py --copy               # 999-examples-icons-data.tsv (used by 999-examples-icons.sql)
+    python gen_icons_inserts.py --source D:/icons --source D:/more --workers 16
+
+Incremental sync of an already loaded tree:
+
+    python gen_icons_inserts.py --snapshot icons.snapshot             # full output + snapshot
+    python gen_icons_inserts.py --snapshot icons.snapshot --incremental --out icons-delta.sql
+    ./debee.ps1 -Operations execSql -SqlFile icons-delta.sql
+
+The incremental run diffs the tree against the snapshot of the previous run by ltree,
+writes only the new (insert ... on conflict do nothing), changed (update of display_path,
+kind and name, e.g. a rename 'a-b' -> 'a_b' or a file replaced by a folder) and removed
+(delete) paths, and replaces the snapshot with the current tree.
+"""
+import argparse
+import json
 import os
 import re
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-BASE = 'C:/Git/KM/pure-admin-icons/.cache/icons/material/material-design-icons-master'
-OUT  = '999-examples-icons-data.sql'
+BASE     = os.environ.get('ICONS_BASE', 'C:/Git/KM/pure-admin-icons/.cache/icons/material/material-design-icons-master')
+OUT      = '999-examples-icons-data.sql'
+OUT_COPY = '999-examples-icons-data.tsv'
+BATCH    = 500
 
 
 def path_to_ltree(p: str) -> str:
@@ -20,43 +43,264 @@ def path_to_ltree(p: str) -> str:
     return '.'.join(out)
 
 
-def main():
-    rows = []
-    for root, dirs, files in os.walk(BASE):
-        root_n = root.replace(os.sep, '/')
-        rel_root = root_n[len(BASE) + 1:] if len(root_n) > len(BASE) else ''
-        for d in sorted(dirs):
-            rel = d if not rel_root else rel_root + '/' + d
-            rows.append((rel, 'folder', d))
-        for f in sorted(files):
-            rel = f if not rel_root else rel_root + '/' + f
-            rows.append((rel, 'file', f))
-
-    def sqlesc(s: str) -> str:
-        return s.replace("'", "''")
-
-    with open(OUT, 'w', encoding='utf-8') as fh:
-        fh.write('-- Auto-generated from Material Design Icons repository\n')
-        fh.write('-- Regenerate via: python gen_icons_inserts.py\n')
-        fh.write(f'-- Total rows: {len(rows)}\n\n')
-        batch = 500
-        for i in range(0, len(rows), batch):
-            chunk = rows[i:i + batch]
-            tuples = []
-            for rel, kind, name in chunk:
-                lt = path_to_ltree(rel)
-                if not lt:
-                    continue
-                tuples.append(
-                    f"('{lt}'::ext.ltree, '/{sqlesc(rel)}', '{kind}', '{sqlesc(name)}')"
-                )
-            if not tuples:
+def copyesc(s: str) -> str:
+    """Escape a value for COPY text format (tab-separated, backslash escapes)."""
+    return (s.replace('\\', '\\\\').replace('\t', '\\t')
+             .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def sqlesc(s: str) -> str:
+    return s.replace("'", "''")
+
+
+def list_dir(path: str, rel_root: str) -> tuple:
+    """Rows for the direct children of path (folders first, then files, each sorted by name)
+    and the (path, rel) pairs of the subfolders to descend into.
+
+    A folder that cannot be listed raises OSError: an empty result would look like a
+    deleted subtree to --incremental and turn into deletes."""
+    dirs, files = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append(entry)
+
+    dirs.sort(key=lambda e: e.name)
+    files.sort(key=lambda e: e.name)
+    rows, subdirs = [], []
+    for d in dirs:
+        rel = d.name if not rel_root else rel_root + '/' + d.name
+        rows.append((rel, 'folder', d.name))
+        # like os.walk: symlinked folders are listed but not followed
+        if not d.is_symlink():
+            subdirs.append((d.path, rel))
+    for f in files:
+        rel = f.name if not rel_root else rel_root + '/' + f.name
+        rows.append((rel, 'file', f.name))
+    return rows, subdirs
+
+
+def scan_subtree(path: str, rel: str) -> list:
+    """All rows below path, depth-first, in the same order for every run."""
+    rows, subdirs = list_dir(path, rel)
+    for sub_path, sub_rel in subdirs:
+        rows.extend(scan_subtree(sub_path, sub_rel))
+    return rows
+
+
+def scan_sources(sources: list, workers: int):
+    """Yield (rel, kind, name) rows for every source. Top-level subtrees are scanned
+    concurrently; rows are yielded subtree by subtree, in a deterministic order, as soon
+    as the next subtree is done. At most `workers` subtrees are scanned ahead of the one
+    being written, so finished subtrees do not pile up in memory."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for base in sources:
+            rows, subdirs = list_dir(base, '')
+            yield from rows
+            pending = deque()
+            for sub_path, sub_rel in subdirs:
+                pending.append(pool.submit(scan_subtree, sub_path, sub_rel))
+                if len(pending) > workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+def batched(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_inserts(fh, rows) -> int:
+    count = 0
+    for chunk in batched(rows, BATCH):
+        count += len(chunk)
+        tuples = []
+        for rel, kind, name in chunk:
+            lt = path_to_ltree(rel)
+            if not lt:
                 continue
-            fh.write('insert into demo.fs_item (path, display_path, kind, name) values\n')
-            fh.write(',\n'.join(tuples))
-            fh.write('\non conflict (path) do nothing;\n\n')
+            tuples.append(
+                f"('{lt}'::ext.ltree, '/{sqlesc(rel)}', '{kind}', '{sqlesc(name)}')"
+            )
+        if not tuples:
+            continue
+        fh.write('insert into demo.fs_item (path, display_path, kind, name) values\n')
+        fh.write(',\n'.join(tuples))
+        fh.write('\non conflict (path) do nothing;\n\n')
+    return count
+
+
+def write_updates(fh, rows) -> int:
+    count = 0
+    for chunk in batched(rows, BATCH):
+        count += len(chunk)
+        fh.write('update demo.fs_item i\n'
+                 'set display_path = v.display_path, kind = v.kind, name = v.name\n'
+                 'from (values\n')
+        fh.write(',\n'.join(
+            f"('{path_to_ltree(rel)}'::ext.ltree, '/{sqlesc(rel)}', '{kind}', '{sqlesc(name)}')"
+            for rel, kind, name in chunk
+        ))
+        fh.write('\n) v (path, display_path, kind, name)\nwhere i.path = v.path;\n\n')
+    return count
+
+
+def write_deletes(fh, paths) -> int:
+    count = 0
+    for chunk in batched(paths, BATCH):
+        count += len(chunk)
+        fh.write('delete from demo.fs_item where path in (\n')
+        fh.write(',\n'.join(f"'{lt}'::ext.ltree" for lt in chunk))
+        fh.write('\n);\n\n')
+    return count
+
+
+def write_copy(fh, rows) -> int:
+    # Plain COPY text stream: path, display_path, kind, name - no header, no comments,
+    # so it can be fed to `copy ... from stdin` or psql `\copy ... from 'file'` as is.
+    count = 0
+    for rel, kind, name in rows:
+        count += 1
+        lt = path_to_ltree(rel)
+        if not lt:
+            continue
+        fh.write(f'{lt}\t/{copyesc(rel)}\t{kind}\t{copyesc(name)}\n')
+    return count
+
+
+def snapshot_record(row) -> list:
+    """[ltree, display_path, kind] - the values of the loaded demo.fs_item row."""
+    rel, kind = row[0], row[1]
+    return [path_to_ltree(rel), '/' + rel, kind]
+
+
+def read_snapshot(path: str) -> dict:
+    """ltree -> (display_path, kind) of every row the previous run loaded.
+
+    Like the load itself, the first path producing an ltree wins. Snapshots written
+    before the ltree was recorded ([rel, kind] lines) are still read."""
+    previous = {}
+    with open(path, encoding='utf-8') as fh:
+        for record in map(json.loads, fh):
+            if len(record) == 2:
+                record = snapshot_record(record)
+            lt, display_path, kind = record
+            if lt:
+                previous.setdefault(lt, (display_path, kind))
+    return previous
+
+
+def record_snapshot(fh, rows):
+    """Pass rows through while writing each one (one JSON array per line) to fh."""
+    for row in rows:
+        fh.write(json.dumps(snapshot_record(row), ensure_ascii=False) + '\n')
+        yield row
+
+
+def diff_rows(rows, previous: dict, changed: list):
+    """Yield the rows whose ltree is not in the previous snapshot and append to changed the
+    rows whose display_path or kind differ from it. Only the first path producing an ltree
+    counts; what is left in previous afterwards was removed."""
+    seen = set()
+    for row in rows:
+        lt, display_path, kind = snapshot_record(row)
+        if not lt or lt in seen:
+            continue
+        seen.add(lt)
+        before = previous.pop(lt, None)
+        if before is None:
+            yield row
+        elif before != (display_path, kind):
+            changed.append(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', action='append',
+                        help=f'tree to scan, may be repeated (default: $ICONS_BASE or {BASE})')
+    parser.add_argument('--workers', type=int, default=min(32, (os.cpu_count() or 1) * 4),
+                        help='top-level subtrees scanned concurrently (default: %(default)s)')
+    parser.add_argument('--copy', action='store_true',
+                        help=f'write a tab-separated COPY stream (default output: {OUT_COPY}) '
+                             'instead of INSERT statements')
+    parser.add_argument('--out', help=f'output file (default: {OUT}, or {OUT_COPY} with --copy)')
+    parser.add_argument('--snapshot', help='record the scanned tree here for a later --incremental run')
+    parser.add_argument('--incremental', action='store_true',
+                        help='write only the delete/insert delta against --snapshot, then update it')
+    args = parser.parse_args()
+
+    if args.incremental:
+        if not args.snapshot or not os.path.isfile(args.snapshot):
+            parser.error('--incremental needs an existing --snapshot file from a previous run')
+        if args.copy:
+            parser.error('--incremental writes SQL (deletes + inserts) and cannot be combined with --copy')
+
+    sources = [s.replace(os.sep, '/').rstrip('/') for s in (args.source or [BASE])]
+    for source in sources:
+        if not os.path.isdir(source):
+            parser.error(f'source folder not found: {source}')
+
+    out = args.out or (OUT_COPY if args.copy else OUT)
+    rows = scan_sources(sources, max(1, args.workers))
+
+    snapshot_tmp = None
+    snapshot_fh = None
+    if args.snapshot:
+        snapshot_tmp = args.snapshot + '.tmp'
+        snapshot_fh = open(snapshot_tmp, 'w', encoding='utf-8', newline='\n')
+        rows = record_snapshot(snapshot_fh, rows)
+
+    failed = False
+    try:
+        # newline='\n' keeps the output LF-only on Windows (a COPY stream must not carry \r)
+        with open(out, 'w', encoding='utf-8', newline='\n') as fh:
+            if args.copy:
+                count = write_copy(fh, rows)
+            elif args.incremental:
+                previous = read_snapshot(args.snapshot)
+                fh.write('-- Auto-generated delta from Material Design Icons repository\n')
+                fh.write(f'-- Regenerate via: python gen_icons_inserts.py --snapshot {args.snapshot} --incremental\n\n')
+                # Inserts are written while scanning; updates and deletes can only be known afterwards
+                changed = []
+                count = write_inserts(fh, diff_rows(rows, previous, changed))
+                updated = write_updates(fh, changed)
+                deleted = write_deletes(fh, sorted(previous))
+                fh.write(f'-- Inserted rows: {count}, updated rows: {updated}, deleted paths: {deleted}\n')
+            else:
+                fh.write('-- Auto-generated from Material Design Icons repository\n')
+                fh.write('-- Regenerate via: python gen_icons_inserts.py\n\n')
+                count = write_inserts(fh, rows)
+                fh.write(f'-- Total rows: {count}\n')
+    except OSError as e:
+        # An incomplete script (a delta missing a subtree above all) must not be run, and the
+        # snapshot must keep describing what was last loaded
+        failed = True
+        print(f'error: {e.filename}: {e.strerror}; no output written'
+              + (f', {args.snapshot} left unchanged' if args.snapshot else ''), file=sys.stderr)
+    finally:
+        if snapshot_fh:
+            snapshot_fh.close()
+
+    if failed:
+        for path in (out, snapshot_tmp):
+            if path and os.path.exists(path):
+                os.remove(path)
+        sys.exit(1)
+
+    if snapshot_tmp:
+        os.replace(snapshot_tmp, args.snapshot)
 
-    print(f'wrote {len(rows)} rows to {OUT}')
+    print(f'wrote {count} rows to {out}')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Query the SQLite object index written by extract-db-objects.py (--format sqlite).
+
+Examples:
+    python query-db-objects.py object auth.has_resource_access   # where was it last changed + history
+    python query-db-objects.py object has_resource_access        # any schema
+    python query-db-objects.py file 035                          # everything touched by files starting with 035
+    python query-db-objects.py search resource_access --type function
+"""
+
+import re
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+DEFAULT_DB_FILE = 'db-objects.sqlite'
+
+def glob_prefix(text: str) -> str:
+    """Build a GLOB prefix pattern matching text literally (GLOB can use the file index)."""
+    return re.sub(r'([*?\[])', r'[\1]', text) + '*'
+
+def print_rows(headers: List[str], rows: List[Tuple]):
+    """Print rows as an aligned plain-text table."""
+    if not rows:
+        print("No matches")
+        return
+
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    print('  '.join(header.ljust(width) for header, width in zip(headers, widths)).rstrip())
+    print('  '.join('-' * width for width in widths))
+    for row in rows:
+        print('  '.join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip())
+
+def query_object(connection: sqlite3.Connection, name: str, object_type: Optional[str], history: bool):
+    """Show where an object (schema.name or bare name) was last changed, optionally with history."""
+    if '.' in name:
+        schema, object_name = name.split('.', 1)
+        where, params = 'o.schema = ? and o.object_name = ?', [schema, object_name]
+    else:
+        where, params = 'o.object_name = ?', [name]
+
+    if object_type:
+        where += ' and o.object_type = ?'
+        params.append(object_type)
+
+    objects = connection.execute(
+        f'''select o.object_id, o.schema || '.' || o.object_name, o.object_type, o.last_update_file,
+                   o.last_update_line, o.last_update_operation, o.last_update_source, o.total_updates
+            from object o
+            where {where}
+            order by o.schema, o.object_name, o.object_type''', params).fetchall()
+
+    print_rows(['object', 'type', 'last file', 'line', 'operation', 'source', 'updates'],
+               [row[1:] for row in objects])
+
+    if history:
+        for row in objects:
+            print(f"\nHistory of {row[1]} ({row[2]}):")
+            print_rows(['#', 'file', 'line', 'operation', 'source'], connection.execute(
+                '''select seq, file, line, operation, source
+                   from object_update
+                   where object_id = ?
+                   order by seq''', (row[0],)).fetchall())
+
+def query_file(connection: sqlite3.Connection, file_prefix: str, object_type: Optional[str]):
+    """List all objects touched by files whose name starts with file_prefix."""
+    where, params = 'u.file glob ?', [glob_prefix(file_prefix)]
+    if object_type:
+        where += ' and o.object_type = ?'
+        params.append(object_type)
+
+    print_rows(['file', 'line', 'operation', 'object', 'type'], connection.execute(
+        f'''select u.file, u.line, u.operation, o.schema || '.' || o.object_name, o.object_type
+            from object_update u
+                inner join object o on o.object_id = u.object_id
+            where {where}
+            order by u.file, u.line''', params).fetchall())
+
+def query_search(connection: sqlite3.Connection, text: str, object_type: Optional[str]):
+    """Find objects whose qualified name contains text."""
+    where, params = "(o.schema || '.' || o.object_name) like ?", [f'%{text}%']
+    if object_type:
+        where += ' and o.object_type = ?'
+        params.append(object_type)
+
+    print_rows(['object', 'type', 'last file', 'line', 'updates'], connection.execute(
+        f'''select o.schema || '.' || o.object_name, o.object_type, o.last_update_file,
+                   o.last_update_line, o.total_updates
+            from object o
+            where {where}
+            order by o.schema, o.object_name, o.object_type''', params).fetchall())
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the SQLite object index written by extract-db-objects.py')
+    parser.add_argument('--db', default=DEFAULT_DB_FILE, help=f'Index file (default: {DEFAULT_DB_FILE})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    type_filter = argparse.ArgumentParser(add_help=False)
+    type_filter.add_argument('--type', help='Only objects of this type (function, table, index, view, ...)')
+
+    object_parser = subparsers.add_parser('object', parents=[type_filter], help='Where was an object last changed')
+    object_parser.add_argument('name', help='schema.name or bare name')
+    object_parser.add_argument('--no-history', action='store_true', help='Only show the latest change')
+
+    file_parser = subparsers.add_parser('file', parents=[type_filter], help='List all objects touched by a file')
+    file_parser.add_argument('prefix', help='File name or prefix (e.g. 035 or 035_functions_resource_access.sql)')
+
+    search_parser = subparsers.add_parser('search', parents=[type_filter], help='Find objects by name substring')
+    search_parser.add_argument('text', help='Text contained in schema.name')
+
+    args = parser.parse_args()
+
+    if not Path(args.db).is_file():
+        print(f"Index not found: {args.db} (generate it with: python extract-db-objects.py --format sqlite)",
+              file=sys.stderr)
+        return 1
+
+    connection = sqlite3.connect(f'file:{args.db}?mode=ro', uri=True)
+    try:
+        if args.command == 'object':
+            query_object(connection, args.name, args.type, not args.no_history)
+        elif args.command == 'file':
+            query_file(connection, args.prefix, args.type)
+        else:
+            query_search(connection, args.text, args.type)
+    finally:
+        connection.close()
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
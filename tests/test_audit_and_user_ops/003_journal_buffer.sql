@@ -0,0 +1,101 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 11: buffered storage_mode appends journal rows to stage.journal_buffer
+-- ============================================================================
+DO $$
+DECLARE
+    __test_user_id bigint := current_setting('test.audit_user_id')::bigint;
+    __corr_id text := 'audit-test-buffer-' || gen_random_uuid()::text;
+    __returned_id bigint;
+    __returned_count integer;
+    __buffered integer;
+    __stored integer;
+BEGIN
+    RAISE NOTICE 'TEST 11: create_journal_message with storage_mode = buffered writes to the buffer only';
+
+    UPDATE const.sys_param SET text_value = 'buffered'
+    WHERE group_code = 'journal' AND code = 'storage_mode';
+
+    SELECT count(*), max(jm.__journal_id) INTO __returned_count, __returned_id
+    FROM public.create_journal_message('audit_test', __test_user_id, __corr_id, 10001,
+        jsonb_build_object('user', __test_user_id), jsonb_build_object('username', 'audit_test_user')) jm;
+
+    SELECT count(*) INTO __buffered FROM stage.journal_buffer WHERE correlation_id = __corr_id;
+    SELECT count(*) INTO __stored FROM public.journal WHERE correlation_id = __corr_id;
+
+    PERFORM set_config('test.audit_buffer_corr_id', __corr_id, false);
+
+    IF __returned_count = 1 AND __returned_id IS NULL AND __buffered = 1 AND __stored = 0 THEN
+        RAISE NOTICE '  PASS: Row buffered, not yet in journal, returned without journal_id';
+    ELSE
+        RAISE EXCEPTION '  FAIL: returned %/%, buffered %, stored %', __returned_count, __returned_id, __buffered, __stored;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 12: flush_journal_buffer_batch moves buffered rows into journal
+-- ============================================================================
+DO $$
+DECLARE
+    __corr_id text := current_setting('test.audit_buffer_corr_id');
+    __moved integer;
+    __nrm text;
+BEGIN
+    RAISE NOTICE 'TEST 12: flush_journal_buffer_batch moves buffered rows into the journal partitions';
+
+    __moved := unsecure.flush_journal_buffer_batch();
+
+    SELECT j.nrm_search_data INTO __nrm
+    FROM public.journal j
+    WHERE j.correlation_id = __corr_id;
+
+    UPDATE const.sys_param SET text_value = 'local'
+    WHERE group_code = 'journal' AND code = 'storage_mode';
+
+    IF __moved < 1 OR EXISTS (SELECT 1 FROM stage.journal_buffer WHERE correlation_id = __corr_id) THEN
+        RAISE EXCEPTION '  FAIL: Buffer not flushed (moved %)', __moved;
+    END IF;
+
+    IF __nrm LIKE '%audit_test_user%' THEN
+        RAISE NOTICE '  PASS: % row(s) moved, journal row stored with its search data', __moved;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Flushed row missing from journal (nrm_search_data %)', __nrm;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 13: flush_journal_buffer_batch keeps the ids of users/tenants deleted meanwhile
+-- ============================================================================
+DO $$
+DECLARE
+    __corr_id text := 'audit-test-buffer-orphan-' || gen_random_uuid()::text;
+    __user_id bigint := (SELECT coalesce(max(user_id), 0) + 1000 FROM auth.user_info);
+    __tenant_id integer := (SELECT coalesce(max(tenant_id), 0) + 1000 FROM auth.tenant);
+    __row record;
+BEGIN
+    RAISE NOTICE 'TEST 13: flush_journal_buffer_batch keeps the raw ids of users/tenants that no longer exist';
+
+    INSERT INTO stage.journal_buffer (created_by, correlation_id, tenant_id, event_id, user_id, data_payload)
+    VALUES ('audit_test', __corr_id, __tenant_id, 10001, __user_id, jsonb_build_object('username', 'audit_test_orphan'));
+
+    PERFORM unsecure.flush_journal_buffer_batch();
+
+    SELECT j.user_id, j.tenant_id, j.data_payload INTO __row
+    FROM public.journal j
+    WHERE j.correlation_id = __corr_id;
+
+    IF __row.data_payload IS NULL THEN
+        RAISE EXCEPTION '  FAIL: Orphaned row not flushed into journal';
+    END IF;
+
+    IF __row.user_id IS NULL AND __row.tenant_id IS NULL
+        AND (__row.data_payload->>'unresolved_user_id')::bigint = __user_id
+        AND (__row.data_payload->>'unresolved_tenant_id')::integer = __tenant_id
+        AND __row.data_payload->>'username' = 'audit_test_orphan' THEN
+        RAISE NOTICE '  PASS: References nulled, raw ids kept in data_payload (%)', __row.data_payload;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Unexpected journal row (user %, tenant %, payload %)',
+            __row.user_id, __row.tenant_id, __row.data_payload;
+    END IF;
+END $$;
@@ -10,7 +10,7 @@ BEGIN
     RAISE NOTICE 'Audit Events & User Self-Service Ops Tests - COMPLETED SUCCESSFULLY';
     RAISE NOTICE '=================================================================';
     RAISE NOTICE '';
-    RAISE NOTICE 'All 10 tests passed:';
+    RAISE NOTICE 'All 13 tests passed:';
     RAISE NOTICE '  1.  create_user_event stores an audit event';
     RAISE NOTICE '  2.  create_user_event stores request_context and event_data';
     RAISE NOTICE '  3.  get_user_audit_trail returns events for a target user';
@@ -21,6 +21,9 @@ BEGIN
     RAISE NOTICE '  8.  update_user_preferences merges jsonb preferences';
     RAISE NOTICE '  9.  get_user_preferences returns stored preferences';
     RAISE NOTICE '  10. update_user_last_selected_tenant sets tenant';
+    RAISE NOTICE '  11. buffered storage_mode writes to stage.journal_buffer';
+    RAISE NOTICE '  12. flush_journal_buffer_batch moves rows into journal';
+    RAISE NOTICE '  13. flush_journal_buffer_batch keeps ids of deleted users/tenants';
     RAISE NOTICE '';
     RAISE NOTICE 'CLEANUP: Transaction rollback will handle data cleanup';
 END $$;
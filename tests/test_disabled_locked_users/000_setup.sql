@@ -31,12 +31,12 @@ BEGIN
     PERFORM set_config('test.lock_user_id', __test_user_id2::text, false);
 
     -- Pre-populate cache manually (simulating a cached session)
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __test_user_id, 1, t.uuid, ARRAY['test_group'], ARRAY['areas.public'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __test_user_id, 1, t.uuid, ARRAY['test_group'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1;
 
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __test_user_id2, 1, t.uuid, ARRAY['test_group'], ARRAY['areas.public'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __test_user_id2, 1, t.uuid, ARRAY['test_group'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1;
 
     RAISE NOTICE 'Pre-populated permission cache for both users';
@@ -14,8 +14,8 @@ BEGIN
     SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
 
     -- Insert cache entry
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY['test'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1
     ON CONFLICT (user_id, tenant_id) DO UPDATE SET expiration_date = now() + interval '1 hour';
 
@@ -47,8 +47,8 @@ BEGIN
     SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
 
     -- Populate cache
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY['test'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1
     ON CONFLICT (user_id, tenant_id) DO UPDATE SET expiration_date = now() + interval '1 hour';
 
@@ -89,8 +89,8 @@ BEGIN
     FROM unsecure.assign_permission('test', 1, null, null, __user_id, null, 'cache_test_perm', 1);
 
     -- Populate cache
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY['test'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1
     ON CONFLICT (user_id, tenant_id) DO UPDATE SET expiration_date = now() + interval '1 hour';
 
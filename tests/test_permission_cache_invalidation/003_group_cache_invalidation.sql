@@ -17,8 +17,8 @@ BEGIN
     SELECT user_group_id INTO __group_id FROM auth.user_group WHERE code = 'cache_test_group';
 
     -- Populate cache with valid expiration
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY['test'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1
     ON CONFLICT (user_id, tenant_id) DO UPDATE SET expiration_date = now() + interval '1 hour';
 
@@ -66,8 +66,8 @@ BEGIN
     FROM unsecure.assign_permission('test', 1, null, __group_id, null, null, 'cache_test_perm', 1);
 
     -- Populate cache with valid expiration
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY['test'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1
     ON CONFLICT (user_id, tenant_id) DO UPDATE SET expiration_date = now() + interval '1 hour';
 
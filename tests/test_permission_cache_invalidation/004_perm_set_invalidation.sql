@@ -1,19 +1,26 @@
 set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
 
 -- ============================================================================
--- TEST 9: create_perm_set_permissions invalidates affected users cache (soft invalidation)
+-- TEST 9: create_perm_set_permissions patches affected users cache in place (perm_cache_incremental_patch on)
 -- ============================================================================
 DO $$
 DECLARE
     __user_id bigint;
     __perm_set_id int;
-    __valid_before int;
+    __permission_id int;
+    __permission_ids int[];
     __valid_after int;
 BEGIN
-    RAISE NOTICE 'TEST 9: create_perm_set_permissions invalidates affected users cache';
+    RAISE NOTICE 'TEST 9: create_perm_set_permissions merges added permissions into affected users cache';
 
     SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
     SELECT perm_set_id INTO __perm_set_id FROM auth.perm_set WHERE code = 'cache_test_perm_set' AND tenant_id = 1;
+    SELECT permission_id INTO __permission_id FROM auth.permission WHERE code = 'cache_test_perm';
+
+    -- Incremental patching is opt-in
+    INSERT INTO const.sys_param (created_by, updated_by, group_code, code, bool_value)
+    VALUES ('test', 'test', 'auth', 'perm_cache_incremental_patch', true)
+    ON CONFLICT (group_code, code) DO UPDATE SET bool_value = true;
 
     -- Assign perm_set to user
     INSERT INTO auth.permission_assignment (created_by, tenant_id, user_id, perm_set_id)
@@ -21,26 +28,26 @@ BEGIN
     ON CONFLICT DO NOTHING;
 
     -- Populate cache with valid expiration
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY['test'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1
-    ON CONFLICT (user_id, tenant_id) DO UPDATE SET expiration_date = now() + interval '1 hour';
-
-    -- Count valid cache entries
-    SELECT count(*) INTO __valid_before FROM auth.user_permission_cache
-    WHERE user_id = __user_id AND tenant_id = 1 AND expiration_date > now();
+    ON CONFLICT (user_id, tenant_id) DO UPDATE SET permission_ids = ARRAY[1], expiration_date = now() + interval '1 hour';
 
-    -- Add permission to perm_set (triggers soft invalidation)
+    -- Add permission to perm_set (patches the cache instead of invalidating it)
     PERFORM unsecure.create_perm_set_permissions('test', 1, null, __perm_set_id, ARRAY['cache_test_perm'], 1);
 
-    -- Count valid cache entries after
     SELECT count(*) INTO __valid_after FROM auth.user_permission_cache
     WHERE user_id = __user_id AND tenant_id = 1 AND expiration_date > now();
 
-    IF __valid_before > 0 AND __valid_after = 0 THEN
-        RAISE NOTICE '  PASS: Perm set users cache soft-invalidated on add (valid: % -> %)', __valid_before, __valid_after;
+    SELECT permission_ids INTO __permission_ids FROM auth.user_permission_cache
+    WHERE user_id = __user_id AND tenant_id = 1;
+
+    DELETE FROM const.sys_param WHERE group_code = 'auth' AND code = 'perm_cache_incremental_patch';
+
+    IF __valid_after = 1 AND __permission_ids @> ARRAY[1, __permission_id] THEN
+        RAISE NOTICE '  PASS: Cache kept valid and patched with the added permission (ids: %)', __permission_ids;
     ELSE
-        RAISE EXCEPTION '  FAIL: Perm set users cache not invalidated (valid: % -> %)', __valid_before, __valid_after;
+        RAISE EXCEPTION '  FAIL: Cache not patched (valid: %, ids: %)', __valid_after, __permission_ids;
     END IF;
 END $$;
 
@@ -60,8 +67,8 @@ BEGIN
     SELECT perm_set_id INTO __perm_set_id FROM auth.perm_set WHERE code = 'cache_test_perm_set' AND tenant_id = 1;
 
     -- Populate cache with valid expiration
-    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permissions, expiration_date)
-    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY['test'], now() + interval '1 hour'
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() + interval '1 hour'
     FROM auth.tenant t WHERE t.tenant_id = 1
     ON CONFLICT (user_id, tenant_id) DO UPDATE SET expiration_date = now() + interval '1 hour';
 
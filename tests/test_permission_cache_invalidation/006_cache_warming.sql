@@ -0,0 +1,70 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 13: refresh_expiring_permission_cache refreshes recently requested rows
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id bigint;
+    __claimed int;
+    __requested_at timestamptz := now() - interval '5 minutes';
+BEGIN
+    RAISE NOTICE 'TEST 13: refresh_expiring_permission_cache refreshes a row about to expire';
+
+    SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
+
+    PERFORM unsecure.recalculate_user_permissions('test', __user_id, 1);
+
+    UPDATE auth.user_permission_cache
+    SET expiration_date = now() + interval '10 seconds',
+        last_requested_at = __requested_at
+    WHERE user_id = __user_id AND tenant_id = 1;
+
+    __claimed := unsecure.refresh_expiring_permission_cache('test_warm', 1000);
+
+    IF __claimed < 1 THEN
+        RAISE EXCEPTION '  FAIL: Expected at least one claimed user, got %', __claimed;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user_id AND tenant_id = 1
+          AND expiration_date > now() + interval '10 seconds'
+          AND last_requested_at = __requested_at
+    ) THEN
+        RAISE NOTICE '  PASS: Row refreshed ahead of expiry, activity marker kept';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Row not refreshed or last_requested_at changed by warming';
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 14: refresh_expiring_permission_cache skips users not active recently
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id bigint;
+BEGIN
+    RAISE NOTICE 'TEST 14: refresh_expiring_permission_cache skips rows outside the active window';
+
+    SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
+
+    UPDATE auth.user_permission_cache
+    SET expiration_date = now() + interval '10 seconds',
+        last_requested_at = now() - interval '2 days'
+    WHERE user_id = __user_id AND tenant_id = 1;
+
+    PERFORM unsecure.refresh_expiring_permission_cache('test_warm', 1000);
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user_id AND tenant_id = 1
+          AND expiration_date = now() + interval '10 seconds'
+    ) THEN
+        RAISE NOTICE '  PASS: Inactive user''s row left to expire';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Row of an inactive user was refreshed';
+    END IF;
+
+    DELETE FROM auth.user_permission_cache WHERE user_id = __user_id;
+END $$;
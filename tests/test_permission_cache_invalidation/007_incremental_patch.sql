@@ -0,0 +1,89 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 15: perm_cache_incremental_patch unset (default) or false falls back to invalidation
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id bigint;
+    __perm_set_id int;
+    __valid_after int;
+    __flag boolean;
+BEGIN
+    RAISE NOTICE 'TEST 15: create_perm_set_permissions invalidates by default and when incremental patching is off';
+
+    SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
+    SELECT perm_set_id INTO __perm_set_id FROM auth.perm_set WHERE code = 'cache_test_perm_set' AND tenant_id = 1;
+
+    -- null: no sys_param row (the default)
+    FOREACH __flag IN ARRAY ARRAY[null, false]::boolean[]
+    LOOP
+        DELETE FROM const.sys_param WHERE group_code = 'auth' AND code = 'perm_cache_incremental_patch';
+
+        IF __flag IS NOT NULL THEN
+            INSERT INTO const.sys_param (created_by, updated_by, group_code, code, bool_value)
+            VALUES ('test', 'test', 'auth', 'perm_cache_incremental_patch', __flag);
+        END IF;
+
+        INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+        SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() + interval '1 hour'
+        FROM auth.tenant t WHERE t.tenant_id = 1
+        ON CONFLICT (user_id, tenant_id) DO UPDATE SET permission_ids = ARRAY[1], expiration_date = now() + interval '1 hour';
+
+        PERFORM unsecure.create_perm_set_permissions('test', 1, null, __perm_set_id, ARRAY['cache_test_perm'], 1);
+
+        SELECT count(*) INTO __valid_after FROM auth.user_permission_cache
+        WHERE user_id = __user_id AND tenant_id = 1 AND expiration_date > now();
+
+        IF __valid_after = 0 THEN
+            RAISE NOTICE '  PASS: Cache soft-invalidated instead of patched (perm_cache_incremental_patch = %)', coalesce(__flag::text, 'unset');
+        ELSE
+            RAISE EXCEPTION '  FAIL: Cache still valid with perm_cache_incremental_patch = %', coalesce(__flag::text, 'unset');
+        END IF;
+
+        PERFORM unsecure.delete_perm_set_permissions('test', 1, null, __perm_set_id, ARRAY['cache_test_perm'], 1);
+    END LOOP;
+
+    -- Cleanup
+    DELETE FROM const.sys_param WHERE group_code = 'auth' AND code = 'perm_cache_incremental_patch';
+END $$;
+
+-- ============================================================================
+-- TEST 16: expired cache rows are not patched
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id bigint;
+    __perm_set_id int;
+    __permission_ids int[];
+BEGIN
+    RAISE NOTICE 'TEST 16: create_perm_set_permissions leaves expired cache rows to recalculation';
+
+    SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
+    SELECT perm_set_id INTO __perm_set_id FROM auth.perm_set WHERE code = 'cache_test_perm_set' AND tenant_id = 1;
+
+    INSERT INTO const.sys_param (created_by, updated_by, group_code, code, bool_value)
+    VALUES ('test', 'test', 'auth', 'perm_cache_incremental_patch', true)
+    ON CONFLICT (group_code, code) DO UPDATE SET bool_value = true;
+
+    INSERT INTO auth.user_permission_cache (created_by, user_id, tenant_id, tenant_uuid, groups, permission_ids, expiration_date)
+    SELECT 'test', __user_id, 1, t.uuid, ARRAY['test'], ARRAY[1], now() - interval '1 minute'
+    FROM auth.tenant t WHERE t.tenant_id = 1
+    ON CONFLICT (user_id, tenant_id) DO UPDATE SET permission_ids = ARRAY[1], expiration_date = now() - interval '1 minute';
+
+    PERFORM unsecure.create_perm_set_permissions('test', 1, null, __perm_set_id, ARRAY['cache_test_perm'], 1);
+
+    SELECT permission_ids INTO __permission_ids FROM auth.user_permission_cache
+    WHERE user_id = __user_id AND tenant_id = 1;
+
+    IF __permission_ids = ARRAY[1] THEN
+        RAISE NOTICE '  PASS: Expired row left untouched';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expired row was patched (ids: %)', __permission_ids;
+    END IF;
+
+    -- Cleanup
+    DELETE FROM const.sys_param WHERE group_code = 'auth' AND code = 'perm_cache_incremental_patch';
+    PERFORM unsecure.delete_perm_set_permissions('test', 1, null, __perm_set_id, ARRAY['cache_test_perm'], 1);
+    DELETE FROM auth.user_permission_cache WHERE user_id = __user_id AND tenant_id = 1;
+END $$;
@@ -0,0 +1,75 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 17: recalculate_permissions_for_users matches the per-user recalculation
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id bigint;
+    __groups text[];
+    __permission_ids int[];
+    __written int;
+BEGIN
+    RAISE NOTICE 'TEST 17: recalculate_permissions_for_users writes the same cache rows as recalculate_user_permissions';
+
+    SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
+
+    PERFORM unsecure.recalculate_user_permissions('test', __user_id, null);
+
+    SELECT groups, permission_ids INTO __groups, __permission_ids
+    FROM auth.user_permission_cache
+    WHERE user_id = __user_id AND tenant_id = 1;
+
+    UPDATE auth.user_permission_cache
+    SET groups = '{}', permission_ids = '{}', expiration_date = now()
+    WHERE user_id = __user_id;
+
+    -- Unknown users are skipped
+    __written := unsecure.recalculate_permissions_for_users('test', ARRAY[__user_id, -42]);
+
+    IF __written >= 1 AND EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user_id AND tenant_id = 1
+          AND groups = __groups
+          AND permission_ids = __permission_ids
+          AND expiration_date > now()
+    ) THEN
+        RAISE NOTICE '  PASS: Bulk recalculation restored the cache row (% rows written)', __written;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Bulk recalculation differs from per-user result (% rows written)', __written;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 18: perm_cache_eager_recalc recalculates invalidated rows right away
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id bigint;
+    __group_id int;
+BEGIN
+    RAISE NOTICE 'TEST 18: invalidate_group_members_permission_cache recalculates eagerly when enabled';
+
+    SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
+    SELECT user_group_id INTO __group_id FROM auth.user_group WHERE code = 'cache_test_group';
+
+    INSERT INTO const.sys_param (created_by, updated_by, group_code, code, bool_value)
+    VALUES ('test', 'test', 'auth', 'perm_cache_eager_recalc', true)
+    ON CONFLICT (group_code, code) DO UPDATE SET bool_value = true;
+
+    PERFORM unsecure.recalculate_user_permissions('test', __user_id, null);
+    PERFORM unsecure.invalidate_group_members_permission_cache('test', __group_id, 1);
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user_id AND tenant_id = 1 AND expiration_date > now()
+    ) THEN
+        RAISE NOTICE '  PASS: Cache row recalculated instead of left expired';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Cache row left expired in eager mode';
+    END IF;
+
+    -- Cleanup
+    DELETE FROM const.sys_param WHERE group_code = 'auth' AND code = 'perm_cache_eager_recalc';
+    DELETE FROM auth.user_permission_cache WHERE user_id = __user_id;
+END $$;
@@ -0,0 +1,87 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 19: closure tables match auth.effective_permissions and the ltree expansion
+-- ============================================================================
+DO $$
+DECLARE
+    __missing int;
+    __extra int;
+BEGIN
+    RAISE NOTICE 'TEST 19: perm_set_closure / permission_closure match the ltree-based expansion';
+
+    SELECT count(*) INTO __missing FROM (
+        (SELECT ep.perm_set_id, ep.permission_id
+         FROM auth.effective_permissions ep
+         WHERE ep.perm_set_is_assignable AND ep.permission_is_assignable
+         EXCEPT
+         SELECT psc.perm_set_id, psc.permission_id FROM auth.perm_set_closure psc)
+        UNION ALL
+        (SELECT p.permission_id, sp.permission_id
+         FROM auth.permission p
+         INNER JOIN auth.permission sp ON sp.node_path <@ p.node_path AND sp.is_assignable
+         EXCEPT
+         SELECT pc.assigned_permission_id, pc.permission_id FROM auth.permission_closure pc)) m;
+
+    SELECT count(*) INTO __extra FROM (
+        SELECT psc.perm_set_id, psc.permission_id FROM auth.perm_set_closure psc
+        EXCEPT
+        SELECT ep.perm_set_id, ep.permission_id
+        FROM auth.effective_permissions ep
+        WHERE ep.perm_set_is_assignable AND ep.permission_is_assignable) e;
+
+    IF __missing = 0 AND __extra = 0 THEN
+        RAISE NOTICE '  PASS: Closure tables are in sync';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Closure tables out of sync (missing: %, extra: %)', __missing, __extra;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 20: closure follows permission and perm set changes
+-- ============================================================================
+DO $$
+DECLARE
+    __perm_set_id int;
+    __permission_id int;
+    __child_id int;
+BEGIN
+    RAISE NOTICE 'TEST 20: closure tables follow new permissions, perm_set_perm and is_assignable changes';
+
+    SELECT perm_set_id INTO __perm_set_id FROM auth.perm_set WHERE code = 'cache_test_perm_set' AND tenant_id = 1;
+    SELECT permission_id INTO __permission_id FROM auth.permission WHERE code = 'cache_test_perm';
+
+    INSERT INTO auth.perm_set_perm (created_by, perm_set_id, permission_id)
+    VALUES ('test', __perm_set_id, __permission_id)
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO auth.permission (created_by, updated_by, code, full_code, node_path, is_assignable)
+    VALUES ('test', 'test', 'cache_test_perm_child', 'cache_test_perm.cache_test_perm_child'::ltree, '999.1'::ltree, true)
+    RETURNING permission_id INTO __child_id;
+
+    IF NOT EXISTS (SELECT 1 FROM auth.permission_closure
+                   WHERE assigned_permission_id = __permission_id AND permission_id = __child_id)
+       OR NOT EXISTS (SELECT 1 FROM auth.perm_set_closure
+                      WHERE perm_set_id = __perm_set_id AND permission_id = __child_id) THEN
+        RAISE EXCEPTION '  FAIL: New child permission not expanded for its parent and the perm set';
+    END IF;
+
+    UPDATE auth.perm_set SET is_assignable = false WHERE perm_set_id = __perm_set_id;
+
+    IF EXISTS (SELECT 1 FROM auth.perm_set_closure WHERE perm_set_id = __perm_set_id) THEN
+        RAISE EXCEPTION '  FAIL: Non-assignable perm set still grants permissions';
+    END IF;
+
+    UPDATE auth.perm_set SET is_assignable = true WHERE perm_set_id = __perm_set_id;
+    DELETE FROM auth.permission WHERE permission_id = __child_id;
+
+    IF EXISTS (SELECT 1 FROM auth.perm_set_closure WHERE perm_set_id = __perm_set_id AND permission_id = __child_id)
+       OR NOT EXISTS (SELECT 1 FROM auth.perm_set_closure WHERE perm_set_id = __perm_set_id AND permission_id = __permission_id) THEN
+        RAISE EXCEPTION '  FAIL: Perm set closure wrong after re-enabling the set and deleting the child';
+    END IF;
+
+    RAISE NOTICE '  PASS: Closure tables follow the changes';
+
+    -- Cleanup
+    DELETE FROM auth.perm_set_perm WHERE perm_set_id = __perm_set_id AND permission_id = __permission_id;
+END $$;
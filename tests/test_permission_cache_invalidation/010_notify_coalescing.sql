@@ -0,0 +1,57 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 21: perm_change_notify_coalesce queues notifications once per target
+-- ============================================================================
+DO $$
+DECLARE
+    __queued int;
+    __markers int;
+    __sent int;
+BEGIN
+    RAISE NOTICE 'TEST 21: notify_permission_change queues and de-duplicates per transaction when coalescing';
+
+    INSERT INTO const.sys_param (created_by, updated_by, group_code, code, bool_value)
+    VALUES ('test', 'test', 'auth', 'perm_change_notify_coalesce', true)
+    ON CONFLICT (group_code, code) DO UPDATE SET bool_value = true;
+
+    -- Same user twice (different detail), two more users, one group event
+    PERFORM unsecure.notify_permission_change('group_member_added', 1, 'user', -101, jsonb_build_object('group_id', 1));
+    PERFORM unsecure.notify_permission_change('group_member_added', 1, 'user', -101, jsonb_build_object('group_id', 2));
+    PERFORM unsecure.notify_permission_change('group_member_added', 1, 'user', -102, jsonb_build_object('group_id', 1));
+    PERFORM unsecure.notify_permission_change('group_member_added', 1, 'user', -103, jsonb_build_object('group_id', 1));
+    PERFORM unsecure.notify_permission_change('group_disabled', 1, 'group', -201, null);
+
+    SELECT count(*), count(*) FILTER (WHERE is_flush_marker)
+    INTO __queued, __markers
+    FROM stage.permission_change_queue
+    WHERE transaction_id = txid_current();
+
+    IF __queued <> 4 OR __markers <> 1 THEN
+        RAISE EXCEPTION '  FAIL: Expected 4 queued rows with 1 flush marker, got % / %', __queued, __markers;
+    END IF;
+
+    -- What the deferred trigger runs at commit: one batch for the users, one single-target notification
+    __sent := unsecure.flush_permission_change_queue();
+
+    IF __sent <> 2 OR EXISTS (SELECT 1 FROM stage.permission_change_queue WHERE transaction_id = txid_current()) THEN
+        RAISE EXCEPTION '  FAIL: Expected 2 notifications and an empty queue, sent %', __sent;
+    END IF;
+
+    -- A change queued after the flush arms a new marker
+    PERFORM unsecure.notify_permission_change('group_member_added', 1, 'user', -101, null);
+
+    IF EXISTS (
+        SELECT 1 FROM stage.permission_change_queue
+        WHERE transaction_id = txid_current() AND target_id = -101 AND is_flush_marker
+    ) THEN
+        RAISE NOTICE '  PASS: 5 changes queued as 4, sent as 2 notifications, queue re-armed after flush';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Change queued after the flush is not a flush marker';
+    END IF;
+
+    PERFORM unsecure.flush_permission_change_queue();
+
+    UPDATE const.sys_param SET bool_value = false
+    WHERE group_code = 'auth' AND code = 'perm_change_notify_coalesce';
+END $$;
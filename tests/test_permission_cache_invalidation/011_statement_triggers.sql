@@ -0,0 +1,141 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 22: bulk membership changes invalidate every member's caches
+-- ============================================================================
+DO $$
+DECLARE
+    __group_id int;
+    __user_ids bigint[];
+BEGIN
+    RAISE NOTICE 'TEST 22: statement-level member triggers invalidate all users of a bulk insert/delete';
+
+    SELECT user_group_id INTO __group_id FROM auth.user_group WHERE code = 'cache_test_group';
+
+    WITH created AS (
+        INSERT INTO auth.user_info (created_by, updated_by, user_type_code, username, original_username, display_name, email)
+        SELECT 'test', 'test', 'normal', 'cache_bulk_user_' || i, 'cache_bulk_user_' || i, 'Cache Bulk User ' || i,
+               'cache_bulk_' || i || '@test.com'
+        FROM generate_series(1, 3) i
+        RETURNING user_id
+    )
+    SELECT array_agg(user_id) INTO __user_ids FROM created;
+
+    INSERT INTO auth.user_group_id_cache (created_by, updated_by, user_id, tenant_id, group_ids, expiration_date)
+    SELECT 'test', 'test', u, 1, '{}', now() + interval '1 hour'
+    FROM unnest(__user_ids) u;
+
+    -- One statement for all three members
+    INSERT INTO auth.user_group_member (created_by, user_group_id, user_id, member_type_code)
+    SELECT 'test', __group_id, u, 'manual'
+    FROM unnest(__user_ids) u;
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_group_id_cache
+        WHERE user_id = ANY (__user_ids) AND expiration_date > now()
+    ) THEN
+        RAISE EXCEPTION '  FAIL: Group ID cache still valid after bulk insert';
+    END IF;
+
+    INSERT INTO auth.user_permission_cache (created_by, updated_by, user_id, tenant_id, tenant_uuid, expiration_date)
+    SELECT 'test', 'test', u, 1, t.uuid, now() + interval '1 hour'
+    FROM unnest(__user_ids) u
+             CROSS JOIN auth.tenant t
+    WHERE t.tenant_id = 1;
+
+    DELETE FROM auth.user_group_member
+    WHERE user_group_id = __group_id AND user_id = ANY (__user_ids);
+
+    IF EXISTS (SELECT 1 FROM auth.user_permission_cache WHERE user_id = ANY (__user_ids)) THEN
+        RAISE EXCEPTION '  FAIL: Permission cache left after bulk delete';
+    END IF;
+
+    RAISE NOTICE '  PASS: Bulk insert and delete invalidated the caches of all 3 members';
+
+    DELETE FROM auth.user_info WHERE user_id = ANY (__user_ids);
+END $$;
+
+-- ============================================================================
+-- TEST 23: perm set closure follows a multi-row perm_set_perm insert
+-- ============================================================================
+DO $$
+DECLARE
+    __perm_set_id int;
+    __permission_ids int[];
+BEGIN
+    RAISE NOTICE 'TEST 23: statement-level closure trigger covers every row of a bulk perm_set_perm insert';
+
+    SELECT perm_set_id INTO __perm_set_id FROM auth.perm_set WHERE code = 'cache_test_perm_set' AND tenant_id = 1;
+
+    SELECT array_agg(p.permission_id) INTO __permission_ids
+    FROM (SELECT permission_id FROM auth.permission
+          WHERE is_assignable
+            AND permission_id NOT IN (SELECT permission_id FROM auth.perm_set_perm WHERE perm_set_id = __perm_set_id)
+          ORDER BY permission_id
+          LIMIT 3) p;
+
+    INSERT INTO auth.perm_set_perm (created_by, perm_set_id, permission_id)
+    SELECT 'test', __perm_set_id, pid
+    FROM unnest(__permission_ids) pid;
+
+    IF (SELECT count(*) FROM auth.perm_set_closure
+        WHERE perm_set_id = __perm_set_id AND permission_id = ANY (__permission_ids)) = cardinality(__permission_ids) THEN
+        RAISE NOTICE '  PASS: Closure holds all % permissions inserted in one statement', cardinality(__permission_ids);
+    ELSE
+        RAISE EXCEPTION '  FAIL: Closure misses permissions of the bulk insert';
+    END IF;
+
+    DELETE FROM auth.perm_set_perm
+    WHERE perm_set_id = __perm_set_id AND permission_id = ANY (__permission_ids);
+END $$;
+
+-- ============================================================================
+-- TEST 26: permission closure follows multi-row permission inserts, moves and deletes
+-- ============================================================================
+DO $$
+DECLARE
+    __ids int[];
+    __expected text[];
+    __actual text[];
+BEGIN
+    RAISE NOTICE 'TEST 26: statement-level permission closure trigger covers bulk inserts, moves and deletes';
+
+    WITH inserted AS (
+        INSERT INTO auth.permission (created_by, updated_by, code, full_code, node_path, is_assignable)
+        VALUES ('test', 'test', 'cache_bulk_root', 'cache_bulk_root'::ltree, '996'::ltree, true),
+               ('test', 'test', 'cache_bulk_a', 'cache_bulk_root.cache_bulk_a'::ltree, '996.1'::ltree, true),
+               ('test', 'test', 'cache_bulk_b', 'cache_bulk_root.cache_bulk_b'::ltree, '996.2'::ltree, false),
+               ('test', 'test', 'cache_bulk_c', 'cache_bulk_c'::ltree, '995'::ltree, true)
+        RETURNING permission_id)
+    SELECT array_agg(permission_id ORDER BY permission_id) INTO __ids FROM inserted;
+
+    -- One statement: b becomes assignable and a moves under c
+    UPDATE auth.permission
+    SET is_assignable = CASE WHEN code = 'cache_bulk_b' THEN true ELSE is_assignable END,
+        node_path = CASE WHEN code = 'cache_bulk_a' THEN '995.1'::ltree ELSE node_path END
+    WHERE code IN ('cache_bulk_a', 'cache_bulk_b');
+
+    SELECT array_agg(p.permission_id || '>' || sp.permission_id ORDER BY p.permission_id, sp.permission_id)
+    INTO __expected
+    FROM auth.permission p
+             INNER JOIN auth.permission sp ON sp.node_path <@ p.node_path AND sp.is_assignable
+    WHERE p.permission_id = ANY (__ids) OR sp.permission_id = ANY (__ids);
+
+    SELECT array_agg(pc.assigned_permission_id || '>' || pc.permission_id ORDER BY pc.assigned_permission_id, pc.permission_id)
+    INTO __actual
+    FROM auth.permission_closure pc
+    WHERE pc.assigned_permission_id = ANY (__ids) OR pc.permission_id = ANY (__ids);
+
+    IF __actual IS DISTINCT FROM __expected THEN
+        RAISE EXCEPTION '  FAIL: Closure % differs from the ltree expansion %', __actual, __expected;
+    END IF;
+
+    DELETE FROM auth.permission WHERE permission_id = ANY (__ids);
+
+    IF EXISTS (SELECT 1 FROM auth.permission_closure
+               WHERE assigned_permission_id = ANY (__ids) OR permission_id = ANY (__ids)) THEN
+        RAISE EXCEPTION '  FAIL: Closure rows of deleted permissions left behind';
+    END IF;
+
+    RAISE NOTICE '  PASS: Closure matches the ltree expansion after bulk insert and update, and is empty after delete';
+END $$;
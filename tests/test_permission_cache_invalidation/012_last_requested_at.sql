@@ -0,0 +1,79 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 24: cache hits do not write last_requested_at
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id bigint;
+    __requested_at timestamptz := now() - interval '1 hour';
+BEGIN
+    RAISE NOTICE 'TEST 24: has_permission / has_permissions_bulk cache hits leave the cache row unwritten';
+
+    SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
+
+    PERFORM unsecure.recalculate_user_permissions('test', __user_id, 1);
+
+    UPDATE auth.user_permission_cache
+    SET last_requested_at = __requested_at
+    WHERE user_id = __user_id AND tenant_id = 1;
+
+    PERFORM auth.has_permission(__user_id, 'cache-corr-024', 'cache_test_perm', 1, false);
+    PERFORM auth.has_permissions_bulk(ARRAY[__user_id], 'cache-corr-024', ARRAY['cache_test_perm'], 1);
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user_id AND tenant_id = 1
+          AND last_requested_at = __requested_at
+    ) THEN
+        RAISE NOTICE '  PASS: Cache hits did not write last_requested_at';
+    ELSE
+        RAISE EXCEPTION '  FAIL: A cache hit rewrote last_requested_at';
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 25: a cache miss marks the row as requested
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id bigint;
+BEGIN
+    RAISE NOTICE 'TEST 25: has_permission / has_permissions_bulk misses stamp last_requested_at';
+
+    SELECT user_id INTO __user_id FROM auth.user_info WHERE username = 'cache_test_user';
+
+    UPDATE auth.user_permission_cache
+    SET last_requested_at = now() - interval '1 hour',
+        expiration_date = now() - interval '1 second'
+    WHERE user_id = __user_id AND tenant_id = 1;
+
+    PERFORM auth.has_permission(__user_id, 'cache-corr-025', 'cache_test_perm', 1, false);
+
+    IF NOT EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user_id AND tenant_id = 1
+          AND last_requested_at = now()
+    ) THEN
+        RAISE EXCEPTION '  FAIL: has_permission miss did not stamp last_requested_at';
+    END IF;
+
+    UPDATE auth.user_permission_cache
+    SET last_requested_at = now() - interval '1 hour',
+        expiration_date = now() - interval '1 second'
+    WHERE user_id = __user_id AND tenant_id = 1;
+
+    PERFORM auth.has_permissions_bulk(ARRAY[__user_id], 'cache-corr-025', ARRAY['cache_test_perm'], 1);
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user_id AND tenant_id = 1
+          AND last_requested_at = now()
+    ) THEN
+        RAISE NOTICE '  PASS: Recalculation on a miss marked the row as requested';
+    ELSE
+        RAISE EXCEPTION '  FAIL: has_permissions_bulk miss did not stamp last_requested_at';
+    END IF;
+
+    DELETE FROM auth.user_permission_cache WHERE user_id = __user_id;
+END $$;
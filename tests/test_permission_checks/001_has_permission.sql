@@ -168,3 +168,73 @@ BEGIN
         END IF;
     END;
 END $$;
+
+-- ============================================================================
+-- TEST 15: has_permissions — cached permission ids, unknown/malformed codes
+-- ============================================================================
+DO $$
+DECLARE
+    __user1_id bigint;
+    __result boolean;
+BEGIN
+    RAISE NOTICE 'TEST 15: has_permissions — served from cached permission ids, unknown codes ignored';
+
+    __user1_id := current_setting('pchk.user1_id')::bigint;
+
+    -- Clear cache, first call recalculates, second is served from the cache row
+    PERFORM unsecure.clear_permission_cache('pchk_test', __user1_id, 1);
+    PERFORM auth.has_permission(__user1_id, 'pchk-corr-008', 'pchk_test_perm_a', 1, false);
+
+    IF NOT EXISTS (
+        SELECT 1 FROM auth.user_permission_cache upc
+        WHERE upc.user_id = __user1_id AND upc.tenant_id = 1
+          AND upc.permission_ids @> internal.get_permission_ids(ARRAY['pchk_test_perm_a', 'pchk_test_perm_b'])
+    ) THEN
+        RAISE EXCEPTION '  FAIL: Cache row does not hold the ids of pchk_test_perm_a / pchk_test_perm_b';
+    END IF;
+
+    SELECT auth.has_permissions(__user1_id, 'pchk-corr-008', ARRAY['not a valid ltree!', 'pchk_test_perm_b'], 1, false) INTO __result;
+
+    IF NOT __result THEN
+        RAISE EXCEPTION '  FAIL: Cached check should pass when any requested code is held';
+    END IF;
+
+    SELECT auth.has_permissions(__user1_id, 'pchk-corr-008', ARRAY['not a valid ltree!', 'pchk_no_such_perm'], 1, false) INTO __result;
+
+    IF __result THEN
+        RAISE EXCEPTION '  FAIL: Unknown codes should not grant access';
+    END IF;
+
+    RAISE NOTICE '  PASS: Cached id check grants held codes and ignores unknown/malformed ones';
+END $$;
+
+-- ============================================================================
+-- TEST 16: has_permissions — missing cache row, granted by the same call
+-- ============================================================================
+DO $$
+DECLARE
+    __user1_id bigint;
+    __result boolean;
+BEGIN
+    RAISE NOTICE 'TEST 16: has_permissions — grants from the recalculation when the cache row is missing';
+
+    __user1_id := current_setting('pchk.user1_id')::bigint;
+
+    -- No cache row at all: the single call below has to recalculate and grant from the result
+    DELETE FROM auth.user_permission_cache WHERE user_id = __user1_id AND tenant_id = 1;
+
+    SELECT auth.has_permissions(__user1_id, 'pchk-corr-016', ARRAY['pchk_test_perm_a'], 1, false) INTO __result;
+
+    IF NOT __result THEN
+        RAISE EXCEPTION '  FAIL: First check after the cache row was deleted should be granted';
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM auth.user_permission_cache upc
+        WHERE upc.user_id = __user1_id AND upc.tenant_id = 1 AND upc.expiration_date > now()
+    ) THEN
+        RAISE EXCEPTION '  FAIL: Recalculation should have written a fresh cache row';
+    END IF;
+
+    RAISE NOTICE '  PASS: Missing cache row recalculated and granted in one has_permissions call';
+END $$;
@@ -0,0 +1,133 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 1: has_permissions_bulk — user x code matrix in input order
+-- ============================================================================
+DO $$
+DECLARE
+    __user1_id bigint;
+    __user2_id bigint;
+    __matrix text[];
+BEGIN
+    RAISE NOTICE 'TEST 1: has_permissions_bulk — matrix for system, granted, denied and unknown users';
+
+    __user1_id := current_setting('pchk.user1_id')::bigint;
+    __user2_id := current_setting('pchk.user2_id')::bigint;
+
+    -- Expired entries are recalculated by the bulk call itself
+    PERFORM unsecure.clear_permission_cache('pchk_test', __user1_id, 1);
+    PERFORM unsecure.clear_permission_cache('pchk_test', __user2_id, 1);
+
+    SELECT array_agg(b.__user_id || ':' || b.__code || ':' || b.__granted)
+    INTO __matrix
+    FROM auth.has_permissions_bulk(
+        ARRAY[__user1_id, __user2_id, 1, -42],
+        'pchk-bulk-001',
+        ARRAY['pchk_test_perm_b', 'pchk_no_such_perm'],
+        1) b;
+
+    IF __matrix = ARRAY[
+        __user1_id || ':pchk_test_perm_b:true',  __user1_id || ':pchk_no_such_perm:false',
+        __user2_id || ':pchk_test_perm_b:false', __user2_id || ':pchk_no_such_perm:false',
+        '1:pchk_test_perm_b:true',               '1:pchk_no_such_perm:true',
+        '-42:pchk_test_perm_b:false',            '-42:pchk_no_such_perm:false'] THEN
+        RAISE NOTICE '  PASS: Matrix matches has_permission per pair, in input order';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Unexpected matrix %', __matrix;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user1_id AND tenant_id = 1 AND expiration_date > now()
+    ) THEN
+        RAISE NOTICE '  PASS: Expired cache entry was recalculated';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Cache entry for user1 was not recalculated';
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 2: has_permissions_bulk — locked user is denied, no exception
+-- ============================================================================
+DO $$
+DECLARE
+    __user1_id bigint;
+    __granted boolean;
+BEGIN
+    RAISE NOTICE 'TEST 2: has_permissions_bulk — locked user denied without raising';
+
+    __user1_id := current_setting('pchk.user1_id')::bigint;
+
+    UPDATE auth.user_info SET is_locked = true WHERE user_id = __user1_id;
+
+    SELECT b.__granted INTO __granted
+    FROM auth.has_permissions_bulk(ARRAY[__user1_id], 'pchk-bulk-002', ARRAY['pchk_test_perm_a'], 1) b;
+
+    UPDATE auth.user_info SET is_locked = false WHERE user_id = __user1_id;
+
+    IF __granted = false THEN
+        RAISE NOTICE '  PASS: Locked user reported as not granted';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Locked user should not be granted (got %)', __granted;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 3: has_permissions_bulk — missing cache rows refreshed in one call
+-- ============================================================================
+DO $$
+DECLARE
+    __user1_id bigint;
+    __user2_id bigint;
+    __granted boolean[];
+BEGIN
+    RAISE NOTICE 'TEST 3: has_permissions_bulk — users without a cache row are refreshed together and granted';
+
+    __user1_id := current_setting('pchk.user1_id')::bigint;
+    __user2_id := current_setting('pchk.user2_id')::bigint;
+
+    DELETE FROM auth.user_permission_cache WHERE user_id IN (__user1_id, __user2_id) AND tenant_id = 1;
+
+    SELECT array_agg(b.__granted)
+    INTO __granted
+    FROM auth.has_permissions_bulk(ARRAY[__user1_id, __user2_id], 'pchk-bulk-003', ARRAY['pchk_test_perm_a'], 1) b;
+
+    IF __granted = ARRAY[true, false] THEN
+        RAISE NOTICE '  PASS: Missing cache rows recalculated before the evaluation';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expected {t,f} after refreshing missing cache rows, got %', __granted;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 4: has_permissions_bulk — user whose last provider was removed
+-- ============================================================================
+DO $$
+DECLARE
+    __user1_id bigint;
+    __user2_id bigint;
+    __provider_code text;
+    __granted boolean[];
+BEGIN
+    RAISE NOTICE 'TEST 4: has_permissions_bulk — a removed last_used_provider_code does not abort the batch';
+
+    __user1_id := current_setting('pchk.user1_id')::bigint;
+    __user2_id := current_setting('pchk.user2_id')::bigint;
+
+    SELECT last_used_provider_code INTO __provider_code FROM auth.user_info WHERE user_id = __user1_id;
+
+    UPDATE auth.user_info SET last_used_provider_code = 'pchk_removed_provider' WHERE user_id = __user1_id;
+    DELETE FROM auth.user_permission_cache WHERE user_id IN (__user1_id, __user2_id) AND tenant_id = 1;
+
+    SELECT array_agg(b.__granted)
+    INTO __granted
+    FROM auth.has_permissions_bulk(ARRAY[__user1_id, __user2_id], 'pchk-bulk-004', ARRAY['pchk_test_perm_a'], 1) b;
+
+    UPDATE auth.user_info SET last_used_provider_code = __provider_code WHERE user_id = __user1_id;
+
+    IF __granted = ARRAY[true, false] THEN
+        RAISE NOTICE '  PASS: Group sync skipped for the removed provider, permissions still refreshed';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expected {t,f} for a user with a removed provider, got %', __granted;
+    END IF;
+END $$;
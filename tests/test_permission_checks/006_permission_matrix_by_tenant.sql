@@ -0,0 +1,86 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 1: get_permission_matrix_by_tenant — granted codes per tenant
+-- ============================================================================
+DO $$
+DECLARE
+    __user1_id bigint;
+    __has boolean;
+    __codes text[];
+BEGIN
+    RAISE NOTICE 'TEST 1: get_permission_matrix_by_tenant — user with perm_set in tenant 1';
+
+    __user1_id := current_setting('pchk.user1_id')::bigint;
+
+    -- Expired cache: the call rebuilds all tenants at once
+    PERFORM unsecure.clear_permission_cache('pchk_test', __user1_id);
+
+    SELECT m.__has_permissions, m.__granted_codes INTO __has, __codes
+    FROM auth.get_permission_matrix_by_tenant(__user1_id, 'pchk-matrix-001', __user1_id,
+                                              ARRAY['pchk_no_such_perm', 'pchk_test_perm_b', 'pchk_test_perm_a']) m
+    WHERE m.__tenant_id = 1;
+
+    IF __has AND __codes = ARRAY['pchk_test_perm_b', 'pchk_test_perm_a'] THEN
+        RAISE NOTICE '  PASS: Tenant 1 grants perm_b and perm_a (input order kept, unknown code skipped)';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expected tenant 1 with {pchk_test_perm_b,pchk_test_perm_a}, got % / %', __has, __codes;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_permission_cache
+        WHERE user_id = __user1_id AND tenant_id = 1 AND expiration_date > now()
+    ) THEN
+        RAISE NOTICE '  PASS: Cache rebuilt by the matrix call';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Cache for tenant 1 was not rebuilt';
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 2: get_permission_matrix_by_tenant — user without permissions
+-- ============================================================================
+DO $$
+DECLARE
+    __user2_id bigint;
+BEGIN
+    RAISE NOTICE 'TEST 2: get_permission_matrix_by_tenant — user without permissions gets no grants';
+
+    __user2_id := current_setting('pchk.user2_id')::bigint;
+
+    IF EXISTS (
+        SELECT 1
+        FROM auth.get_permission_matrix_by_tenant(__user2_id, 'pchk-matrix-002', __user2_id,
+                                                  ARRAY['pchk_test_perm_a', 'pchk_test_perm_b']) m
+        WHERE m.__has_permissions OR cardinality(m.__granted_codes) > 0
+    ) THEN
+        RAISE EXCEPTION '  FAIL: User without permissions reported a granted tenant';
+    ELSE
+        RAISE NOTICE '  PASS: No tenant grants the permissions';
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 3: get_permission_matrix_by_tenant — other user's matrix needs permission
+-- ============================================================================
+DO $$
+DECLARE
+    __user1_id bigint;
+    __user2_id bigint;
+BEGIN
+    RAISE NOTICE 'TEST 3: get_permission_matrix_by_tenant — reading another user requires users.get_available_tenants';
+
+    __user1_id := current_setting('pchk.user1_id')::bigint;
+    __user2_id := current_setting('pchk.user2_id')::bigint;
+
+    BEGIN
+        PERFORM auth.get_permission_matrix_by_tenant(__user2_id, 'pchk-matrix-003', __user1_id, ARRAY['pchk_test_perm_a']);
+        RAISE EXCEPTION '  FAIL: Expected exception was not thrown';
+    EXCEPTION WHEN OTHERS THEN
+        IF SQLERRM LIKE '%52109%' OR SQLERRM LIKE '%permission%' OR SQLSTATE = 'P0001' THEN
+            RAISE NOTICE '  PASS: Permission denied for another user''s matrix';
+        ELSE
+            RAISE EXCEPTION '  FAIL: Unexpected exception: % (state: %)', SQLERRM, SQLSTATE;
+        END IF;
+    END;
+END $$;
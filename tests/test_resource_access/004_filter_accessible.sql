@@ -123,3 +123,28 @@ BEGIN
         RAISE EXCEPTION '  FAIL: Expected all 5 resources, got %', __result;
     END IF;
 END $$;
+
+-- ============================================================================
+-- TEST 5: Filter keeps input order and duplicates
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_2 bigint;
+    __result jsonb[];
+BEGIN
+    RAISE NOTICE 'TEST 5: Filter keeps input order and duplicate ids';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_2' INTO __user_id_2;
+
+    SELECT array_agg(__resource_id)
+    FROM auth.filter_accessible_resources(__user_id_2, 'test-corr-filter-5', 'document',
+        array['{"id": 1004}'::jsonb, '{"id": 1001}'::jsonb, '{"id": 1002}'::jsonb, '{"id": 1001}'::jsonb, '{"id": 1005}'::jsonb],
+        'read')
+    INTO __result;
+
+    IF __result = array['{"id": 1004}'::jsonb, '{"id": 1001}'::jsonb, '{"id": 1001}'::jsonb] THEN
+        RAISE NOTICE '  PASS: Input order and duplicates kept (%)', __result;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expected {{"id":1004},{"id":1001},{"id":1001}}, got %', __result;
+    END IF;
+END $$;
@@ -0,0 +1,143 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 1: Resource access cache populated on first check
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_1 bigint;
+    __user_id_2 bigint;
+    __flags text[];
+BEGIN
+    RAISE NOTICE 'TEST 1: Resource access cache populated on first check';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_1' INTO __user_id_1;
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_2' INTO __user_id_2;
+
+    INSERT INTO const.sys_param (created_by, updated_by, group_code, code, bool_value)
+    VALUES ('test', 'test', 'auth', 'resource_access_cache_enabled', true)
+    ON CONFLICT (group_code, code) DO UPDATE SET bool_value = true;
+
+    PERFORM auth.assign_resource_access('test', __user_id_1, 'test-corr-racache-1a', 'document', '{"id": 7001}'::jsonb,
+        _target_user_id := __user_id_2, _access_flags := array['read', 'write']);
+
+    IF NOT auth.has_resource_access(__user_id_2, 'test-corr-racache-1b', 'document', '{"id": 7001}'::jsonb, 'read') THEN
+        RAISE EXCEPTION '  FAIL: Granted read flag denied';
+    END IF;
+
+    SELECT access_flags FROM auth.user_resource_access_cache
+    WHERE user_id = __user_id_2 AND tenant_id = 1 AND resource_type = 'document'
+      AND resource_id = '{"id": 7001}'::jsonb AND expiration_date > now()
+    INTO __flags;
+
+    IF __flags = array['read', 'write'] THEN
+        RAISE NOTICE '  PASS: Cache row holds all effective flags (%)', __flags;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expected cached flags {read,write}, got %', __flags;
+    END IF;
+
+    IF auth.has_resource_access(__user_id_2, 'test-corr-racache-1c', 'document', '{"id": 7001}'::jsonb, 'write', _throw_err := false)
+       AND NOT auth.has_resource_access(__user_id_2, 'test-corr-racache-1d', 'document', '{"id": 7001}'::jsonb, 'delete', _throw_err := false) THEN
+        RAISE NOTICE '  PASS: Other flags on the same resource answered from the cache row';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Cached check for write/delete returned a wrong result';
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 2: New grant clears the grantee's cache rows
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_1 bigint;
+    __user_id_2 bigint;
+BEGIN
+    RAISE NOTICE 'TEST 2: New grant clears the grantee''s cache rows';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_1' INTO __user_id_1;
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_2' INTO __user_id_2;
+
+    PERFORM auth.assign_resource_access('test', __user_id_1, 'test-corr-racache-2a', 'document', '{"id": 7001}'::jsonb,
+        _target_user_id := __user_id_2, _access_flags := array['share']);
+
+    IF EXISTS (
+        SELECT 1 FROM auth.user_resource_access_cache
+        WHERE user_id = __user_id_2 AND root_type = 'document'
+    ) THEN
+        RAISE EXCEPTION '  FAIL: Cache rows survived a new grant';
+    END IF;
+
+    IF auth.has_resource_access(__user_id_2, 'test-corr-racache-2b', 'document', '{"id": 7001}'::jsonb, 'share', _throw_err := false) THEN
+        RAISE NOTICE '  PASS: Cache cleared, new flag granted';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Newly granted share flag denied';
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 3: User deny overrides a group grant in the cached flags
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_1 bigint;
+    __user_id_2 bigint;
+    __group_id_1 integer;
+    __flags text[];
+BEGIN
+    RAISE NOTICE 'TEST 3: User deny overrides a group grant in the cached flags';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_1' INTO __user_id_1;
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_2' INTO __user_id_2;
+    SELECT val FROM _ra_test_data WHERE key = 'group_id_1' INTO __group_id_1;
+
+    PERFORM auth.assign_resource_access('test', __user_id_1, 'test-corr-racache-3a', 'document', '{"id": 7002}'::jsonb,
+        _user_group_id := __group_id_1, _access_flags := array['read', 'export']);
+    PERFORM auth.deny_resource_access('test', __user_id_1, 'test-corr-racache-3b', 'document', '{"id": 7002}'::jsonb,
+        __user_id_2, _access_flags := array['export']);
+
+    IF auth.has_resource_access(__user_id_2, 'test-corr-racache-3c', 'document', '{"id": 7002}'::jsonb, 'export', _throw_err := false) THEN
+        RAISE EXCEPTION '  FAIL: Denied export flag granted';
+    END IF;
+
+    SELECT access_flags FROM auth.user_resource_access_cache
+    WHERE user_id = __user_id_2 AND tenant_id = 1 AND resource_type = 'document'
+      AND resource_id = '{"id": 7002}'::jsonb
+    INTO __flags;
+
+    IF __flags = array['read'] THEN
+        RAISE NOTICE '  PASS: Cached flags exclude the denied flag (%)', __flags;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expected cached flags {read}, got %', __flags;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 4: Group membership change clears the member's cache rows
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_3 bigint;
+    __group_id_1 integer;
+BEGIN
+    RAISE NOTICE 'TEST 4: Group membership change clears the member''s cache rows';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_3' INTO __user_id_3;
+    SELECT val FROM _ra_test_data WHERE key = 'group_id_1' INTO __group_id_1;
+
+    IF auth.has_resource_access(__user_id_3, 'test-corr-racache-4a', 'document', '{"id": 7002}'::jsonb, 'export', _throw_err := false) THEN
+        RAISE EXCEPTION '  FAIL: Non-member granted the group''s flag';
+    END IF;
+
+    INSERT INTO auth.user_group_member (created_by, user_group_id, user_id, member_type_code)
+    VALUES ('test', __group_id_1, __user_id_3, 'manual');
+
+    IF auth.has_resource_access(__user_id_3, 'test-corr-racache-4b', 'document', '{"id": 7002}'::jsonb, 'export', _throw_err := false) THEN
+        RAISE NOTICE '  PASS: New member sees the group grant right away';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Stale cache row hid the group grant from the new member';
+    END IF;
+
+    -- Cleanup
+    DELETE FROM auth.user_group_member WHERE user_group_id = __group_id_1 AND user_id = __user_id_3;
+    DELETE FROM const.sys_param WHERE group_code = 'auth' AND code = 'resource_access_cache_enabled';
+END $$;
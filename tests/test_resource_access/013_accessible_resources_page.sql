@@ -0,0 +1,148 @@
+set search_path = public, const, ext, stage, helpers, internal, unsecure, auth, triggers;
+
+-- ============================================================================
+-- TEST 1: Keyset page — first page after a cursor
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_1 bigint;
+    __user_id_2 bigint;
+    __group_id_1 integer;
+    __result text[];
+BEGIN
+    RAISE NOTICE 'TEST 1: get_user_accessible_resources_page returns the first page in key order';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_1' INTO __user_id_1;
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_2' INTO __user_id_2;
+    SELECT val FROM _ra_test_data WHERE key = 'group_id_1' INTO __group_id_1;
+
+    -- Direct grants on 8001, 8002, 8004; group grants on 8003, 8005; user deny on 8005
+    PERFORM auth.assign_resource_access('test', __user_id_1, 'test-corr-page-1a', 'document', jsonb_build_object('id', n),
+        _target_user_id := __user_id_2, _access_flags := array['read'])
+    FROM unnest(array[8001, 8002, 8004]) n;
+    PERFORM auth.assign_resource_access('test', __user_id_1, 'test-corr-page-1b', 'document', jsonb_build_object('id', n),
+        _user_group_id := __group_id_1, _access_flags := array['read'])
+    FROM unnest(array[8003, 8005]) n;
+    PERFORM auth.deny_resource_access('test', __user_id_1, 'test-corr-page-1c', 'document', '{"id": 8005}'::jsonb,
+        __user_id_2, _access_flags := array['read']);
+
+    SELECT array_agg((p.__resource_id->>'id') || ':' || p.__source)
+    FROM auth.get_user_accessible_resources_page(__user_id_2, 'test-corr-page-1d', __user_id_2, 'document',
+        _page_size := 2, _after_resource_type := 'document', _after_resource_id := '{"id": 8000}'::jsonb) p
+    INTO __result;
+
+    IF __result = array['8001:direct', '8002:direct'] THEN
+        RAISE NOTICE '  PASS: First page (%)', __result;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expected {8001:direct,8002:direct}, got %', __result;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 2: Keyset page — next pages continue after the cursor, deny excluded
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_2 bigint;
+    __result text[];
+BEGIN
+    RAISE NOTICE 'TEST 2: get_user_accessible_resources_page continues after the cursor and skips denied resources';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_2' INTO __user_id_2;
+
+    SELECT array_agg((p.__resource_id->>'id') || ':' || p.__source)
+    FROM auth.get_user_accessible_resources_page(__user_id_2, 'test-corr-page-2a', __user_id_2, 'document',
+        _page_size := 2, _after_resource_type := 'document', _after_resource_id := '{"id": 8002}'::jsonb) p
+    INTO __result;
+
+    IF __result = array['8003:RA Test Group Editors', '8004:direct'] THEN
+        RAISE NOTICE '  PASS: Second page mixes group and direct grants (%)', __result;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Expected {8003:RA Test Group Editors,8004:direct}, got %', __result;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1
+        FROM auth.get_user_accessible_resources_page(__user_id_2, 'test-corr-page-2b', __user_id_2, 'document',
+            _after_resource_type := 'document', _after_resource_id := '{"id": 8004}'::jsonb) p
+        WHERE p.__resource_id = '{"id": 8005}'::jsonb
+    ) THEN
+        RAISE EXCEPTION '  FAIL: Denied resource 8005 returned';
+    ELSE
+        RAISE NOTICE '  PASS: Denied resource excluded from the last page';
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 3: Keyset pages — all pages together match get_user_accessible_resources
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_2 bigint;
+    __page record;
+    __after_type text;
+    __after_id jsonb;
+    __after_path text;
+    __rows integer;
+    __paged text[] := array[]::text[];
+    __unpaged text[];
+BEGIN
+    RAISE NOTICE 'TEST 3: Walking all pages returns the same resources as get_user_accessible_resources';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_2' INTO __user_id_2;
+
+    LOOP
+        __rows := 0;
+        FOR __page IN
+            SELECT * FROM auth.get_user_accessible_resources_page(__user_id_2, 'test-corr-page-3a', __user_id_2, 'document',
+                _page_size := 3, _after_resource_type := __after_type, _after_resource_id := __after_id,
+                _after_resource_path := __after_path)
+        LOOP
+            __rows := __rows + 1;
+            __paged := __paged || (__page.__resource_id::text || '|' || coalesce(__page.__resource_path, '') || '|'
+                                   || __page.__access_flags::text || '|' || __page.__source);
+            __after_type := __page.__resource_type;
+            __after_id := __page.__resource_id;
+            __after_path := __page.__resource_path;
+        END LOOP;
+        EXIT WHEN __rows < 3;
+    END LOOP;
+
+    SELECT array_agg(r.__resource_id::text || '|' || coalesce(r.__resource_path, '') || '|'
+                     || r.__access_flags::text || '|' || r.__source)
+    FROM auth.get_user_accessible_resources(__user_id_2, 'test-corr-page-3b', __user_id_2, 'document') r
+    INTO __unpaged;
+
+    IF (SELECT array_agg(x ORDER BY x) FROM unnest(__paged) x) = (SELECT array_agg(x ORDER BY x) FROM unnest(__unpaged) x) THEN
+        RAISE NOTICE '  PASS: % resources, paged and unpaged results match', cardinality(__paged);
+    ELSE
+        RAISE EXCEPTION '  FAIL: Paged % differs from unpaged %', __paged, __unpaged;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 4: Keyset page — zero and negative page sizes are clamped to one row
+-- ============================================================================
+DO $$
+DECLARE
+    __user_id_2 bigint;
+    __page_size integer;
+    __result text[];
+BEGIN
+    RAISE NOTICE 'TEST 4: get_user_accessible_resources_page clamps _page_size below 1 to one row';
+
+    SELECT val FROM _ra_test_data WHERE key = 'user_id_2' INTO __user_id_2;
+
+    FOREACH __page_size IN ARRAY array[0, -5] LOOP
+        SELECT array_agg(p.__resource_id->>'id')
+        FROM auth.get_user_accessible_resources_page(__user_id_2, 'test-corr-page-4', __user_id_2, 'document',
+            _page_size := __page_size, _after_resource_type := 'document', _after_resource_id := '{"id": 8000}'::jsonb) p
+        INTO __result;
+
+        IF __result = array['8001'] THEN
+            RAISE NOTICE '  PASS: _page_size=% returned one row (%)', __page_size, __result;
+        ELSE
+            RAISE EXCEPTION '  FAIL: _page_size=% expected {8001}, got %', __page_size, __result;
+        END IF;
+    END LOOP;
+END $$;
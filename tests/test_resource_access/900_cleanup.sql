@@ -12,6 +12,7 @@ BEGIN
     -- but clean up explicitly for safety
     DELETE FROM auth.resource_access WHERE root_type IN ('document', 'folder', 'project', 'ptf_untyped', 'ptf_ensured', 'ptf_created', 'ptf_clearable');
     DELETE FROM auth.user_group_id_cache WHERE created_by IN ('cache', 'test');
+    DELETE FROM auth.user_resource_access_cache WHERE root_type IN ('document', 'folder');
     DELETE FROM auth.owner WHERE created_by = 'test';
     DELETE FROM auth.permission_assignment WHERE created_by = 'test';
     -- Also clean up system-created assignments for test users
@@ -73,6 +74,7 @@ BEGIN
     RAISE NOTICE '    2. Denied resources excluded';
     RAISE NOTICE '    3. Group grants included';
     RAISE NOTICE '    4. System user sees all';
+    RAISE NOTICE '    5. Input order and duplicates kept';
     RAISE NOTICE '  005 Flags and Grants:';
     RAISE NOTICE '    1. Direct grants returned';
     RAISE NOTICE '    2. Denied flag excluded';
@@ -122,5 +124,14 @@ BEGIN
     RAISE NOTICE '    15. ensure_resource_type_flags sets exact flag set';
     RAISE NOTICE '    16. ensure_resource_type_flags with empty array clears all';
     RAISE NOTICE '    17. ensure_resource_type_flags with null is no-op';
+    RAISE NOTICE '  012 Resource Access Cache:';
+    RAISE NOTICE '    1. Cache populated on first check';
+    RAISE NOTICE '    2. New grant clears the grantee''s cache rows';
+    RAISE NOTICE '    3. User deny overrides a group grant in the cached flags';
+    RAISE NOTICE '    4. Group membership change clears the member''s cache rows';
+    RAISE NOTICE '  013 Accessible Resources Page:';
+    RAISE NOTICE '    1. First page in key order';
+    RAISE NOTICE '    2. Next pages continue after the cursor, deny excluded';
+    RAISE NOTICE '    3. All pages match get_user_accessible_resources';
     RAISE NOTICE '';
 END $$;
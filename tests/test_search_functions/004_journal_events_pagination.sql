@@ -58,3 +58,122 @@ BEGIN
         RAISE EXCEPTION '  FAIL: page_size=2 should return at most 2 rows, got %', __returned_count;
     END IF;
 END $$;
+
+-- ============================================================================
+-- TEST 15: search_journal keyset pagination and opt-in total
+-- ============================================================================
+DO $$
+DECLARE
+    __corr_id text := 'search-test-keyset-j-' || gen_random_uuid()::text;
+    __page1 bigint[];
+    __page2 bigint[];
+    __last_created_at timestamptz;
+    __total bigint;
+BEGIN
+    RAISE NOTICE 'TEST 15: search_journal keyset pagination and opt-in total';
+
+    PERFORM create_journal_message_for_entity('test_search', 1, __corr_id, 10001, 'user', 1::bigint,
+        jsonb_build_object('username', 'search_test_user'))
+    FROM generate_series(1, 3);
+
+    SELECT array_agg(sj.__journal_id), max(sj.__created_at), max(sj.__total_items)
+    INTO __page1, __last_created_at, __total
+    FROM public.search_journal(1, __corr_id, _page_size := 2) sj;
+
+    IF cardinality(__page1) <> 2 OR __total IS NOT NULL THEN
+        RAISE EXCEPTION '  FAIL: Expected 2 rows without total, got % rows, total %', cardinality(__page1), __total;
+    END IF;
+
+    SELECT array_agg(sj.__journal_id)
+    INTO __page2
+    FROM public.search_journal(1, __corr_id, _page_size := 2,
+        _after_created_at := __last_created_at, _after_journal_id := __page1[2]) sj;
+
+    SELECT max(sj.__total_items) INTO __total
+    FROM public.search_journal(1, __corr_id, _page_size := 2, _include_total := true) sj;
+
+    IF cardinality(__page2) = 1 AND __page2[1] < __page1[2] AND __page1[1] > __page1[2] AND __total = 3 THEN
+        RAISE NOTICE '  PASS: Pages % and % (newest first), total % on request', __page1, __page2, __total;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Unexpected pages % / % or total %', __page1, __page2, __total;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 16: search_user_events keyset pagination and opt-in total
+-- ============================================================================
+DO $$
+DECLARE
+    __corr_id text := 'search-test-keyset-ue-' || gen_random_uuid()::text;
+    __page1 bigint[];
+    __page2 bigint[];
+    __last_created_at timestamptz;
+    __total bigint;
+BEGIN
+    RAISE NOTICE 'TEST 16: search_user_events keyset pagination and opt-in total';
+
+    PERFORM unsecure.create_user_event('test_search', 1, __corr_id, 'user_login', 1)
+    FROM generate_series(1, 3);
+
+    SELECT array_agg(sue.__user_event_id), max(sue.__created_at), max(sue.__total_items)
+    INTO __page1, __last_created_at, __total
+    FROM auth.search_user_events(1, _search_criteria := jsonb_build_object('correlation_id', __corr_id), _page_size := 2) sue;
+
+    IF cardinality(__page1) <> 2 OR __total IS NOT NULL THEN
+        RAISE EXCEPTION '  FAIL: Expected 2 rows without total, got % rows, total %', cardinality(__page1), __total;
+    END IF;
+
+    SELECT array_agg(sue.__user_event_id)
+    INTO __page2
+    FROM auth.search_user_events(1, _search_criteria := jsonb_build_object('correlation_id', __corr_id), _page_size := 2,
+        _after_created_at := __last_created_at, _after_user_event_id := __page1[2]) sue;
+
+    SELECT max(sue.__total_items) INTO __total
+    FROM auth.search_user_events(1, _search_criteria := jsonb_build_object('correlation_id', __corr_id),
+        _include_total := true) sue;
+
+    IF cardinality(__page2) = 1 AND __page2[1] < __page1[2] AND __total = 3 THEN
+        RAISE NOTICE '  PASS: Pages % and %, total % on request', __page1, __page2, __total;
+    ELSE
+        RAISE EXCEPTION '  FAIL: Unexpected pages % / % or total %', __page1, __page2, __total;
+    END IF;
+END $$;
+
+-- ============================================================================
+-- TEST 17: search_journal matches payload text accent- and case-insensitively
+-- ============================================================================
+DO $$
+DECLARE
+    __corr_id text := 'search-test-nrm-j-' || gen_random_uuid()::text;
+    __nrm text;
+    __count integer;
+BEGIN
+    RAISE NOTICE 'TEST 17: search_journal accent-insensitive payload search';
+
+    PERFORM create_journal_message_for_entity('test_search', 1, __corr_id, 10001, 'user', 1::bigint,
+        jsonb_build_object('username', 'Žluťoučký Kůň'));
+
+    SELECT j.nrm_search_data INTO __nrm
+    FROM public.journal j
+    WHERE j.correlation_id = __corr_id;
+
+    IF __nrm IS NULL OR __nrm NOT LIKE '%zlutoucky kun%' THEN
+        RAISE EXCEPTION '  FAIL: nrm_search_data not normalized on insert: %', __nrm;
+    END IF;
+
+    SELECT count(*) INTO __count
+    FROM public.search_journal(1, __corr_id, _search_text := 'ZLUTOUCKY kůn') sj;
+
+    IF __count <> 1 THEN
+        RAISE EXCEPTION '  FAIL: Expected 1 match for unaccented search, got %', __count;
+    END IF;
+
+    SELECT count(*) INTO __count
+    FROM public.search_journal(1, __corr_id, _search_text := 'zlutoucky osel') sj;
+
+    IF __count = 0 THEN
+        RAISE NOTICE '  PASS: Payload found regardless of accents and case, non-matching text excluded';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Non-matching search text returned % rows', __count;
+    END IF;
+END $$;
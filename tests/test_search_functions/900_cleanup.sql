@@ -41,5 +41,8 @@ BEGIN
     RAISE NOTICE '  12. search_journal executes without error';
     RAISE NOTICE '  13. search_user_events executes without error';
     RAISE NOTICE '  14. Pagination limits results';
+    RAISE NOTICE '  15. search_journal keyset pagination and opt-in total';
+    RAISE NOTICE '  16. search_user_events keyset pagination and opt-in total';
+    RAISE NOTICE '  17. search_journal accent-insensitive payload search';
     RAISE NOTICE '';
 END $$;
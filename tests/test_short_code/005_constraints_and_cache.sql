@@ -20,25 +20,24 @@ BEGIN
 END $$;
 
 -- ============================================================================
--- TEST 14: short_code_permissions column exists in user_permission_cache
+-- TEST 14: user_permission_cache stores integer permission ids
 -- ============================================================================
 DO $$
 DECLARE
-    __col_exists boolean;
+    __data_type text;
 BEGIN
-    RAISE NOTICE 'TEST 14: user_permission_cache has short_code_permissions column';
+    RAISE NOTICE 'TEST 14: user_permission_cache has permission_ids integer[] column';
 
-    SELECT EXISTS (
-        SELECT 1 FROM information_schema.columns
-        WHERE table_schema = 'auth'
-          AND table_name = 'user_permission_cache'
-          AND column_name = 'short_code_permissions'
-    ) INTO __col_exists;
+    SELECT udt_name INTO __data_type
+    FROM information_schema.columns
+    WHERE table_schema = 'auth'
+      AND table_name = 'user_permission_cache'
+      AND column_name = 'permission_ids';
 
-    IF __col_exists THEN
-        RAISE NOTICE '  PASS: short_code_permissions column exists in user_permission_cache';
+    IF __data_type = '_int4' THEN
+        RAISE NOTICE '  PASS: permission_ids is integer[]';
     ELSE
-        RAISE EXCEPTION '  FAIL: short_code_permissions column not found in user_permission_cache';
+        RAISE EXCEPTION '  FAIL: permission_ids column missing or not integer[] (got %)', __data_type;
     END IF;
 END $$;
 
@@ -49,6 +48,9 @@ DO $$
 DECLARE
     __test_user_id bigint;
     __short_codes text[];
+    __full_codes text[];
+    __cached_short_codes text[];
+    __cached_full_codes text[];
 BEGIN
     RAISE NOTICE 'TEST 15: recalculate_user_permissions populates short_code_permissions';
 
@@ -61,7 +63,7 @@ BEGIN
     PERFORM unsecure.assign_permission('test_sc', 1, null, null, __test_user_id, 'system_admin', null, 1);
 
     -- Recalculate permissions
-    SELECT __short_code_permissions INTO __short_codes
+    SELECT __short_code_permissions, __permissions INTO __short_codes, __full_codes
     FROM unsecure.recalculate_user_permissions('test_sc', __test_user_id, 1);
 
     IF __short_codes IS NOT NULL AND array_length(__short_codes, 1) > 0 THEN
@@ -70,15 +72,28 @@ BEGIN
         RAISE EXCEPTION '  FAIL: short_code_permissions is null or empty';
     END IF;
 
-    -- Verify cache was populated with short_code_permissions
+    -- Verify cache was populated with sorted permission ids
     IF EXISTS (
         SELECT 1 FROM auth.user_permission_cache
         WHERE user_id = __test_user_id AND tenant_id = 1
-          AND array_length(short_code_permissions, 1) > 0
+          AND cardinality(permission_ids) = cardinality(__full_codes)
+          AND permission_ids = array(SELECT unnest(permission_ids) ORDER BY 1)
     ) THEN
-        RAISE NOTICE '  PASS: Cache row has short_code_permissions populated';
+        RAISE NOTICE '  PASS: Cache row has one sorted permission id per full code';
     ELSE
-        RAISE EXCEPTION '  FAIL: Cache row missing short_code_permissions';
+        RAISE EXCEPTION '  FAIL: Cache row permission_ids missing, unsorted or not matching the full codes';
+    END IF;
+
+    -- Second call is served from the cache row and resolves the same codes from the ids
+    SELECT __short_code_permissions, __permissions INTO __cached_short_codes, __cached_full_codes
+    FROM unsecure.recalculate_user_permissions('test_sc', __test_user_id, 1);
+
+    IF __cached_short_codes = __short_codes AND __cached_full_codes = __full_codes THEN
+        RAISE NOTICE '  PASS: Cached read returns the same full and short codes';
+    ELSE
+        RAISE EXCEPTION '  FAIL: Cached read differs (full % vs %, short % vs %)',
+            cardinality(__cached_full_codes), cardinality(__full_codes),
+            cardinality(__cached_short_codes), cardinality(__short_codes);
     END IF;
 
     -- Cleanup
@@ -0,0 +1,121 @@
+"""
+Tests for extract-db-objects.py
+
+Run from the repository root:
+    python -m unittest discover -s tests/tools
+"""
+
+import importlib.util
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+spec = importlib.util.spec_from_file_location('extract_db_objects', REPO_ROOT / 'extract-db-objects.py')
+extract = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(extract)
+
+
+def object_keys(objects):
+    return [(o['schema'], o['object_name'], o['object_type'], o['line']) for o in objects]
+
+
+class ScanLargeSqlFileTests(unittest.TestCase):
+    def assert_same_as_line_parser(self, sql: str):
+        slow = extract.parse_sql_objects(sql, 'test.sql')
+        fast = extract.scan_large_sql_file(sql.encode('utf-8'), 'test.sql')
+        self.assertEqual(object_keys(fast), object_keys(slow))
+        return fast
+
+    def test_commented_out_insert_does_not_hide_following_ddl(self):
+        sql = (
+            "create table public.a (id int);\n"
+            "/*\n"
+            "insert into public.a values (1)\n"
+            "*/\n"
+            "create function public.f() returns int\n"
+            "    language sql\n"
+            "as $$ select 1; $$;\n"
+        )
+        objects = self.assert_same_as_line_parser(sql)
+        self.assertEqual([o['object_name'] for o in objects], ['a', 'f'])
+
+    def test_semicolon_in_literal_does_not_hide_following_ddl(self):
+        sql = (
+            "insert into public.a values ('x;y'),\n"
+            "    ('z');\n"
+            "create index ix_a on public.a (id);\n"
+        )
+        self.assert_same_as_line_parser(sql)
+
+    def test_bulk_insert_and_copy_blocks_are_skipped(self):
+        sql = (
+            "create table public.a (id int, v text);\n"
+            "insert into public.a (id, v)\n"
+            "values (1, 'a'),\n"
+            "       (2, 'b');\n"
+            "copy public.a (id, v) from stdin;\n"
+            "3\tc\n"
+            "\\.\n"
+            "create view public.v as select 1;\n"
+        )
+        objects = self.assert_same_as_line_parser(sql)
+        self.assertEqual([o['object_name'] for o in objects], ['a', 'v'])
+        self.assertEqual(objects[1]['line'], 8)
+
+
+class DriftScriptTests(unittest.TestCase):
+    def routine(self, signature: str, arguments: str) -> dict:
+        return {
+            'schema': 'auth',
+            'object_name': 'has_permission',
+            'object_type': 'function',
+            'signature': signature,
+            'definition': f"create or replace function auth.has_permission({arguments}) returns boolean"
+                          " language sql as $$ select true $$;",
+            'search_path': extract.DEFAULT_SEARCH_PATH,
+            'file': '022_functions_auth_permission.sql',
+            'line': 1
+        }
+
+    def test_overloads_are_matched_by_argument_types(self):
+        script = extract.build_drift_script([
+            self.routine('bigint,text', '_user_id bigint, _code text'),
+            self.routine('bigint,text[]', '_user_id bigint, _codes text[]')
+        ])
+
+        self.assertIn("select 0, p.oid, 'routine' from pg_proc p"
+                      " where p.oid = to_regprocedure('__drift_auth.has_permission(bigint,text)');", script)
+        self.assertIn("select 1, p.oid, 'routine' from pg_proc p"
+                      " where p.oid = to_regprocedure('__drift_auth.has_permission(bigint,text[])');", script)
+        self.assertNotIn('limit 1', script)
+        # Scratch and live routines are joined on name plus regprocedure argument types
+        self.assertEqual(script.count("substr(p.oid::regprocedure::text, strpos(p.oid::regprocedure::text, '('))"), 2)
+        self.assertIn('l.identity = s.identity', script)
+
+
+class FormatOutputFileTests(unittest.TestCase):
+    def test_single_format_base_path_gets_extension(self):
+        # debee passes an extension-less base and checks for base.<ext>, even for one format
+        self.assertEqual(extract.format_output_file('out/db-objects', 'json', False), 'out/db-objects.json')
+        self.assertEqual(extract.format_output_file('out/db-objects', 'markdown', False), 'out/db-objects.md')
+
+    def test_single_format_explicit_file_is_kept(self):
+        self.assertEqual(extract.format_output_file('out/objects.json', 'json', False), 'out/objects.json')
+        self.assertEqual(extract.format_output_file('out/objects.md', 'markdown', False), 'out/objects.md')
+
+    def test_dotted_base_name_is_not_an_extension(self):
+        self.assertEqual(extract.format_output_file('out/dump.v2', 'json', False), 'out/dump.v2.json')
+        self.assertEqual(extract.format_output_file('out.d/db-objects', 'json', False), 'out.d/db-objects.json')
+        self.assertEqual(extract.format_output_file('out/dump.v2', 'csv', True), 'out/dump.v2.csv')
+
+    def test_several_formats_replace_known_extension(self):
+        self.assertEqual(extract.format_output_file('out/db-objects.json', 'csv', True), 'out/db-objects.csv')
+        self.assertEqual(extract.format_output_file('out/db-objects', 'html', True), 'out/db-objects.html')
+
+    def test_stdout_stays_stdout(self):
+        self.assertIsNone(extract.format_output_file(None, 'json', False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for gen_icons_inserts.py
+
+Run from the repository root:
+    python -m unittest discover -s tests/tools
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+spec = importlib.util.spec_from_file_location('gen_icons_inserts', REPO_ROOT / 'gen_icons_inserts.py')
+icons = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(icons)
+
+
+class IncrementalSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = os.path.join(self.tmp.name, 'icons')
+        self.snapshot = os.path.join(self.tmp.name, 'icons.snapshot')
+        os.makedirs(os.path.join(self.source, 'action'))
+        Path(self.source, 'action', 'home-filled.svg').write_text('<svg/>')
+        Path(self.source, 'action', 'search.svg').write_text('<svg/>')
+
+    def run_script(self, *args) -> str:
+        out = os.path.join(self.tmp.name, 'out.sql')
+        argv = ['gen_icons_inserts.py', '--source', self.source, '--snapshot', self.snapshot, '--out', out, *args]
+        with mock.patch.object(sys, 'argv', argv), redirect_stdout(StringIO()):
+            icons.main()
+        return Path(out).read_text(encoding='utf-8')
+
+    def test_rename_to_the_same_ltree_is_updated(self):
+        self.run_script()
+        os.rename(os.path.join(self.source, 'action', 'home-filled.svg'),
+                  os.path.join(self.source, 'action', 'home_filled.svg'))
+
+        delta = self.run_script('--incremental')
+
+        self.assertNotIn('insert into', delta)
+        self.assertNotIn('delete from', delta)
+        self.assertIn("('action.home_filled_svg'::ext.ltree, '/action/home_filled.svg', 'file', 'home_filled.svg')",
+                      delta)
+        self.assertIn('-- Inserted rows: 0, updated rows: 1, deleted paths: 0', delta)
+
+    def test_kind_change_is_updated(self):
+        self.run_script()
+        os.remove(os.path.join(self.source, 'action', 'search.svg'))
+        os.makedirs(os.path.join(self.source, 'action', 'search.svg'))
+
+        delta = self.run_script('--incremental')
+
+        self.assertIn("('action.search_svg'::ext.ltree, '/action/search.svg', 'folder', 'search.svg')", delta)
+        self.assertIn('-- Inserted rows: 0, updated rows: 1, deleted paths: 0', delta)
+
+    def test_unchanged_tree_writes_an_empty_delta(self):
+        self.run_script()
+
+        delta = self.run_script('--incremental')
+
+        self.assertIn('-- Inserted rows: 0, updated rows: 0, deleted paths: 0', delta)
+
+    def test_added_and_removed_paths(self):
+        self.run_script()
+        os.remove(os.path.join(self.source, 'action', 'search.svg'))
+        Path(self.source, 'action', 'zoom.svg').write_text('<svg/>')
+
+        delta = self.run_script('--incremental')
+
+        self.assertIn("('action.zoom_svg'::ext.ltree, '/action/zoom.svg', 'file', 'zoom.svg')", delta)
+        self.assertIn("'action.search_svg'::ext.ltree", delta.split('delete from demo.fs_item')[1])
+        self.assertIn('-- Inserted rows: 1, updated rows: 0, deleted paths: 1', delta)
+
+    def test_unreadable_folder_aborts_without_deletes(self):
+        self.run_script()
+        snapshot = Path(self.snapshot).read_text(encoding='utf-8')
+        unreadable = os.path.join(self.source, 'action')
+        scandir = os.scandir
+
+        def failing_scandir(path):
+            if os.path.normpath(path) == os.path.normpath(unreadable):
+                raise PermissionError(13, 'Permission denied', path)
+            return scandir(path)
+
+        with mock.patch.object(icons.os, 'scandir', failing_scandir), redirect_stderr(StringIO()) as err:
+            with self.assertRaises(SystemExit):
+                self.run_script('--incremental')
+
+        self.assertIn('Permission denied', err.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'out.sql')))
+        self.assertEqual(Path(self.snapshot).read_text(encoding='utf-8'), snapshot)
+
+
+class ScanSourcesTests(unittest.TestCase):
+    def test_rows_keep_a_deterministic_order(self):
+        with tempfile.TemporaryDirectory() as source:
+            for i in range(6):
+                os.makedirs(os.path.join(source, f'd{i}', 'sub'))
+                Path(source, f'd{i}', 'sub', 'icon.svg').write_text('<svg/>')
+
+            single = list(icons.scan_sources([source], 1))
+            parallel = list(icons.scan_sources([source], 2))
+
+        self.assertEqual(parallel, single)
+        self.assertEqual([rel for rel, _, _ in single[:7]], ['d0', 'd1', 'd2', 'd3', 'd4', 'd5', 'd0/sub'])
+
+
+if __name__ == '__main__':
+    unittest.main()